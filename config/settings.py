@@ -45,6 +45,29 @@ try:
     APIFY_MAX_EVENTS = int(os.getenv("APIFY_MAX_EVENTS", "30"))
 except ValueError:
     APIFY_MAX_EVENTS = 30
+try:
+    APIFY_CONCURRENCY = int(os.getenv("APIFY_CONCURRENCY", "1"))
+except ValueError:
+    APIFY_CONCURRENCY = 1
+
+# On-disk replay cache for provider fetches (``ingest_events --cache``).
+PROVIDER_CACHE_DIR = Path(
+    os.getenv("PROVIDER_CACHE_DIR", str(BASE_DIR / ".provider_cache"))
+)
+try:
+    PROVIDER_CACHE_TTL = int(os.getenv("PROVIDER_CACHE_TTL", "3600"))
+except ValueError:
+    PROVIDER_CACHE_TTL = 3600
+try:
+    PROVIDER_CACHE_MAX_MB = int(os.getenv("PROVIDER_CACHE_MAX_MB", "512"))
+except ValueError:
+    PROVIDER_CACHE_MAX_MB = 512
+
+
+# Where upstream payloads are written: "inline" (the Event JSON column) or
+# "compressed" (zlib, stored once per distinct payload in a side table).
+# Existing rows only move with "manage.py move_payloads".
+EVENT_PAYLOAD_STORAGE = os.getenv("EVENT_PAYLOAD_STORAGE", "inline").lower()
 
 
 # Application definition
@@ -90,6 +113,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# "wsgi" (gunicorn, DRF views) or "asgi" (uvicorn, native async views).
+SERVER_INTERFACE = os.getenv("SERVER_INTERFACE", "wsgi").lower()
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -100,7 +126,12 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 
 if DATABASE_URL:
     DATABASES = {
-        "default": dj_database_url.config(default=DATABASE_URL, conn_max_age=600)
+        # Django's docs advise disabling persistent connections under ASGI;
+        # put a pooler such as PgBouncer in front of the database instead.
+        "default": dj_database_url.config(
+            default=DATABASE_URL,
+            conn_max_age=0 if SERVER_INTERFACE == "asgi" else 600,
+        )
     }
 else:
     DATABASES = {
@@ -111,6 +142,32 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHE_DIR = os.getenv("DJANGO_CACHE_DIR")
+
+if CACHE_DIR:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_DIR,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "events-api",
+        }
+    }
+
+try:
+    EVENTS_CACHE_TIMEOUT = int(os.getenv("EVENTS_CACHE_TIMEOUT", "300"))
+except ValueError:
+    EVENTS_CACHE_TIMEOUT = 300
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,210 @@
+"""Native async versions of the events API endpoints.
+
+Served instead of the DRF views when ``SERVER_INTERFACE=asgi``. Responses
+match the sync views byte for byte (bodies, status codes, cache validators),
+but requests never leave the event loop, so a slow client only costs a
+coroutine rather than a worker thread.
+"""
+
+from __future__ import annotations
+
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotAllowed
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import acurrent_generation, cache_validators
+from .facets import facet_payload, facet_queries
+from .models import Event
+from .pagination import (
+    EventCursorPagination,
+    StandardResultsSetPagination,
+    akeyset_page,
+    decode_cursor,
+    encode_cursor,
+    resolve_page_size,
+    row_position,
+    wants_page_numbers,
+)
+from .payloads import afill_payloads
+from .renderers import render_json
+from .search import is_ranked
+from .serializers import (
+    EVENT_FIELDS,
+    EventValuesSerializer,
+    fast_json_safe,
+    parse_field_selection,
+)
+from .views import (
+    EventFacetsView,
+    filter_events,
+    ingestion_jobs,
+    ingestion_status,
+    list_columns,
+)
+
+SAFE_METHODS = ("GET", "HEAD")
+
+
+class Http404(Exception):
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def json_response(data, status: int = 200, fast: bool = False) -> HttpResponse:
+    return HttpResponse(
+        render_json(data, fast=fast), status=status, content_type="application/json"
+    )
+
+
+async def health(request):
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    return json_response({"status": "ok"}, fast=True)
+
+
+async def event_list(request):
+    """Async twin of ``EventListView``."""
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    params = request.GET
+    try:
+        fields = parse_field_selection(params)
+    except ValidationError as exc:
+        return json_response(exc.detail, status=400)
+
+    validators = cache_validators(request, await acurrent_generation())
+    not_modified = validators.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+
+    data = await cache.aget(validators.key)
+    if data is None:
+        try:
+            queryset = filter_events(params)
+            queryset = queryset.values(*list_columns(fields, is_ranked(queryset)))
+        except ValidationError as exc:
+            return json_response(exc.detail, status=400)
+        try:
+            if wants_page_numbers(params):
+                data = await _page_number_page(request, queryset, fields)
+            else:
+                data = await _cursor_page(request, queryset, fields)
+        except Http404 as exc:
+            return json_response({"detail": exc.detail}, status=404)
+        await cache.aset(validators.key, data, settings.EVENTS_CACHE_TIMEOUT)
+    response = json_response(data, fast=fast_json_safe(fields))
+    return validators.apply(response)
+
+
+async def event_detail(request, pk: int):
+    """Async twin of ``EventDetailView``."""
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    row = (
+        await Event.objects.filter(pk=pk)
+        .values(*EVENT_FIELDS, "payload_digest")
+        .afirst()
+    )
+    if row is None:
+        return json_response({"detail": "No Event matches the given query."}, 404)
+    await afill_payloads([row])
+    return json_response(EventValuesSerializer(row).data)
+
+
+async def event_facets(request):
+    """Async twin of ``EventFacetsView``."""
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    validators = cache_validators(
+        request, await acurrent_generation(), EventFacetsView.cache_prefix
+    )
+    not_modified = validators.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+
+    data = await cache.aget(validators.key)
+    if data is None:
+        queries = facet_queries(request.GET)
+        data = facet_payload(
+            {name: [row async for row in rows] for name, rows in queries.items()}
+        )
+        await cache.aset(validators.key, data, settings.EVENTS_CACHE_TIMEOUT)
+    return validators.apply(json_response(data, fast=True))
+
+
+async def ingestion_status_view(request):
+    """Async twin of ``IngestionStatusView``."""
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    return json_response(ingestion_status([row async for row in ingestion_jobs()]))
+
+
+async def _cursor_page(request, queryset, fields) -> dict:
+    page_size = resolve_page_size(request.GET)
+    position = None
+    token = request.GET.get(EventCursorPagination.cursor_query_param)
+    if token:
+        try:
+            position = decode_cursor(token, ranked=is_ranked(queryset))
+        except ValueError as exc:
+            raise Http404(EventCursorPagination.invalid_cursor_message) from exc
+    rows = await akeyset_page(queryset, position, page_size + 1)
+    page = rows[:page_size]
+    if "raw_payload" in fields:
+        await afill_payloads(page)
+    next_link = None
+    if len(rows) > page_size:
+        next_link = replace_query_param(
+            request.build_absolute_uri(),
+            EventCursorPagination.cursor_query_param,
+            encode_cursor(row_position(page[-1])),
+        )
+    results = EventValuesSerializer(page, many=True, fields=fields).data
+    return {"next": next_link, "results": results}
+
+
+async def _page_number_page(request, queryset, fields) -> dict:
+    """Mirror ``StandardResultsSetPagination`` (Django's ``Paginator`` rules)."""
+    page_size = resolve_page_size(request.GET)
+    page_param = StandardResultsSetPagination.page_query_param
+    count = await queryset.acount()
+    num_pages = max(1, math.ceil(count / page_size))
+    raw = request.GET.get(page_param, 1)
+    if raw in StandardResultsSetPagination.last_page_strings:
+        number = num_pages
+    else:
+        try:
+            number = int(raw)
+        except (TypeError, ValueError):
+            number = 0
+    if not 1 <= number <= num_pages:
+        raise Http404(str(StandardResultsSetPagination.invalid_page_message))
+
+    offset = (number - 1) * page_size
+    rows = [row async for row in queryset[offset : offset + page_size]]
+    if "raw_payload" in fields:
+        await afill_payloads(rows)
+    url = request.build_absolute_uri()
+    next_link = previous_link = None
+    if number < num_pages:
+        next_link = replace_query_param(url, page_param, number + 1)
+    if number > 1:
+        previous_link = (
+            remove_query_param(url, page_param)
+            if number == 2
+            else replace_query_param(url, page_param, number - 1)
+        )
+    return {
+        "count": count,
+        "next": next_link,
+        "previous": previous_link,
+        "results": EventValuesSerializer(rows, many=True, fields=fields).data,
+    }
+
+
+__all__ = ["event_detail", "event_facets", "event_list", "health"]
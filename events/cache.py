@@ -0,0 +1,137 @@
+"""Generation-keyed response caching for the events API."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .models import DataGeneration, city_lookup_key
+
+EVENTS_GENERATION = "events"
+
+
+class Generation(NamedTuple):
+    value: int
+    changed_at: datetime | None
+
+
+def current_generation(name: str = EVENTS_GENERATION) -> Generation:
+    row = DataGeneration.objects.filter(name=name).values_list("value", "changed_at")
+    return Generation(*row[0]) if row else Generation(0, None)
+
+
+async def acurrent_generation(name: str = EVENTS_GENERATION) -> Generation:
+    row = (
+        await DataGeneration.objects.filter(name=name)
+        .values_list("value", "changed_at")
+        .afirst()
+    )
+    return Generation(*row) if row else Generation(0, None)
+
+
+def bump_generation(name: str = EVENTS_GENERATION) -> None:
+    """Invalidate cached responses; call inside the transaction that wrote data."""
+    now = timezone.now()
+    updated = DataGeneration.objects.filter(name=name).update(
+        value=F("value") + 1, changed_at=now
+    )
+    if not updated:
+        DataGeneration.objects.get_or_create(
+            name=name, defaults={"value": 1, "changed_at": now}
+        )
+
+
+def request_fingerprint(request) -> str:
+    """Hash the host, path and normalized query params of a request."""
+    query = getattr(request, "query_params", request.GET)
+    params = []
+    for key, values in sorted(query.lists()):
+        if key == "city":
+            values = [city_lookup_key(value) for value in values]
+        elif key == "upcoming":
+            # "Now" moves on; pin the minute that ?upcoming=true filters from.
+            values = [
+                *values,
+                timezone.now().replace(second=0, microsecond=0).isoformat(),
+            ]
+        params.append(f"{key}={','.join(values)}")
+    raw = "|".join([request.get_host(), request.path, "&".join(params)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CacheValidators(NamedTuple):
+    key: str
+    etag: str
+    last_modified: int | None
+
+    def not_modified(self, request):
+        """Return a 304 response when the client's validators still match."""
+        return get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified
+        )
+
+    def apply(self, response):
+        response["ETag"] = self.etag
+        if self.last_modified is not None:
+            response["Last-Modified"] = http_date(self.last_modified)
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+def cache_validators(
+    request, generation: Generation, prefix: str = "events:list"
+) -> CacheValidators:
+    fingerprint = request_fingerprint(request)
+    return CacheValidators(
+        key=f"{prefix}:{generation.value}:{fingerprint}",
+        etag=quote_etag(f"{generation.value}-{fingerprint[:32]}"),
+        # HTTP dates have whole-second precision; If-Modified-Since must match.
+        last_modified=(
+            int(generation.changed_at.timestamp()) if generation.changed_at else None
+        ),
+    )
+
+
+class CachedListMixin:
+    """Serve list responses from Django's cache with ETag/Last-Modified.
+
+    Cache keys embed the data generation, so entries are never stale: the
+    next ingestion commit moves every request onto fresh keys and the old
+    ones simply expire.
+    """
+
+    cache_prefix = "events:list"
+
+    def list(self, request, *args, **kwargs):
+        validators = cache_validators(request, current_generation(), self.cache_prefix)
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+
+        data = cache.get(validators.key)
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            cache.set(validators.key, response.data, settings.EVENTS_CACHE_TIMEOUT)
+        else:
+            response = Response(data)
+        return validators.apply(response)
+
+
+__all__ = [
+    "CacheValidators",
+    "CachedListMixin",
+    "acurrent_generation",
+    "bump_generation",
+    "cache_validators",
+    "current_generation",
+    "request_fingerprint",
+]
@@ -0,0 +1,242 @@
+"""Cross-source duplicate detection.
+
+Providers list the same real-world event under different URLs, so the
+per-source unique constraints cannot merge them. Two events are duplicates
+when they come from different sources, are in the same city, start within
+``START_WINDOW`` of each other and their title tokens are at least
+``TITLE_SIMILARITY`` similar (Jaccard). City plus start window is the
+blocking key: candidates are read through the ``(city_key, -start_date)``
+index and only events inside one window are ever compared, so the work
+grows with the rows touched, not with the square of the table.
+
+Every duplicate points at the oldest (lowest id) event of its cluster
+through ``Event.canonical``; canonical events have no ``canonical``.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import timedelta
+from typing import Any, Iterable, Mapping
+
+from django.db.models import Q
+
+from .facets import FacetTracker
+from .models import Event
+
+START_WINDOW = timedelta(hours=2)
+TITLE_SIMILARITY = 0.6
+STOPWORDS = frozenset(
+    {"a", "an", "and", "at", "by", "for", "from", "in", "of", "on", "the", "to", "with"}
+)
+CANDIDATE_FIELDS = ("id", "source", "title", "city_key", "start_date", "canonical_id")
+DEFAULT_BATCH_SIZE = 2000
+# Keeps OR'd range lookups well below SQLite's expression depth limit.
+WINDOWS_PER_QUERY = 100
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def title_tokens(title: str | None) -> frozenset[str]:
+    """Accent-, case- and stopword-insensitive word set of a title."""
+    decomposed = unicodedata.normalize("NFKD", (title or "").casefold())
+    plain = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return frozenset(
+        token
+        for token in _TOKEN_RE.findall(plain)
+        if len(token) > 1 and token not in STOPWORDS
+    )
+
+
+def similarity(left: frozenset[str], right: frozenset[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _match_score(
+    newer: Mapping[str, Any], older: Mapping[str, Any], tokens: Mapping[int, frozenset]
+) -> float:
+    if newer["source"] == older["source"]:
+        return 0.0
+    if abs(newer["start_date"] - older["start_date"]) > START_WINDOW:
+        return 0.0
+    score = similarity(tokens[newer["id"]], tokens[older["id"]])
+    return score if score >= TITLE_SIMILARITY else 0.0
+
+
+def _window_lookups(rows: Iterable[Mapping[str, Any]]) -> list[Q]:
+    """Merged ``START_WINDOW`` ranges around ``rows``, a few per query."""
+    ranges: list[list[Any]] = []
+    ordered = sorted(rows, key=lambda row: (row["city_key"], row["start_date"]))
+    for row in ordered:
+        low, high = row["start_date"] - START_WINDOW, row["start_date"] + START_WINDOW
+        if ranges and ranges[-1][0] == row["city_key"] and low <= ranges[-1][2]:
+            ranges[-1][2] = high
+        else:
+            ranges.append([row["city_key"], low, high])
+    lookups = []
+    for offset in range(0, len(ranges), WINDOWS_PER_QUERY):
+        by_city: dict[str, Q] = {}
+        for city_key, low, high in ranges[offset : offset + WINDOWS_PER_QUERY]:
+            by_city[city_key] = by_city.get(city_key, Q()) | Q(
+                start_date__range=(low, high)
+            )
+        lookup = Q()
+        for city_key, windows in by_city.items():
+            lookup |= Q(city_key=city_key) & windows
+        lookups.append(lookup)
+    return lookups
+
+
+def link_duplicates(events: Iterable[Any], facets: FacetTracker | None = None) -> int:
+    """Point each of ``events`` at the canonical event it duplicates, if any.
+
+    Only older events are considered, so new rows attach to what is already
+    stored; run ``dedupe_events`` for a full pass. Duplicates of the events
+    are scored again too, since a retitled or moved canonical event may no
+    longer match them; ``facets`` observes each of them before its link
+    changes. The new ``canonical_id`` is also set on the instances. Returns
+    how many of the events are now duplicates.
+    """
+    events = list(events)
+    touched = {
+        event.pk: {name: getattr(event, name) for name in CANDIDATE_FIELDS}
+        for event in events
+        if event.pk and event.city_key and event.start_date
+    }
+    # Rows that cannot be compared (no city or start) are never duplicates.
+    changed: dict[int, int | None] = {
+        event.pk: None
+        for event in events
+        if event.pk and event.canonical_id is not None and event.pk not in touched
+    }
+    pks = [event.pk for event in events if event.pk]
+    if not pks:
+        return 0
+    scored = dict(touched)
+    dependants = {
+        event.pk: event
+        for event in Event.objects.filter(canonical_id__in=pks)
+        .exclude(pk__in=pks)
+        .only(*CANDIDATE_FIELDS, "city", "category")
+    }
+    for pk, event in dependants.items():
+        if facets is not None:
+            facets.observe(event)
+        if event.city_key and event.start_date:
+            scored[pk] = {name: getattr(event, name) for name in CANDIDATE_FIELDS}
+        else:
+            changed[pk] = None
+    if not scored and not changed:
+        return 0
+    stored: dict[int, dict[str, Any]] = {}
+    for windows in _window_lookups(scored.values()):
+        for row in Event.objects.filter(windows).values(*CANDIDATE_FIELDS):
+            stored[row["id"]] = row
+    stored.update(scored)
+    tokens = {pk: title_tokens(row["title"]) for pk, row in stored.items()}
+    by_city: dict[str, list[Mapping[str, Any]]] = {}
+    for row in sorted(stored.values(), key=lambda row: row["start_date"]):
+        by_city.setdefault(row["city_key"], []).append(row)
+    starts = {
+        city_key: [row["start_date"] for row in rows]
+        for city_key, rows in by_city.items()
+    }
+
+    # Ascending ids: a dependant sees the new link of the row it matched.
+    for pk in sorted(scored):
+        row = scored[pk]
+        best: tuple[float, int] | None = None
+        city_rows, city_starts = by_city[row["city_key"]], starts[row["city_key"]]
+        low = bisect_left(city_starts, row["start_date"] - START_WINDOW)
+        high = bisect_right(city_starts, row["start_date"] + START_WINDOW)
+        for other in city_rows[low:high]:
+            if other["id"] >= pk:
+                continue
+            score = _match_score(row, other, tokens)
+            if score and (best is None or (score, -other["id"]) > best):
+                best = (score, -other["id"])
+        root = None
+        if best is not None:
+            older = stored[-best[1]]
+            root = older["canonical_id"] or older["id"]
+        if root != row["canonical_id"]:
+            row["canonical_id"] = root
+            changed[pk] = root
+
+    if changed:
+        updates = [Event(pk=pk, canonical_id=root) for pk, root in changed.items()]
+        Event.objects.bulk_update(updates, ["canonical"])
+        for event in [*events, *dependants.values()]:
+            if event.pk in changed:
+                event.canonical_id = changed[event.pk]
+    return sum(1 for row in touched.values() if row["canonical_id"] is not None)
+
+
+def relink_all(model=None, batch_size: int = DEFAULT_BATCH_SIZE) -> tuple[int, int]:
+    """Recompute ``canonical`` for every event; returns (linked, changed).
+
+    Rows are streamed per city in start order, keeping only the rows inside
+    one ``START_WINDOW``, and each matching pair links the newer event to
+    the older one. ``model`` lets migrations pass their historical model.
+    """
+    model = model or Event
+    best: dict[int, tuple[float, int]] = {}
+    linked: dict[int, int] = {}
+    window: deque[Mapping[str, Any]] = deque()
+    tokens: dict[int, frozenset] = {}
+    rows = (
+        model.objects.exclude(city_key="")
+        .filter(start_date__isnull=False)
+        .order_by("city_key", "-start_date")
+        .values(*CANDIDATE_FIELDS)
+        .iterator(chunk_size=batch_size)
+    )
+    for row in rows:
+        if row["canonical_id"] is not None:
+            linked[row["id"]] = row["canonical_id"]
+        while window and (
+            window[0]["city_key"] != row["city_key"]
+            or window[0]["start_date"] - row["start_date"] > START_WINDOW
+        ):
+            tokens.pop(window.popleft()["id"])
+        tokens[row["id"]] = title_tokens(row["title"])
+        for other in window:
+            newer, older = (row, other) if row["id"] > other["id"] else (other, row)
+            score = _match_score(newer, older, tokens)
+            candidate = (score, -older["id"])
+            if score and candidate > best.get(newer["id"], (0.0, 0)):
+                best[newer["id"]] = candidate
+        window.append(row)
+
+    roots: dict[int, int] = {}
+    changes = [model(pk=pk, canonical_id=None) for pk in linked.keys() - best.keys()]
+    for pk in best:
+        # Links always point at older rows, so following them terminates.
+        chain = [pk]
+        while chain[-1] in best and chain[-1] not in roots:
+            chain.append(-best[chain[-1]][1])
+        root = roots.get(chain[-1], chain[-1])
+        roots.update(dict.fromkeys(chain[:-1], root))
+        if root != linked.get(pk):
+            changes.append(model(pk=pk, canonical_id=root))
+    # Rows that cannot be compared (no city or start) are never duplicates.
+    cleared = (
+        model.objects.filter(canonical__isnull=False)
+        .filter(Q(city_key="") | Q(start_date__isnull=True))
+        .update(canonical=None)
+    )
+    model.objects.bulk_update(changes, ["canonical"], batch_size=batch_size)
+    return len(best), len(changes) + cleared
+
+
+__all__ = [
+    "link_duplicates",
+    "relink_all",
+    "similarity",
+    "title_tokens",
+]
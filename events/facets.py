@@ -0,0 +1,202 @@
+"""Precomputed event counts per city, category, source and start month.
+
+``EventFacet`` holds one row per combination that has listed events, so
+facet requests aggregate a table whose size follows the number of distinct
+combinations, never the number of events. Ingestion observes every row it
+writes with a ``FacetTracker`` (membership before the write, then after
+duplicate linking) and applies the net change with ``F()`` increments in
+the same transaction. ``rebuild_facets`` recounts everything from scratch.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime
+from typing import Any, Collection, Mapping
+
+from django.db.models import Count, F, Min, QuerySet, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Event, EventFacet, city_lookup_key
+
+KEY_FIELDS = ("city_key", "category", "source", "month")
+# Breakdowns returned by the API: name -> column grouped on. Every name is
+# also the column holding the value shown for the group.
+FACETS = {
+    "city": "city_key",
+    "category": "category",
+    "source": "source",
+    "month": "month",
+}
+
+FacetKey = tuple[str, str, str, str]
+
+
+def start_month(start_date: datetime | None) -> str:
+    """``YYYY-MM`` of a start date in the current time zone, "" if undated."""
+    if start_date is None:
+        return ""
+    return timezone.localtime(start_date).strftime("%Y-%m")
+
+
+def facet_key(event: Any) -> FacetKey | None:
+    """The facet row ``event`` is counted in; ``None`` for duplicates."""
+    if event.canonical_id is not None:
+        return None
+    return (
+        event.city_key,
+        event.category,
+        event.source,
+        start_month(event.start_date),
+    )
+
+
+class FacetTracker:
+    """Collects facet count changes of the events written in a transaction."""
+
+    def __init__(self) -> None:
+        self._observed: list[tuple[Any, FacetKey | None]] = []
+
+    def observe(self, event: Any) -> None:
+        """Remember the stored membership of ``event``; call before changing it.
+
+        Unsaved events have no stored membership.
+        """
+        self._observed.append((event, facet_key(event) if event.pk else None))
+
+    def apply(self) -> int:
+        """Write the net changes since ``observe``; returns facet rows touched."""
+        deltas: Counter[FacetKey] = Counter()
+        cities: dict[str, str] = {}
+        for event, before in self._observed:
+            after = facet_key(event)
+            if after == before:
+                continue
+            if before is not None:
+                deltas[before] -= 1
+            if after is not None:
+                deltas[after] += 1
+                cities[event.city_key] = event.city
+        self._observed.clear()
+        changed = {key: delta for key, delta in deltas.items() if delta}
+        if not changed:
+            return 0
+        stored = _facet_pks(changed)
+        missing = [key for key in changed if key not in stored]
+        if missing:
+            EventFacet.objects.bulk_create(
+                [
+                    EventFacet(
+                        **dict(zip(KEY_FIELDS, key, strict=True)),
+                        city=cities.get(key[0], key[0]),
+                    )
+                    for key in missing
+                ],
+                ignore_conflicts=True,
+            )
+            stored.update(_facet_pks(missing))
+        by_delta: dict[int, list[int]] = {}
+        for key, pk in stored.items():
+            by_delta.setdefault(changed[key], []).append(pk)
+        # Deltas take only a few distinct values, so this is a handful of
+        # statements, and relative updates never lose a concurrent write.
+        for delta, pks in by_delta.items():
+            EventFacet.objects.filter(pk__in=pks).update(count=F("count") + delta)
+        touched = [pk for pks in by_delta.values() for pk in pks]
+        EventFacet.objects.filter(pk__in=touched, count__lte=0).delete()
+        return len(changed)
+
+
+def _facet_pks(keys: Collection[FacetKey]) -> dict[FacetKey, int]:
+    """Primary keys of the stored facet rows for ``keys``."""
+    candidates = EventFacet.objects.filter(
+        **{
+            f"{name}__in": {key[index] for key in keys}
+            for index, name in enumerate(KEY_FIELDS)
+        }
+    ).values_list("pk", *KEY_FIELDS)
+    wanted = set(keys)
+    return {tuple(key): pk for pk, *key in candidates if tuple(key) in wanted}
+
+
+def rebuild_facets(model=None, facet_model=None) -> int:
+    """Recount every facet row from the events table; returns the row count.
+
+    This reads the whole table once. ``model`` and ``facet_model`` let
+    migrations pass their historical models.
+    """
+    model = model or Event
+    facet_model = facet_model or EventFacet
+    groups = (
+        model.objects.filter(canonical__isnull=True)
+        .annotate(month_start=TruncMonth("start_date"))
+        .values("city_key", "category", "source", "month_start")
+        .annotate(city=Min("city"), count=Count("id"))
+        .order_by()
+    )
+    facets = [
+        facet_model(
+            city_key=row["city_key"],
+            city=row["city"],
+            category=row["category"],
+            source=row["source"],
+            month=start_month(row["month_start"]),
+            count=row["count"],
+        )
+        for row in groups.iterator()
+    ]
+    facet_model.objects.all().delete()
+    facet_model.objects.bulk_create(facets, batch_size=1000)
+    return len(facets)
+
+
+def facet_queries(params: Mapping[str, str]) -> dict[str, QuerySet]:
+    """One aggregate query per breakdown, narrowed by the request's filters.
+
+    ``city`` matches case-insensitively; ``category``, ``source`` and
+    ``month`` (``YYYY-MM``) match exactly. Every filter applies to every
+    breakdown.
+    """
+    rows = EventFacet.objects.filter(count__gt=0)
+    city = params.get("city")
+    if city:
+        rows = rows.filter(city_key=city_lookup_key(city))
+    for name in ("category", "source", "month"):
+        value = params.get(name)
+        if value:
+            rows = rows.filter(**{name: value})
+    return {
+        name: rows.values(column)
+        .annotate(value=Min(name), count=Sum("count"))
+        .order_by("-count", "value")
+        for name, column in FACETS.items()
+    }
+
+
+def facet_payload(groups: Mapping[str, list[Mapping[str, Any]]]) -> dict:
+    """Shape the rows of ``facet_queries`` into the API response.
+
+    Blank categories and months are reported as ``null``; months are listed
+    chronologically with undated events last.
+    """
+    facets = {
+        name: [
+            {"value": row["value"] or None, "count": row["count"]}
+            for row in groups[name]
+        ]
+        for name in FACETS
+    }
+    facets["month"].sort(key=lambda entry: (entry["value"] is None, entry["value"]))
+    total = sum(entry["count"] for entry in facets["source"])
+    return {"total": total, "facets": facets}
+
+
+__all__ = [
+    "FacetTracker",
+    "facet_key",
+    "facet_payload",
+    "facet_queries",
+    "rebuild_facets",
+    "start_month",
+]
@@ -0,0 +1,96 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from events.models import Event, city_lookup_key
+from events.serializers import EventSerializer
+from events.views import EventListView, list_columns
+
+DUMMY_CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+class SerializerEventListView(EventListView):
+    """The list view as it was before the fast path: model rows + ModelSerializer."""
+
+    serializer_class = EventSerializer
+    renderer_classes = [JSONRenderer]
+    json_fast_path = False
+
+    def get_queryset(self):
+        return self.get_base_queryset().only(*list_columns(self.selected_fields))
+
+
+class Command(BaseCommand):
+    help = "Measure /api/events throughput for the serializer and fast paths."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--city", default="")
+        parser.add_argument(
+            "--expand",
+            action="store_true",
+            help="Include raw_payload in every response.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Insert this many synthetic events for the run (rolled back).",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be a positive integer.")
+        query = {"page_size": options["page_size"]}
+        if options["city"]:
+            query["city"] = options["city"]
+        if options["expand"]:
+            query["expand"] = "raw_payload"
+
+        with transaction.atomic(), override_settings(CACHES=DUMMY_CACHES):
+            if options["seed"]:
+                self._seed(options["seed"], options["city"] or "Johannesburg")
+            baseline = self._run(SerializerEventListView, query, options["requests"])
+            fast = self._run(EventListView, query, options["requests"])
+            transaction.set_rollback(True)
+
+        for label, (rate, _) in (("serializer", baseline), ("fast path", fast)):
+            self.stdout.write(f"{label:>10}: {rate:,.0f} requests/sec")
+        self.stdout.write(f"   speedup: {fast[0] / baseline[0]:.2f}x")
+        identical = "yes" if fast[1] == baseline[1] else "NO"
+        self.stdout.write(f"identical response bodies: {identical}")
+
+    def _run(self, view_class, query, requests):
+        view = view_class.as_view()
+        factory = RequestFactory()
+        body = b""
+        started = time.perf_counter()
+        for _ in range(requests):
+            request = factory.get("/api/events", query, HTTP_HOST="localhost")
+            response = view(request)
+            response.render()
+            body = response.content
+        return requests / (time.perf_counter() - started), body
+
+    def _seed(self, count: int, city: str) -> None:
+        start = timezone.now()
+        Event.objects.bulk_create(
+            Event(
+                title=f"Benchmark event {index}",
+                start_date=start + timedelta(hours=index) if index % 10 else None,
+                venue_name=f"Venue {index % 50}",
+                city=city,
+                city_key=city_lookup_key(city),
+                category="Benchmark",
+                event_url=f"https://bench.example.com/events/{index}",
+                source="benchmark",
+                raw_payload={"id": index, "name": f"Benchmark event {index}"},
+            )
+            for index in range(count)
+        )
@@ -0,0 +1,129 @@
+import resource
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+
+from events.services.clients.synthetic_client import SHAPES, SyntheticEventClient
+from events.services.ingestion import DEFAULT_BATCH_SIZE, ingest_with_report
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` hook counting executed statements."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = "Benchmark ingest_with_report against synthetic provider payloads."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--size", type=int, default=10000)
+        parser.add_argument("--shape", choices=SHAPES, default="mixed")
+        parser.add_argument(
+            "--duplicate-ratio",
+            type=float,
+            default=0.1,
+            help="Share of items repeating an earlier item (default 0.1).",
+        )
+        parser.add_argument(
+            "--city",
+            action="append",
+            dest="cities",
+            help="City in the mix, optionally weighted as Name=weight.",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--stream", action="store_true")
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=2,
+            help="Repeat ingestion to measure steady-state re-ingests (default 2).",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Also print the per-stage breakdown (adds some overhead).",
+        )
+        parser.add_argument(
+            "--in-place",
+            action="store_true",
+            help="Use the configured database instead of a throwaway test database.",
+        )
+
+    def handle(self, *args, **options):
+        if options["size"] < 1 or options["runs"] < 1:
+            raise CommandError("--size and --runs must be positive integers.")
+        client = SyntheticEventClient(
+            size=options["size"],
+            shape=options["shape"],
+            duplicate_ratio=options["duplicate_ratio"],
+            city_mix=self._parse_city_mix(options.get("cities")),
+            seed=options["seed"],
+        )
+
+        old_name = connection.settings_dict["NAME"]
+        if not options["in_place"]:
+            connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+        try:
+            for run in range(1, options["runs"] + 1):
+                self._run(run, client, options)
+        finally:
+            if not options["in_place"]:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def _run(self, run: int, client: SyntheticEventClient, options) -> None:
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            report = ingest_with_report(
+                client,
+                batch_size=options["batch_size"],
+                stream=options["stream"],
+                workers=options["workers"],
+                profile=options["profile"],
+            )
+        elapsed = time.perf_counter() - started
+        items = client.items_generated
+        self.stdout.write(
+            f"Run {run}: {items} items in {elapsed:.2f}s "
+            f"({items / elapsed:,.0f} items/sec), "
+            f"{counter.count} queries ({counter.count / items:.3f}/item), "
+            f"peak RSS {self._peak_rss_mb():.1f} MB"
+        )
+        self.stdout.write(
+            f"        created {report.created}, updated {report.updated}, "
+            f"unchanged {report.unchanged}, skipped {report.skipped}, "
+            f"errors {report.errors}"
+        )
+        if report.profile:
+            self.stdout.write(report.profile.to_text())
+
+    @staticmethod
+    def _parse_city_mix(values):
+        if not values:
+            return None
+        mix = {}
+        for value in values:
+            name, _, weight = value.partition("=")
+            try:
+                mix[name.strip()] = float(weight) if weight else 1.0
+            except ValueError as exc:
+                raise CommandError(f"Invalid city weight in '{value}'") from exc
+        return mix
+
+    @staticmethod
+    def _peak_rss_mb() -> float:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes.
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
@@ -0,0 +1,123 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test import RequestFactory, override_settings
+
+from events.models import Event, EventPayload
+from events.payloads import COMPRESSED, INLINE, compress_existing
+from events.services.clients.synthetic_client import SyntheticEventClient
+from events.services.ingestion import ingest_with_report
+from events.views import EventListView
+
+DUMMY_CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+TABLES = (Event._meta.db_table, EventPayload._meta.db_table)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare table size and /api/events latency with inline payloads and "
+        "after moving them to compressed storage, on a throwaway test database."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--size", type=int, default=10000)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument(
+            "--duplicate-ratio",
+            type=float,
+            default=0.1,
+            help="Share of items repeating an earlier item (default 0.1).",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options["size"] < 1 or options["requests"] < 1:
+            raise CommandError("--size and --requests must be positive integers.")
+        client = SyntheticEventClient(
+            size=options["size"],
+            duplicate_ratio=options["duplicate_ratio"],
+            seed=options["seed"],
+        )
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            with override_settings(CACHES=DUMMY_CACHES):
+                with override_settings(EVENT_PAYLOAD_STORAGE=INLINE):
+                    ingest_with_report(client)
+                before = self._measure(INLINE, options)
+                moved = compress_existing()
+                with override_settings(EVENT_PAYLOAD_STORAGE=COMPRESSED):
+                    after = self._measure(COMPRESSED, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        distinct = after["payloads"]
+        self.stdout.write(f"Moved {moved} payloads into {distinct} distinct blobs")
+        for label, sizes in (("inline", before), ("compressed", after)):
+            tables = ", ".join(
+                f"{table} {self._format_bytes(sizes[table])}" for table in TABLES
+            )
+            self.stdout.write(f"{label:>10}: {tables}")
+            for expand in (False, True):
+                name = "list+payload" if expand else "list"
+                self.stdout.write(f"{'':>10}  {name:<13}{sizes[expand][0]:.2f} ms")
+        identical = all(
+            before[expand][1] == after[expand][1] for expand in (False, True)
+        )
+        self.stdout.write(f"identical response bodies: {'yes' if identical else 'NO'}")
+
+    def _measure(self, storage: str, options) -> dict:
+        if connection.vendor == "sqlite":
+            # Free pages left behind by the move would hide the savings.
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM")
+        result = {table: self._table_bytes(table) for table in TABLES}
+        result["payloads"] = EventPayload.objects.count()
+        for expand in (False, True):
+            query = {"page_size": options["page_size"], "pagination": "page"}
+            if expand:
+                query["expand"] = "raw_payload"
+            result[expand] = self._time_list(query, options["requests"])
+        return result
+
+    @staticmethod
+    def _time_list(query, requests: int) -> tuple[float, bytes]:
+        view = EventListView.as_view()
+        factory = RequestFactory()
+        body = b""
+        started = time.perf_counter()
+        for page in range(requests):
+            request = factory.get(
+                "/api/events", {**query, "page": page % 20 + 1}, HTTP_HOST="localhost"
+            )
+            response = view(request)
+            response.render()
+            body = response.content
+        return (time.perf_counter() - started) * 1000 / requests, body
+
+    @staticmethod
+    def _table_bytes(table: str) -> int | None:
+        """Bytes used by ``table`` and its indexes, if the backend reports it."""
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute(
+                    "SELECT SUM(d.pgsize) FROM dbstat d "
+                    "JOIN sqlite_schema s ON s.name = d.name "
+                    "WHERE s.tbl_name = %s",
+                    [table],
+                )
+            elif connection.vendor == "postgresql":
+                cursor.execute("SELECT pg_total_relation_size(%s)", [table])
+            else:
+                return None
+            return cursor.fetchone()[0] or 0
+
+    @staticmethod
+    def _format_bytes(size: int | None) -> str:
+        if size is None:
+            return "n/a"
+        return f"{size / (1024 * 1024):.2f} MB"
@@ -1,12 +1,15 @@
+import argparse
 import os
+from pathlib import Path
 from typing import Sequence
 
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError, CommandParser
 
-from events.services.ingestion import ingest_with_report
-
-PROVIDERS = ("fixtures", "google", "apify_facebook")
+from events.services.clients.cached_client import CachedEventClient
+from events.services.clients.multi_source_client import MultiSourceClient
+from events.services.clients.registry import PROVIDERS, build_client
+from events.services.ingestion import DEFAULT_BATCH_SIZE, ingest_with_report
 
 
 class Command(BaseCommand):
@@ -21,13 +24,80 @@ class Command(BaseCommand):
         )
         parser.add_argument(
             "--source",
+            dest="sources",
+            nargs="+",
             choices=PROVIDERS,
-            default=os.getenv("EVENT_PROVIDER", "fixtures"),
-            help="Provider to use for ingestion (defaults to EVENT_PROVIDER).",
+            default=os.getenv("EVENT_PROVIDER", "fixtures").split(","),
+            help="Provider(s) to use for ingestion (defaults to EVENT_PROVIDER, "
+            "which may be comma-separated). Several providers are fetched "
+            "concurrently into one write pipeline.",
+        )
+        parser.add_argument(
+            "--path",
+            type=Path,
+            default=None,
+            help="File or directory of .json/.jsonl exports (gzip allowed) for "
+            "--source fixtures; defaults to the bundled fixtures.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows written per bulk upsert (default {DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--apify-concurrency",
+            type=int,
+            default=None,
+            help="Apify actor runs to execute in parallel (defaults to "
+            "APIFY_CONCURRENCY).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes used to normalize payloads (default 1, in-process).",
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help="Commit every batch separately and report progress as it goes.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue the last interrupted --stream run for the same source "
+            "and cities from its checkpoint (implies --stream).",
+        )
+        parser.add_argument(
+            "--cache",
+            action=argparse.BooleanOptionalAction,
+            default=False,
+            help="Replay provider payloads fetched within PROVIDER_CACHE_TTL "
+            "seconds from disk, recording them on a miss (default off).",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Print per-stage timings, DB query counts and the slowest items.",
+        )
+        parser.add_argument(
+            "--profile-format",
+            choices=("text", "json", "prometheus"),
+            default="text",
+            help="Output format for --profile (default text).",
         )
 
     def handle(self, *args, **options):
-        provider_key: str = options["source"]
+        sources = list(dict.fromkeys(source.strip() for source in options["sources"]))
+        if invalid := set(sources) - set(PROVIDERS):
+            raise CommandError(f"Unsupported provider(s): {', '.join(sorted(invalid))}")
+        batch_size: int = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        workers: int = options["workers"]
+        if workers < 1:
+            raise CommandError("--workers must be a positive integer.")
         cities: Sequence[str] | None = options.get("cities")
         city_filters = (
             [city.strip() for city in cities if city and city.strip()]
@@ -35,53 +105,107 @@ class Command(BaseCommand):
             else None
         )
 
-        client = self._build_client(provider_key, city_filters)
+        try:
+            clients = [
+                build_client(
+                    source,
+                    city_filters,
+                    concurrency=options["apify_concurrency"],
+                    path=options["path"],
+                )
+                for source in sources
+            ]
+        except (ValueError, FileNotFoundError) as exc:
+            raise CommandError(str(exc)) from exc
+        if options["cache"]:
+            clients = [
+                CachedEventClient(
+                    client,
+                    cache_dir=settings.PROVIDER_CACHE_DIR,
+                    ttl=settings.PROVIDER_CACHE_TTL,
+                    max_bytes=settings.PROVIDER_CACHE_MAX_MB * 1024 * 1024,
+                )
+                for client in clients
+            ]
+        client = clients[0] if len(clients) == 1 else MultiSourceClient(clients)
 
         allowed_cities = (
             {city.title() for city in city_filters} if city_filters else None
         )
 
-        report = ingest_with_report(client, allowed_cities=allowed_cities)
+        resume: bool = options["resume"]
+        if resume and options["cache"]:
+            raise CommandError("--resume cannot be combined with --cache.")
+        if resume and len(clients) > 1:
+            raise CommandError("--resume supports a single --source.")
+        if resume and not client.supports_resume:
+            raise CommandError(f"--resume is not supported for --source {sources[0]}.")
+        stream: bool = options["stream"] or resume
+        report = ingest_with_report(
+            client,
+            allowed_cities=allowed_cities,
+            batch_size=batch_size,
+            stream=stream,
+            workers=workers,
+            profile=options["profile"],
+            resume=resume,
+            progress=self._write_progress if stream else None,
+        )
+
+        if report.resumed:
+            self.stdout.write("Resumed from the last checkpoint.")
+        elif resume:
+            self.stdout.write("No unfinished checkpoint found; ran from the start.")
 
         summary = (
             f"Created: {report.created}, "
             f"Updated: {report.updated}, "
+            f"Unchanged: {report.unchanged}, "
             f"Skipped: {report.skipped}, "
-            f"Errors: {len(report.errors)}"
+            f"Errors: {report.errors}"
         )
         self.stdout.write(self.style.SUCCESS(summary))
+        if report.duplicates:
+            self.stdout.write(
+                f"Linked {report.duplicates} row(s) to events from other sources."
+            )
 
-        if allowed_cities:
-            self.stdout.write(f"Cities processed: {', '.join(sorted(allowed_cities))}")
-
-        if report.errors:
-            for error in report.errors:
-                self.stderr.write(self.style.ERROR(error))
+        if len(clients) > 1:
+            for provider, counts in report.providers.items():
+                self.stdout.write(
+                    f"  {provider}: "
+                    + ", ".join(f"{name} {count}" for name, count in counts.items())
+                )
 
-    def _build_client(self, provider_key: str, cities: Sequence[str] | None):
-        if provider_key == "fixtures":
-            from events.services.clients.fixture_client import FixtureEventClient
+        for cached in clients:
+            if getattr(cached, "cache_hit", False):
+                self.stdout.write(
+                    f"Replayed {cached.provider_name} payloads from {cached.cache_dir}"
+                )
 
-            return FixtureEventClient()
-        if provider_key == "google":
-            from events.services.clients.google_client import GoogleEventClient
+        if allowed_cities:
+            self.stdout.write(f"Cities processed: {', '.join(sorted(allowed_cities))}")
 
-            api_key = os.getenv("GOOGLE_API_KEY")
-            cse_id = os.getenv("GOOGLE_CSE_ID")
-            if not api_key or not cse_id:
-                raise CommandError(
-                    "GOOGLE_API_KEY and GOOGLE_CSE_ID environment variables are required."
-                )
-            return GoogleEventClient(api_key=api_key, cse_id=cse_id)
-        if provider_key == "apify_facebook":
-            from events.services.clients.apify_facebook_client import ApifyFacebookClient
-
-            if not settings.APIFY_TOKEN:
-                raise CommandError("APIFY_TOKEN must be configured for Apify ingestion.")
-            return ApifyFacebookClient(
-                api_token=settings.APIFY_TOKEN,
-                actor_id=settings.APIFY_ACTOR_ID,
-                max_events=settings.APIFY_MAX_EVENTS,
-                cities=cities,
-            )
-        raise CommandError(f"Unsupported provider '{provider_key}'")
+        if report.profile:
+            profile_format = options["profile_format"]
+            if profile_format == "json":
+                self.stdout.write(report.profile.to_json())
+            elif profile_format == "prometheus":
+                self.stdout.write(report.profile.to_prometheus(), ending="")
+            else:
+                self.stdout.write(report.profile.to_text())
+
+        for error in report.error_sample:
+            self.stderr.write(self.style.ERROR(error))
+        if report.errors > len(report.error_sample):
+            hidden = report.errors - len(report.error_sample)
+            self.stderr.write(self.style.ERROR(f"... and {hidden} more error(s)"))
+        for provider, failure in getattr(client, "failures", {}).items():
+            self.stderr.write(self.style.ERROR(f"{provider} fetch failed: {failure}"))
+
+    def _write_progress(self, report) -> None:
+        self.stdout.write(
+            f"Committed chunk {report.chunks}: {report.processed} rows processed "
+            f"({report.created} created, {report.updated} updated, "
+            f"{report.unchanged} unchanged, {report.skipped} skipped)"
+        )
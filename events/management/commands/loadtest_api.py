@@ -0,0 +1,104 @@
+import random
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test a running API server with concurrent, optionally slow, clients. "
+        "Compare SERVER_INTERFACE=wsgi and asgi deployments with the same flags."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("url", help="e.g. http://127.0.0.1:8000/api/events")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=0.0,
+            help=(
+                "Mean seconds each client pauses mid-request (uniformly "
+                "jittered), like a slow mobile link."
+            ),
+        )
+        parser.add_argument("--timeout", type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["requests"] < 1:
+            raise CommandError("--concurrency and --requests must be positive.")
+        parts = urlsplit(options["url"])
+        if parts.scheme != "http" or not parts.hostname:
+            raise CommandError("Only plain http:// URLs are supported.")
+
+        target = (parts.hostname, parts.port or 80)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        head = f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n".encode()
+        tail = b"Accept: application/json\r\nConnection: close\r\n\r\n"
+
+        latencies: list[float] = []
+        statuses: dict[str, int] = {}
+        lock = threading.Lock()
+
+        def one_request(_):
+            started = time.perf_counter()
+            try:
+                status = self._request(
+                    target, head, tail, options["client_delay"], options["timeout"]
+                )
+            except OSError as exc:
+                status = type(exc).__name__
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            list(pool.map(one_request, range(options["requests"])))
+        wall = time.perf_counter() - started
+
+        latencies.sort()
+        self.stdout.write(f"URL: {options['url']}")
+        self.stdout.write(
+            f"Concurrency: {options['concurrency']}  Requests: {options['requests']}  "
+            f"Client delay: {options['client_delay']:.3f}s"
+        )
+        self.stdout.write(f"Throughput: {options['requests'] / wall:,.1f} req/s")
+        self.stdout.write(
+            "Latency ms: "
+            f"p50={self._percentile(latencies, 50) * 1000:.1f}  "
+            f"p95={self._percentile(latencies, 95) * 1000:.1f}  "
+            f"p99={self._percentile(latencies, 99) * 1000:.1f}  "
+            f"mean={statistics.fmean(latencies) * 1000:.1f}"
+        )
+        summary = ", ".join(
+            f"{key}: {count}" for key, count in sorted(statuses.items())
+        )
+        self.stdout.write(f"Responses: {summary}")
+
+    @staticmethod
+    def _request(target, head: bytes, tail: bytes, delay: float, timeout: float):
+        with socket.create_connection(target, timeout=timeout) as sock:
+            sock.sendall(head)
+            if delay:
+                time.sleep(random.uniform(0, 2 * delay))
+            sock.sendall(tail)
+            chunks = []
+            while chunk := sock.recv(65536):
+                chunks.append(chunk)
+        status_line = b"".join(chunks).split(b"\r\n", 1)[0].split()
+        return status_line[1].decode() if len(status_line) > 1 else "invalid"
+
+    @staticmethod
+    def _percentile(values: list[float], pct: int) -> float:
+        index = min(len(values) - 1, round(pct / 100 * (len(values) - 1)))
+        return values[index]
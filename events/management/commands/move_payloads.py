@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from events.payloads import (
+    COMPRESSED,
+    INLINE,
+    compress_existing,
+    inline_existing,
+    prune_payloads,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move stored event payloads between inline and compressed storage, "
+        "then delete compressed payloads that no event references. Run it "
+        "while no ingestion is running."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--to",
+            choices=(COMPRESSED, INLINE),
+            help="Storage to move existing payloads into. Without it, only "
+            "unreferenced payloads are deleted.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        target = options["to"]
+        moved = 0
+        if target == COMPRESSED:
+            moved = compress_existing()
+        elif target == INLINE:
+            moved = inline_existing()
+        pruned = prune_payloads()
+        if target and target != settings.EVENT_PAYLOAD_STORAGE:
+            self.stderr.write(
+                f"EVENT_PAYLOAD_STORAGE is '{settings.EVENT_PAYLOAD_STORAGE}'; "
+                f"set it to '{target}' so new payloads are stored the same way."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Moved: {moved}, Pruned: {pruned} "
+                f"({time.perf_counter() - started:.1f}s)"
+            )
+        )
@@ -0,0 +1,117 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+
+from events.models import IngestionJob
+from events.services.clients.registry import PROVIDERS
+from events.services.ingestion import DEFAULT_BATCH_SIZE
+from events.services.sanitation import normalize_city
+from events.services.scheduler import (
+    DEFAULT_CONCURRENCY,
+    POLL_INTERVAL,
+    IngestionWorker,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run scheduled ingestion jobs from the IngestionJob table in a "
+        "long-running process. Stop it with SIGINT or SIGTERM; running jobs "
+        "are finished first."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--schedule",
+            action="append",
+            default=[],
+            metavar="PROVIDER[:CITY]",
+            help="Create or update the job for a provider, optionally for one "
+            f"city, before starting ({', '.join(PROVIDERS)}). Repeatable.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=3600,
+            help="Seconds between runs of the --schedule jobs (default 3600).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help=f"Jobs run at the same time (default {DEFAULT_CONCURRENCY}).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=POLL_INTERVAL,
+            help=f"Seconds between checks for due jobs (default {POLL_INTERVAL:g}).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows written per bulk upsert (default {DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run every job that is due now once, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        for name in ("interval", "concurrency", "batch_size"):
+            if options[name] < 1:
+                option = name.replace("_", "-")
+                raise CommandError(f"--{option} must be a positive integer.")
+        if options["poll_interval"] <= 0:
+            raise CommandError("--poll-interval must be positive.")
+        for value in options["schedule"]:
+            self._schedule(value, options["interval"])
+
+        concurrency = options["concurrency"]
+        if connection.vendor == "sqlite" and concurrency > 1:
+            # A second SQLite writer fails at once instead of waiting.
+            self.stderr.write("SQLite allows one writer; running one job at a time.")
+            concurrency = 1
+        worker = IngestionWorker(
+            concurrency=concurrency,
+            poll_interval=options["poll_interval"],
+            batch_size=options["batch_size"],
+            on_finish=self._write_result,
+        )
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+        jobs = IngestionJob.objects.filter(enabled=True).count()
+        self.stdout.write(
+            f"Worker {worker.owner} started: {jobs} enabled job(s), "
+            f"up to {worker.concurrency} at a time."
+        )
+        worker.run(stop, once=options["once"])
+        self.stdout.write("Worker stopped.")
+
+    def _schedule(self, value: str, interval: int) -> None:
+        provider, _, city = value.partition(":")
+        provider = provider.strip()
+        if provider not in PROVIDERS:
+            raise CommandError(f"Unsupported provider '{provider}'")
+        job, created = IngestionJob.objects.update_or_create(
+            provider=provider,
+            city=normalize_city(city),
+            defaults={"interval": interval, "enabled": True},
+        )
+        self.stdout.write(f"{'Scheduled' if created else 'Updated'} {job}")
+
+    def _write_result(self, job: IngestionJob, report) -> None:
+        if job.last_error:
+            self.stderr.write(self.style.ERROR(f"{job} failed: {job.last_error}"))
+        if report is not None:
+            self.stdout.write(
+                f"{job}: created {report.created}, updated {report.updated}, "
+                f"unchanged {report.unchanged}, skipped {report.skipped}, "
+                f"errors {report.errors}; next run at "
+                f"{job.next_run_at:%Y-%m-%d %H:%M:%S}"
+            )
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.27 on 2026-10-18 03:11
+
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_city_key(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    batch = []
+    for event in Event.objects.only("id", "city").iterator(
+        chunk_size=BACKFILL_BATCH_SIZE
+    ):
+        event.city_key = (event.city or "").strip().lower()
+        batch.append(event)
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            Event.objects.bulk_update(batch, ["city_key"])
+            batch = []
+    if batch:
+        Event.objects.bulk_update(batch, ["city_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0002_alter_event_start_date"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="event",
+            name="event_city_idx",
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="city_key",
+            field=models.CharField(
+                default="",
+                editable=False,
+                help_text="Lowercased city used for case-insensitive filtering.",
+                max_length=100,
+            ),
+        ),
+        migrations.RunPython(backfill_city_key, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["city_key", "-start_date", "title"],
+                name="event_city_key_start_idx",
+            ),
+        ),
+    ]
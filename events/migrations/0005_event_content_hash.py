@@ -0,0 +1,25 @@
+# Generated by Django 4.2.27 on 2026-10-18 03:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0004_data_generation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                help_text=(
+                    "Hash of the stored columns, used to skip unchanged re-ingests."
+                ),
+                max_length=64,
+                null=True,
+            ),
+        ),
+    ]
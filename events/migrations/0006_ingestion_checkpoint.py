@@ -0,0 +1,28 @@
+# Generated by Django 4.2.27 on 2026-10-18 03:24
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0005_event_content_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestionCheckpoint",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("provider", models.CharField(max_length=50)),
+                ("state", models.JSONField(default=dict)),
+                ("started_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,73 @@
+from django.db import migrations
+
+# Frozen copy of the index definitions in events.search at the time of this
+# migration; later changes there must not alter what it creates.
+FTS_TABLE = "events_event_fts"
+SQLITE_FTS_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, venue_name, category, content='events_event', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+_FTS_INSERT = (
+    f"INSERT INTO {FTS_TABLE}(rowid, title, venue_name, category) "
+    "VALUES (new.id, new.title, new.venue_name, new.category);"
+)
+_FTS_DELETE = (
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, venue_name, category) "
+    "VALUES ('delete', old.id, old.title, old.venue_name, old.category);"
+)
+SQLITE_FTS_TRIGGERS = (
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON events_event "
+    f"BEGIN {_FTS_INSERT} END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON events_event "
+    f"BEGIN {_FTS_DELETE} END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF "
+    "title, venue_name, category ON events_event "
+    f"BEGIN {_FTS_DELETE} {_FTS_INSERT} END",
+)
+POSTGRES_INDEX = "event_search_idx"
+POSTGRES_VECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(venue_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(category, '')), 'C'))"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_FTS_TABLE)
+        for trigger in SQLITE_FTS_TRIGGERS:
+            schema_editor.execute(trigger)
+        # Index the rows that existed before the triggers.
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+        schema_editor.execute("PRAGMA analysis_limit = 1000")
+        schema_editor.execute("ANALYZE events_event")
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {POSTGRES_INDEX} ON events_event "
+            f"USING gin ({POSTGRES_VECTOR})"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {POSTGRES_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0006_ingestion_checkpoint"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,128 @@
+# Generated by Django 4.2.27 on 2026-10-18 03:54
+
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 1000
+# Frozen copies of events.geo and events.services.sanitation helpers, so the
+# backfill does not change when those modules do.
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def parse_coordinates(latitude, longitude):
+    missing = {"latitude": None, "longitude": None}
+    if isinstance(latitude, bool) or isinstance(longitude, bool):
+        return missing
+    try:
+        lat = round(float(latitude), 6)
+        lng = round(float(longitude), 6)
+    except (TypeError, ValueError):
+        return missing
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0) or lat == lng == 0.0:
+        return missing
+    return {"latitude": lat, "longitude": lng}
+
+
+def payload_coordinates(raw):
+    """Coordinates from any of the Places, Apify or CSE payload shapes."""
+    if not isinstance(raw, dict):
+        return parse_coordinates(None, None)
+    places = (raw.get("geometry") or {}).get("location") or {}
+    apify = raw.get("location") if isinstance(raw.get("location"), dict) else {}
+    metatags = (raw.get("pagemap") or {}).get("metatags") or []
+    metatag = dict(metatags[0]) if metatags else {}
+    for latitude, longitude in (
+        (places.get("lat"), places.get("lng")),
+        (apify.get("latitude"), apify.get("longitude")),
+        (
+            metatag.get("place:location:latitude"),
+            metatag.get("place:location:longitude"),
+        ),
+    ):
+        coordinates = parse_coordinates(latitude, longitude)
+        if coordinates["latitude"] is not None:
+            return coordinates
+    return coordinates
+
+
+def backfill_coordinates(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    batch = []
+    for event in Event.objects.only("id", "raw_payload").iterator(
+        chunk_size=BACKFILL_BATCH_SIZE
+    ):
+        coordinates = payload_coordinates(event.raw_payload)
+        if coordinates["latitude"] is None:
+            continue
+        event.latitude = coordinates["latitude"]
+        event.longitude = coordinates["longitude"]
+        event.geohash = encode_geohash(event.latitude, event.longitude)
+        batch.append(event)
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            Event.objects.bulk_update(batch, ["latitude", "longitude", "geohash"])
+            batch = []
+    if batch:
+        Event.objects.bulk_update(batch, ["latitude", "longitude", "geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0008_event_start_title_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                help_text="Geohash of latitude/longitude, indexed for radius queries.",
+                max_length=12,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="latitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="longitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_coordinates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("geohash__isnull", False)),
+                fields=["geohash"],
+                name="event_geohash_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,116 @@
+# Generated by Django 4.2.27 on 2026-10-18 04:03
+
+import re
+import unicodedata
+from collections import deque
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of the events.dedupe matching rules at the time of this
+# migration; later changes there must not alter the backfill.
+START_WINDOW = timedelta(hours=2)
+TITLE_SIMILARITY = 0.6
+STOPWORDS = frozenset(
+    {"a", "an", "and", "at", "by", "for", "from", "in", "of", "on", "the", "to", "with"}
+)
+FIELDS = ("id", "source", "title", "city_key", "start_date")
+BATCH_SIZE = 2000
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def title_tokens(title):
+    decomposed = unicodedata.normalize("NFKD", (title or "").casefold())
+    plain = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return frozenset(
+        token
+        for token in _TOKEN_RE.findall(plain)
+        if len(token) > 1 and token not in STOPWORDS
+    )
+
+
+def match_score(newer, older, tokens):
+    if newer["source"] == older["source"]:
+        return 0.0
+    if abs(newer["start_date"] - older["start_date"]) > START_WINDOW:
+        return 0.0
+    left, right = tokens[newer["id"]], tokens[older["id"]]
+    if not left or not right:
+        return 0.0
+    score = len(left & right) / len(left | right)
+    return score if score >= TITLE_SIMILARITY else 0.0
+
+
+def link_existing_duplicates(apps, schema_editor):
+    """Point each duplicate at the oldest event of its cluster."""
+    Event = apps.get_model("events", "Event")
+    best = {}
+    window = deque()
+    tokens = {}
+    rows = (
+        Event.objects.exclude(city_key="")
+        .filter(start_date__isnull=False)
+        .order_by("city_key", "-start_date")
+        .values(*FIELDS)
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    for row in rows:
+        while window and (
+            window[0]["city_key"] != row["city_key"]
+            or window[0]["start_date"] - row["start_date"] > START_WINDOW
+        ):
+            tokens.pop(window.popleft()["id"])
+        tokens[row["id"]] = title_tokens(row["title"])
+        for other in window:
+            newer, older = (row, other) if row["id"] > other["id"] else (other, row)
+            score = match_score(newer, older, tokens)
+            candidate = (score, -older["id"])
+            if score and candidate > best.get(newer["id"], (0.0, 0)):
+                best[newer["id"]] = candidate
+        window.append(row)
+
+    roots = {}
+    changes = []
+    for pk in best:
+        # Links always point at older rows, so following them terminates.
+        chain = [pk]
+        while chain[-1] in best and chain[-1] not in roots:
+            chain.append(-best[chain[-1]][1])
+        root = roots.get(chain[-1], chain[-1])
+        roots.update(dict.fromkeys(chain[:-1], root))
+        changes.append(Event(pk=pk, canonical_id=root))
+    Event.objects.bulk_update(changes, ["canonical"], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0009_event_coordinates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="canonical",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                help_text="The event from another source this one duplicates, if any.",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="duplicates",
+                to="events.event",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("canonical__isnull", False)),
+                fields=["canonical"],
+                name="event_canonical_idx",
+            ),
+        ),
+        migrations.RunPython(link_existing_duplicates, migrations.RunPython.noop),
+    ]
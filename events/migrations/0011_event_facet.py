@@ -0,0 +1,82 @@
+# Generated by Django 4.2.27 on 2026-10-18 04:07
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+
+def count_existing_events(apps, schema_editor):
+    """Count the events of each facet, as ``events.facets.rebuild_facets`` did."""
+    Event = apps.get_model("events", "Event")
+    EventFacet = apps.get_model("events", "EventFacet")
+    groups = (
+        Event.objects.filter(canonical__isnull=True)
+        .annotate(month_start=TruncMonth("start_date"))
+        .values("city_key", "category", "source", "month_start")
+        .annotate(city=Min("city"), count=Count("id"))
+        .order_by()
+    )
+    EventFacet.objects.bulk_create(
+        [
+            EventFacet(
+                city_key=row["city_key"],
+                city=row["city"],
+                category=row["category"],
+                source=row["source"],
+                month=(
+                    timezone.localtime(row["month_start"]).strftime("%Y-%m")
+                    if row["month_start"]
+                    else ""
+                ),
+                count=row["count"],
+            )
+            for row in groups.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0010_event_canonical"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventFacet",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("city_key", models.CharField(max_length=100)),
+                ("city", models.CharField(max_length=100)),
+                ("category", models.CharField(blank=True, max_length=100)),
+                ("source", models.CharField(max_length=50)),
+                (
+                    "month",
+                    models.CharField(
+                        blank=True,
+                        help_text="Start month as YYYY-MM; blank for undated events.",
+                        max_length=7,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="eventfacet",
+            constraint=models.UniqueConstraint(
+                fields=("city_key", "category", "source", "month"),
+                name="event_facet_unique",
+            ),
+        ),
+        migrations.RunPython(count_existing_events, migrations.RunPython.noop),
+    ]
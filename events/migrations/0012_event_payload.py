@@ -0,0 +1,87 @@
+# Generated by Django 4.2.27 on 2026-10-18 04:21
+
+import json
+import zlib
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+# Moving payloads into EventPayload is left to "manage.py move_payloads";
+# unapplying the migration must bring them back before the table goes.
+def inline_payloads(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    EventPayload = apps.get_model("events", "EventPayload")
+    last_pk = 0
+    while True:
+        rows = list(
+            Event.objects.filter(
+                pk__gt=last_pk, raw_payload__isnull=True, payload_digest__isnull=False
+            )
+            .order_by("pk")
+            .values_list("pk", "payload_digest")[:BATCH_SIZE]
+        )
+        if not rows:
+            return
+        stored = EventPayload.objects.filter(
+            digest__in={digest for _, digest in rows}
+        ).values_list("digest", "data")
+        payloads = {
+            digest: json.loads(zlib.decompress(data)) for digest, data in stored
+        }
+        Event.objects.bulk_update(
+            [
+                Event(pk=pk, raw_payload=payloads.get(digest), payload_digest=None)
+                for pk, digest in rows
+            ],
+            ["raw_payload", "payload_digest"],
+        )
+        last_pk = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0011_event_facet"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventPayload",
+            fields=[
+                (
+                    "digest",
+                    models.CharField(
+                        help_text="BLAKE2b-128 of the payload's compact JSON, in hex.",
+                        max_length=32,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("data", models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="payload_digest",
+            field=models.CharField(
+                blank=True,
+                help_text="Key of the compressed upstream payload in EventPayload.",
+                max_length=32,
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="event",
+            name="raw_payload",
+            field=models.JSONField(
+                blank=True,
+                help_text=(
+                    "Inline upstream payload; null when it is kept in EventPayload."
+                ),
+                null=True,
+            ),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, inline_payloads),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.27 on 2026-10-18 04:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0012_event_payload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestionJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("provider", models.CharField(max_length=50)),
+                (
+                    "city",
+                    models.CharField(
+                        blank=True,
+                        help_text="Canonical city name; blank for all.",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "interval",
+                    models.PositiveIntegerField(
+                        default=3600,
+                        help_text="Seconds between the end of a run and the next.",
+                    ),
+                ),
+                ("enabled", models.BooleanField(default=True)),
+                (
+                    "next_run_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("lease_owner", models.CharField(blank=True, max_length=100)),
+                ("lease_expires_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "failures",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Consecutive failed runs; drives the retry backoff.",
+                    ),
+                ),
+                ("last_started_at", models.DateTimeField(blank=True, null=True)),
+                ("last_finished_at", models.DateTimeField(blank=True, null=True)),
+                ("last_status", models.CharField(blank=True, max_length=20)),
+                ("last_error", models.TextField(blank=True)),
+                ("last_report", models.JSONField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["enabled", "next_run_at"], name="ingestion_job_due_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="ingestionjob",
+            constraint=models.UniqueConstraint(
+                fields=("provider", "city"), name="ingestion_job_unique"
+            ),
+        ),
+    ]
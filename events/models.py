@@ -1,5 +1,13 @@
 from django.db import models
 from django.db.models import Q
+from django.utils import timezone
+
+from .geo import encode_geohash
+
+
+def city_lookup_key(value: str | None) -> str:
+    """Canonical, case-folded form of a city used for indexed equality lookups."""
+    return (value or "").strip().lower()
 
 
 class Event(models.Model):
@@ -9,22 +17,76 @@ class Event(models.Model):
     start_date = models.DateTimeField(null=True, blank=True)
     venue_name = models.CharField(max_length=255, blank=True)
     city = models.CharField(max_length=100)
+    city_key = models.CharField(
+        max_length=100,
+        editable=False,
+        default="",
+        help_text="Lowercased city used for case-insensitive filtering.",
+    )
     category = models.CharField(max_length=100, blank=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        null=True,
+        help_text="Geohash of latitude/longitude, indexed for radius queries.",
+    )
     event_url = models.URLField(max_length=500, blank=True, null=True)
     source = models.CharField(max_length=50)
-    raw_payload = models.JSONField()
+    raw_payload = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Inline upstream payload; null when it is kept in EventPayload.",
+    )
+    payload_digest = models.CharField(
+        max_length=32,
+        blank=True,
+        null=True,
+        help_text="Key of the compressed upstream payload in EventPayload.",
+    )
     fingerprint = models.CharField(
         max_length=64,
         blank=True,
         null=True,
         help_text="Deterministic hash used to deduplicate records without URLs.",
     )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text="Hash of the stored columns, used to skip unchanged re-ingests.",
+    )
+    canonical = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="duplicates",
+        # Indexed only where set (see Meta), so list queries filtering on
+        # "canonical IS NULL" keep walking the ordering indexes.
+        db_index=False,
+        help_text="The event from another source this one duplicates, if any.",
+    )
 
     class Meta:
         ordering = ["-start_date", "title"]
         indexes = [
-            models.Index(fields=["city"], name="event_city_idx"),
-            models.Index(fields=["start_date"], name="event_start_date_idx"),
+            models.Index(
+                fields=["city_key", "-start_date", "title"],
+                name="event_city_key_start_idx",
+            ),
+            models.Index(fields=["-start_date", "title"], name="event_start_title_idx"),
+            models.Index(
+                fields=["geohash"],
+                condition=Q(geohash__isnull=False),
+                name="event_geohash_idx",
+            ),
+            models.Index(
+                fields=["canonical"],
+                condition=Q(canonical__isnull=False),
+                name="event_canonical_idx",
+            ),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -39,5 +101,159 @@ class Event(models.Model):
             ),
         ]
 
+    def save(self, *args, **kwargs) -> None:
+        self.city_key = city_lookup_key(self.city)
+        located = self.latitude is not None and self.longitude is not None
+        self.geohash = (
+            encode_geohash(self.latitude, self.longitude) if located else None
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            derived = {"city_key"} if "city" in update_fields else set()
+            if {"latitude", "longitude"} & set(update_fields):
+                derived.add("geohash")
+            kwargs["update_fields"] = {*update_fields, *derived}
+        super().save(*args, **kwargs)
+
+    @property
+    def payload(self):
+        """The upstream payload, wherever it is stored; loaded on first access."""
+        if self.raw_payload is not None or not self.payload_digest:
+            return self.raw_payload
+        if not hasattr(self, "_payload"):
+            from .payloads import load_payloads  # payloads imports this module
+
+            digest = self.payload_digest
+            self._payload = load_payloads([digest]).get(digest)
+        return self._payload
+
     def __str__(self) -> str:
         return f"{self.title} ({self.city})"
+
+
+class EventPayload(models.Model):
+    """An upstream payload stored once, as zlib-compressed compact JSON."""
+
+    digest = models.CharField(
+        max_length=32,
+        primary_key=True,
+        help_text="BLAKE2b-128 of the payload's compact JSON, in hex.",
+    )
+    data = models.BinaryField()
+
+    def __str__(self) -> str:
+        return self.digest
+
+
+class EventFacet(models.Model):
+    """Number of listed events per city, category, source and start month.
+
+    Only canonical events (those the list endpoint returns) are counted.
+    Ingestion keeps the counts current from the rows it writes; see
+    ``events.facets``.
+    """
+
+    city_key = models.CharField(max_length=100)
+    city = models.CharField(max_length=100)
+    category = models.CharField(max_length=100, blank=True)
+    source = models.CharField(max_length=50)
+    month = models.CharField(
+        max_length=7,
+        blank=True,
+        help_text="Start month as YYYY-MM; blank for undated events.",
+    )
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["city_key", "category", "source", "month"],
+                name="event_facet_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        month = self.month or "undated"
+        return f"{self.city}/{self.category}/{self.source}/{month}: {self.count}"
+
+
+class DataGeneration(models.Model):
+    """Monotonic counter bumped whenever ingestion commits changes.
+
+    API response caches embed the current value in their keys, so bumping it
+    invalidates every cached page across processes at once.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:
+        return f"{self.name}@{self.value}"
+
+
+class IngestionCheckpoint(models.Model):
+    """Resume position of a streaming ingestion run.
+
+    ``key`` identifies the run (provider settings plus city filter) and
+    ``state`` is the client's opaque position after the last payload whose
+    rows are committed. It is saved in the same transaction as each chunk.
+    """
+
+    key = models.CharField(max_length=64, primary_key=True)
+    provider = models.CharField(max_length=50)
+    state = models.JSONField(default=dict)
+    started_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        status = "complete" if self.completed_at else "in progress"
+        return f"{self.provider} checkpoint ({status})"
+
+
+class IngestionJob(models.Model):
+    """A recurring ingestion of one provider, optionally limited to a city.
+
+    ``run_ingestion_worker`` claims due jobs by setting a lease, so a
+    (provider, city) pair is never ingested by two runs at once, even across
+    worker processes. ``last_report`` keeps the summary of the latest run.
+    """
+
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    provider = models.CharField(max_length=50)
+    city = models.CharField(
+        max_length=100, blank=True, help_text="Canonical city name; blank for all."
+    )
+    interval = models.PositiveIntegerField(
+        default=3600, help_text="Seconds between the end of a run and the next."
+    )
+    enabled = models.BooleanField(default=True)
+    next_run_at = models.DateTimeField(default=timezone.now)
+    lease_owner = models.CharField(max_length=100, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    failures = models.PositiveIntegerField(
+        default=0, help_text="Consecutive failed runs; drives the retry backoff."
+    )
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(max_length=20, blank=True)
+    last_error = models.TextField(blank=True)
+    last_report = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["provider", "city"], name="ingestion_job_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["enabled", "next_run_at"], name="ingestion_job_due_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.provider}/{self.city or 'all cities'} every {self.interval}s"
@@ -0,0 +1,251 @@
+"""Pagination strategies for the events API."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import contextlib
+import json
+from datetime import datetime
+from typing import Any, NamedTuple, Sequence
+
+from django.db.models import F, Lookup, Q, QuerySet
+from django.db.models.sql.where import AND
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .search import RANK_ALIAS, is_ranked, ranked_after
+
+EVENT_ORDERING = (F("start_date").desc(nulls_last=True), "title", "id")
+# EVENT_ORDERING split at the NULL boundary into index-friendly orderings.
+DATED_ORDERING = ("-start_date", "title", "id")
+UNDATED_ORDERING = ("title", "id")
+
+
+class StandardResultsSetPagination(pagination.PageNumberPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 50
+
+
+class KeysetPosition(NamedTuple):
+    """Sort key of the last row on a page, following ``EVENT_ORDERING``."""
+
+    start_date: datetime | None
+    title: str
+    id: int
+
+
+class SearchPosition(NamedTuple):
+    """Sort key of the last row on a ranked search page: ``(search_rank, id)``."""
+
+    rank: float
+    id: int
+
+
+Position = KeysetPosition | SearchPosition
+
+
+def encode_cursor(position: Position) -> str:
+    if isinstance(position, SearchPosition):
+        values = [position.rank, position.id]
+    else:
+        start = position.start_date.isoformat() if position.start_date else None
+        values = [start, position.title, position.id]
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token: str, ranked: bool = False) -> Position:
+    """Parse an opaque cursor, raising ``ValueError`` when it is malformed.
+
+    ``ranked`` cursors page through searches; the other kind is rejected.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (binascii.Error, UnicodeError, TypeError, json.JSONDecodeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if not isinstance(values, list) or len(values) != (2 if ranked else 3):
+        raise ValueError("Malformed cursor")
+    if ranked:
+        rank, pk = values
+        if not isinstance(rank, (int, float)) or isinstance(rank, bool):
+            raise ValueError("Malformed cursor")
+        if not isinstance(pk, int):
+            raise ValueError("Malformed cursor")
+        return SearchPosition(float(rank), pk)
+    start, title, pk = values
+    if not isinstance(start, (str, type(None))):
+        raise ValueError("Malformed cursor")
+    if not isinstance(title, str) or not isinstance(pk, int):
+        raise ValueError("Malformed cursor")
+    return KeysetPosition(datetime.fromisoformat(start) if start else None, title, pk)
+
+
+def row_position(row: Any) -> Position:
+    if isinstance(row, dict):
+        if RANK_ALIAS in row:
+            return SearchPosition(row[RANK_ALIAS], row["id"])
+        return KeysetPosition(row["start_date"], row["title"], row["id"])
+    if hasattr(row, RANK_ALIAS):
+        return SearchPosition(getattr(row, RANK_ALIAS), row.id)
+    return KeysetPosition(row.start_date, row.title, row.id)
+
+
+def bounds_start_date(queryset: QuerySet) -> bool:
+    """Whether a top-level filter compares ``start_date``, ruling out NULLs."""
+    where = queryset.query.where
+    if where.connector != AND or where.negated:
+        return False
+    return any(
+        isinstance(child, Lookup)
+        and child.lookup_name != "isnull"
+        and getattr(getattr(child.lhs, "target", None), "name", None) == "start_date"
+        for child in where.children
+    )
+
+
+def keyset_segments(queryset: QuerySet, position: Position | None) -> list[QuerySet]:
+    """Querysets that, read in order, continue ``EVENT_ORDERING`` after ``position``.
+
+    Dated rows and the trailing NULL ``start_date`` rows are separate range
+    queries, each ordered exactly like the ``(city_key, -start_date, title)``
+    and ``(-start_date, title)`` indexes, so the database walks an index
+    instead of sorting, and seeks straight to ``position`` instead of
+    skipping an offset. Ranked searches continue their ``(search_rank, id)``
+    order instead.
+    """
+    if is_ranked(queryset):
+        if position is None:
+            return [queryset]
+        return [ranked_after(queryset, position.rank, position.id)]
+    dated = queryset.filter(start_date__isnull=False).order_by(*DATED_ORDERING)
+    undated = queryset.filter(start_date__isnull=True).order_by(*UNDATED_ORDERING)
+    # A date-bounded query has no undated rows; asking anyway would make the
+    # database walk the whole bounded range just to find that out.
+    tail = [] if bounds_start_date(queryset) else [undated]
+    if position is None:
+        return [dated, *tail]
+    tiebreak = Q(title__gt=position.title) | Q(title=position.title, id__gt=position.id)
+    if position.start_date is None:
+        return [undated.filter(tiebreak)] if tail else []
+    return [
+        dated.filter(
+            Q(start_date__lte=position.start_date)
+            & (Q(start_date__lt=position.start_date) | tiebreak)
+        ),
+        *tail,
+    ]
+
+
+def keyset_page(queryset: QuerySet, position: Position | None, limit: int) -> list[Any]:
+    """Return up to ``limit`` rows ordered by ``EVENT_ORDERING`` after ``position``."""
+    rows: list[Any] = []
+    for segment in keyset_segments(queryset, position):
+        rows += list(segment[: limit - len(rows)])
+        if len(rows) >= limit:
+            break
+    return rows
+
+
+async def akeyset_page(
+    queryset: QuerySet, position: Position | None, limit: int
+) -> list[Any]:
+    """Async twin of :func:`keyset_page`."""
+    rows: list[Any] = []
+    for segment in keyset_segments(queryset, position):
+        rows += [row async for row in segment[: limit - len(rows)]]
+        if len(rows) >= limit:
+            break
+    return rows
+
+
+class EventCursorPagination(pagination.BasePagination):
+    """Keyset pagination over ``EVENT_ORDERING`` with opaque cursor tokens.
+
+    Page cost does not depend on depth: each page is a range query starting
+    at the previous page's last sort key, and no total count is computed.
+    Searches page through ``(search_rank, id)`` the same way.
+    """
+
+    page_size = StandardResultsSetPagination.page_size
+    page_size_query_param = "page_size"
+    max_page_size = StandardResultsSetPagination.max_page_size
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None) -> Sequence[Any]:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = None
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            try:
+                position = decode_cursor(token, ranked=is_ranked(queryset))
+            except ValueError as exc:
+                raise NotFound(self.invalid_cursor_message) from exc
+        rows = keyset_page(queryset, position, self.page_size + 1)
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_page_size(self, request) -> int:
+        return resolve_page_size(request.query_params)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        token = encode_cursor(row_position(self.page[-1]))
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+def resolve_page_size(params) -> int:
+    """Apply the ``page_size`` rules shared by both pagination modes."""
+    with contextlib.suppress(KeyError, ValueError):
+        return pagination._positive_int(
+            params[StandardResultsSetPagination.page_size_query_param],
+            strict=True,
+            cutoff=StandardResultsSetPagination.max_page_size,
+        )
+    return StandardResultsSetPagination.page_size
+
+
+def wants_page_numbers(params) -> bool:
+    """Legacy clients opt into page numbers with ``?page=`` or ``?pagination=page``."""
+    return params.get("pagination") == "page" or "page" in params
+
+
+__all__ = [
+    "DATED_ORDERING",
+    "EVENT_ORDERING",
+    "EventCursorPagination",
+    "KeysetPosition",
+    "Position",
+    "SearchPosition",
+    "StandardResultsSetPagination",
+    "UNDATED_ORDERING",
+    "decode_cursor",
+    "encode_cursor",
+    "akeyset_page",
+    "keyset_page",
+    "keyset_segments",
+    "resolve_page_size",
+    "row_position",
+    "wants_page_numbers",
+]
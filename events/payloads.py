@@ -0,0 +1,202 @@
+"""Compressed, content-addressed storage for upstream event payloads.
+
+Payloads dominate the size of ``events_event`` rows, so every scan and the
+page cache pay for bytes that list queries rarely return. With
+``EVENT_PAYLOAD_STORAGE = "compressed"`` ingestion leaves
+``Event.raw_payload`` null and stores the payload in ``EventPayload``,
+zlib-compressed and keyed by a 128-bit BLAKE2b digest of its compact JSON, so identical
+payloads are stored once. ``"inline"`` (the default) keeps writing the JSON
+column. Existing rows are moved only by the ``move_payloads`` command, and
+payloads that no event references any more stay until it prunes them.
+
+Reads handle both layouts: ``Event.payload`` and the serializers fetch
+external payloads only when ``raw_payload`` is actually rendered, one query
+per page.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import zlib
+from typing import Any, Iterable, MutableMapping, Sequence
+
+from django.conf import settings
+
+from .models import Event, EventPayload
+
+COMPRESSED = "compressed"
+INLINE = "inline"
+COMPRESSION_LEVEL = 6
+MOVE_BATCH_SIZE = 1000
+
+
+def stores_compressed() -> bool:
+    return settings.EVENT_PAYLOAD_STORAGE == COMPRESSED
+
+
+def encode_payload(payload: Any) -> bytes:
+    """Compact UTF-8 JSON. Keys keep their order, which the API preserves."""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+
+def decode_payload(data: bytes) -> Any:
+    return json.loads(zlib.decompress(data))
+
+
+def store_payloads(payloads: Sequence[Any], model=None) -> list[str]:
+    """Store each distinct payload once; returns the digests in input order.
+
+    Payloads that are already stored are neither compressed nor written
+    again. ``model`` lets migrations pass their historical model.
+    """
+    model = model or EventPayload
+    encoded = [encode_payload(payload) for payload in payloads]
+    digests = [hashlib.blake2b(data, digest_size=16).hexdigest() for data in encoded]
+    distinct = dict(zip(digests, encoded, strict=True))
+    stored = set(
+        model.objects.filter(digest__in=distinct).values_list("digest", flat=True)
+    )
+    model.objects.bulk_create(
+        [
+            model(digest=digest, data=zlib.compress(data, COMPRESSION_LEVEL))
+            for digest, data in distinct.items()
+            if digest not in stored
+        ],
+        ignore_conflicts=True,
+        batch_size=500,
+    )
+    return digests
+
+
+def load_payloads(digests: Iterable[str], model=None) -> dict[str, Any]:
+    model = model or EventPayload
+    rows = model.objects.filter(digest__in=set(digests)).values_list("digest", "data")
+    return {digest: decode_payload(data) for digest, data in rows}
+
+
+async def aload_payloads(digests: Iterable[str]) -> dict[str, Any]:
+    rows = EventPayload.objects.filter(digest__in=set(digests)).values_list(
+        "digest", "data"
+    )
+    return {digest: decode_payload(data) async for digest, data in rows}
+
+
+def _missing_digests(rows: Iterable[MutableMapping[str, Any]]) -> set[str]:
+    return {
+        row["payload_digest"]
+        for row in rows
+        if row.get("raw_payload") is None and row.get("payload_digest")
+    }
+
+
+def _fill(rows: Iterable[MutableMapping[str, Any]], payloads: dict[str, Any]) -> None:
+    # Dropping the digest marks rows as resolved, even if a payload is gone.
+    for row in rows:
+        digest = row.pop("payload_digest", None)
+        if row.get("raw_payload") is None and digest:
+            row["raw_payload"] = payloads.get(digest)
+
+
+def fill_payloads(rows: Sequence[MutableMapping[str, Any]]) -> None:
+    """Put external payloads into ``.values()`` rows, in one query."""
+    digests = _missing_digests(rows)
+    if digests:
+        _fill(rows, load_payloads(digests))
+
+
+async def afill_payloads(rows: Sequence[MutableMapping[str, Any]]) -> None:
+    digests = _missing_digests(rows)
+    if digests:
+        _fill(rows, await aload_payloads(digests))
+
+
+def compress_existing(
+    model=None, payload_model=None, batch_size: int = MOVE_BATCH_SIZE
+) -> int:
+    """Move every inline payload into ``EventPayload``; returns rows moved.
+
+    ``model`` and ``payload_model`` let migrations pass historical models.
+    """
+    model = model or Event
+    moved = last_pk = 0
+    while True:
+        rows = list(
+            model.objects.filter(pk__gt=last_pk, raw_payload__isnull=False)
+            .order_by("pk")
+            .values_list("pk", "raw_payload")[:batch_size]
+        )
+        if not rows:
+            return moved
+        digests = store_payloads([payload for _, payload in rows], payload_model)
+        model.objects.bulk_update(
+            [
+                model(pk=pk, payload_digest=digest)
+                for (pk, _), digest in zip(rows, digests, strict=True)
+            ],
+            ["payload_digest"],
+        )
+        pks = [pk for pk, _ in rows]
+        model.objects.filter(pk__in=pks).update(raw_payload=None)
+        moved += len(rows)
+        last_pk = pks[-1]
+
+
+def inline_existing(
+    model=None, payload_model=None, batch_size: int = MOVE_BATCH_SIZE
+) -> int:
+    """Copy external payloads back into ``raw_payload``; returns rows moved."""
+    model = model or Event
+    moved = last_pk = 0
+    while True:
+        rows = list(
+            model.objects.filter(
+                pk__gt=last_pk, raw_payload__isnull=True, payload_digest__isnull=False
+            )
+            .order_by("pk")
+            .values_list("pk", "payload_digest")[:batch_size]
+        )
+        if not rows:
+            return moved
+        payloads = load_payloads({digest for _, digest in rows}, payload_model)
+        model.objects.bulk_update(
+            [
+                model(pk=pk, raw_payload=payloads.get(digest), payload_digest=None)
+                for pk, digest in rows
+            ],
+            ["raw_payload", "payload_digest"],
+        )
+        moved += len(rows)
+        last_pk = rows[-1][0]
+
+
+def prune_payloads(model=None, payload_model=None) -> int:
+    """Delete payloads that no event references; returns rows deleted.
+
+    A payload that a running ingestion has just found already stored, but
+    not yet committed a reference to, may be deleted too, so run this while
+    ingestion is idle.
+    """
+    model = model or Event
+    payload_model = payload_model or EventPayload
+    referenced = model.objects.filter(payload_digest__isnull=False).values(
+        "payload_digest"
+    )
+    deleted, _ = payload_model.objects.exclude(digest__in=referenced).delete()
+    return deleted
+
+
+__all__ = [
+    "COMPRESSED",
+    "INLINE",
+    "afill_payloads",
+    "compress_existing",
+    "fill_payloads",
+    "inline_existing",
+    "load_payloads",
+    "prune_payloads",
+    "store_payloads",
+    "stores_compressed",
+]
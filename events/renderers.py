@@ -0,0 +1,53 @@
+"""JSON renderers for the events API."""
+
+from __future__ import annotations
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Render with orjson when the view marks its data as plain JSON scalars.
+
+    Views opt in through a truthy ``json_fast_path`` attribute, promising the
+    response only holds dicts, lists, strings, ints, bools and ``None``. For
+    those values orjson's compact UTF-8 output is byte-identical to
+    ``JSONRenderer``. Anything else (floats, indented output, orjson missing)
+    goes through the stdlib path.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        view = renderer_context.get("view")
+        if (
+            data is None
+            or not getattr(view, "json_fast_path", False)
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return render_json(data, fast=True)
+
+
+def render_json(data, fast: bool = False) -> bytes:
+    """Encode ``data`` exactly as DRF's ``JSONRenderer`` would.
+
+    ``fast=True`` uses orjson when available; only pass it for data made of
+    dicts, lists, strings, ints, bools and ``None``.
+    """
+    if fast and orjson is not None:
+        try:
+            rendered = orjson.dumps(data)
+        except TypeError:
+            pass
+        else:
+            return rendered.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+    return JSONRenderer().render(data)
+
+
+__all__ = ["FastJSONRenderer", "render_json"]
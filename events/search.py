@@ -0,0 +1,186 @@
+"""Full-text search over event titles, venues and categories.
+
+SQLite uses an FTS5 table with external content (the ``events_event`` rows)
+kept in sync by triggers, so every write path, including bulk upserts,
+updates the index. Postgres uses a GIN index on a weighted ``tsvector``
+expression. Other backends fall back to unranked ``icontains`` matching.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Sequence
+
+from django.db import connection, connections
+from django.db.models import Q, QuerySet
+
+FTS_TABLE = "events_event_fts"
+SEARCHED_COLUMNS = ("title", "venue_name", "category")
+# Relative weight of a hit in each column, in SEARCHED_COLUMNS order.
+COLUMN_WEIGHTS = (10.0, 4.0, 2.0)
+
+SQLITE_FTS_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, venue_name, category, content='events_event', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+_FTS_COLUMNS = ", ".join(SEARCHED_COLUMNS)
+_NEW_VALUES = ", ".join(f"new.{name}" for name in SEARCHED_COLUMNS)
+_OLD_VALUES = ", ".join(f"old.{name}" for name in SEARCHED_COLUMNS)
+_FTS_INSERT = (
+    f"INSERT INTO {FTS_TABLE}(rowid, {_FTS_COLUMNS}) VALUES (new.id, {_NEW_VALUES});"
+)
+_FTS_DELETE = (
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_FTS_COLUMNS}) "
+    f"VALUES ('delete', old.id, {_OLD_VALUES});"
+)
+SQLITE_FTS_TRIGGERS = (
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON events_event "
+    f"BEGIN {_FTS_INSERT} END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON events_event "
+    f"BEGIN {_FTS_DELETE} END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_FTS_COLUMNS} "
+    f"ON events_event BEGIN {_FTS_DELETE} {_FTS_INSERT} END",
+)
+
+POSTGRES_VECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(events_event.title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(events_event.venue_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(events_event.category, '')), 'C'))"
+)
+POSTGRES_INDEX = "event_search_idx"
+
+RANK_ALIAS = "search_rank"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str) -> list[str]:
+    """Split user input into word tokens; all FTS syntax is discarded."""
+    return _TOKEN_RE.findall(query.lower())
+
+
+def fts5_match(terms: list[str]) -> str:
+    """Every term must match as a quoted prefix, e.g. ``"jazz"* "fest"*``."""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def postgres_tsquery(terms: list[str]) -> str:
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def search_events(
+    queryset: QuerySet, query: str, ordering: Sequence[Any] = ()
+) -> QuerySet:
+    """Restrict ``queryset`` to matches for ``query``, best matches first.
+
+    Ranked backends order by a ``search_rank`` column (lower is better) and
+    then by ``id``, so pages can seek on that pair (see :func:`ranked_after`);
+    the fallback orders by ``ordering`` alone.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS)
+        return queryset.extra(
+            select={RANK_ALIAS: f"bm25({FTS_TABLE}, {weights})"},
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = events_event.id", f"{FTS_TABLE} MATCH %s"],
+            params=[fts5_match(terms)],
+        ).order_by(RANK_ALIAS, "id")
+    if vendor == "postgresql":
+        tsquery = postgres_tsquery(terms)
+        return queryset.extra(
+            select={
+                RANK_ALIAS: f"-ts_rank({POSTGRES_VECTOR}, to_tsquery('simple', %s))"
+            },
+            select_params=[tsquery],
+            where=[f"{POSTGRES_VECTOR} @@ to_tsquery('simple', %s)"],
+            params=[tsquery],
+        ).order_by(RANK_ALIAS, "id")
+
+    matches = Q()
+    for term in terms:
+        matches &= (
+            Q(title__icontains=term)
+            | Q(venue_name__icontains=term)
+            | Q(category__icontains=term)
+        )
+    return queryset.filter(matches).order_by(*ordering)
+
+
+def is_ranked(queryset: QuerySet) -> bool:
+    """Whether ``queryset`` is a ranked :func:`search_events` result."""
+    return RANK_ALIAS in queryset.query.extra
+
+
+def ranked_after(queryset: QuerySet, rank: float, pk: int) -> QuerySet:
+    """Rows of a ranked search that come after ``(rank, pk)``.
+
+    The rank expression is repeated in ``WHERE`` because Postgres cannot
+    filter on a select alias.
+    """
+    sql, params = queryset.query.extra[RANK_ALIAS]
+    return queryset.extra(
+        where=[f"({sql} > %s OR ({sql} = %s AND events_event.id > %s))"],
+        params=[*params, rank, *params, rank, pk],
+    )
+
+
+def install_search_index(schema_editor) -> None:
+    """Create the backend's search index; safe to run repeatedly."""
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_FTS_TABLE)
+        for trigger in SQLITE_FTS_TRIGGERS:
+            schema_editor.execute(trigger)
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {POSTGRES_INDEX} ON events_event "
+            f"USING gin ({POSTGRES_VECTOR.replace('events_event.', '')})"
+        )
+
+
+def refresh_query_statistics(using: str = "default") -> None:
+    """Re-sample SQLite's planner statistics for ``events_event``.
+
+    Without them SQLite assumes an equality filter such as ``city_key = ?``
+    is highly selective and probes the FTS index once per city row instead
+    of driving the query from the full-text match. ``analysis_limit`` keeps
+    this to a few milliseconds even on millions of rows. Postgres keeps its
+    own statistics through autovacuum.
+    """
+    conn = connections[using]
+    if conn.vendor != "sqlite":
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("PRAGMA analysis_limit = 1000")
+        cursor.execute("ANALYZE events_event")
+
+
+def ensure_sqlite_triggers(using: str = "default", **kwargs) -> None:
+    """Restore the FTS triggers after SQLite table rebuilds.
+
+    SQLite migrations that alter ``events_event`` copy it into a new table,
+    which drops its triggers. Run after every ``migrate`` (``post_migrate``).
+    """
+    conn = connections[using]
+    if conn.vendor != "sqlite" or FTS_TABLE not in conn.introspection.table_names():
+        return
+    with conn.cursor() as cursor:
+        for trigger in SQLITE_FTS_TRIGGERS:
+            cursor.execute(trigger)
+
+
+__all__ = [
+    "RANK_ALIAS",
+    "ensure_sqlite_triggers",
+    "install_search_index",
+    "is_ranked",
+    "ranked_after",
+    "refresh_query_statistics",
+    "search_events",
+    "search_terms",
+]
@@ -1,19 +1,127 @@
+from django.utils import timezone
 from rest_framework import serializers
 
 from .models import Event
+from .payloads import fill_payloads
+
+EVENT_FIELDS = (
+    "id",
+    "title",
+    "start_date",
+    "venue_name",
+    "city",
+    "category",
+    "latitude",
+    "longitude",
+    "event_url",
+    "source",
+    "raw_payload",
+)
+EXPANDABLE_FIELDS = ("latitude", "longitude", "raw_payload")
+# Fields that may hold floats, which orjson formats differently from DRF.
+FLOAT_FIELDS = ("latitude", "longitude", "raw_payload")
+DEFAULT_LIST_FIELDS = tuple(
+    name for name in EVENT_FIELDS if name not in EXPANDABLE_FIELDS
+)
 
 
 class EventSerializer(serializers.ModelSerializer):
+    """Event representation; pass ``fields`` to emit only a subset."""
+
+    raw_payload = serializers.JSONField(source="payload", read_only=True)
+
     class Meta:
         model = Event
-        fields = [
-            "id",
-            "title",
-            "start_date",
-            "venue_name",
-            "city",
-            "category",
-            "event_url",
-            "source",
-            "raw_payload",
+        fields = list(EVENT_FIELDS)
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def parse_field_selection(params) -> tuple[str, ...]:
+    """Resolve ``?fields=`` and ``?expand=`` into an ordered field list.
+
+    Without ``fields`` the list defaults to every field except the expandable
+    ones (the coordinates and ``raw_payload``), which must be requested
+    explicitly.
+    """
+    requested = _split(params.get("fields"))
+    expanded = _split(params.get("expand"))
+    unknown = (set(requested) - set(EVENT_FIELDS)) | (
+        set(expanded) - set(EXPANDABLE_FIELDS)
+    )
+    if unknown:
+        raise serializers.ValidationError(
+            {"fields": f"Unknown field(s): {', '.join(sorted(unknown))}"}
+        )
+    selected = set(requested or DEFAULT_LIST_FIELDS) | set(expanded)
+    return tuple(name for name in EVENT_FIELDS if name in selected)
+
+
+def fast_json_safe(fields) -> bool:
+    """Whether rows limited to ``fields`` may be encoded with orjson."""
+    return not set(fields) & set(FLOAT_FIELDS)
+
+
+def _split(value: str | None) -> list[str]:
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def _datetime_representation(value):
+    if not value:
+        return None
+    value = value.astimezone(timezone.get_current_timezone())
+    text = value.isoformat()
+    if text.endswith("+00:00"):
+        text = text[:-6] + "Z"
+    return text
+
+
+def _string_representation(value):
+    return None if value is None else str(value)
+
+
+def _passthrough(value):
+    return value
+
+
+ROW_REPRESENTATIONS = {
+    "id": _passthrough,
+    "start_date": _datetime_representation,
+    "latitude": _passthrough,
+    "longitude": _passthrough,
+    "raw_payload": _passthrough,
+}
+
+
+class EventValuesSerializer:
+    """Read-only fast path that renders ``.values()`` rows like ``EventSerializer``.
+
+    Skips DRF's per-field machinery entirely; the output dicts are identical
+    (same keys, order and value formatting) to ``EventSerializer(fields=...)``.
+    Rows rendering ``raw_payload`` must also hold ``payload_digest``; external
+    payloads are loaded for all of them at once, unless already filled in
+    (see ``events.payloads.afill_payloads``).
+    """
+
+    def __init__(self, instance=None, many=False, fields=EVENT_FIELDS, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.converters = [
+            (name, ROW_REPRESENTATIONS.get(name, _string_representation))
+            for name in fields
         ]
+
+    def to_representation(self, row):
+        return {name: convert(row[name]) for name, convert in self.converters}
+
+    @property
+    def data(self):
+        if any(name == "raw_payload" for name, _ in self.converters):
+            fill_payloads(self.instance if self.many else [self.instance])
+        if self.many:
+            return [self.to_representation(row) for row in self.instance]
+        return self.to_representation(self.instance)
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Iterable, Mapping, Sequence
 
 from apify_client import ApifyClient
 from django.conf import settings
@@ -17,6 +18,7 @@ class ApifyFacebookClient(BaseEventClient):
     """Uses Apify to scrape Facebook events for the requested cities."""
 
     provider_name = "apify_facebook_events"
+    supports_resume = True
     DEFAULT_CITIES = ("Johannesburg", "Pretoria")
 
     def __init__(
@@ -25,12 +27,15 @@ class ApifyFacebookClient(BaseEventClient):
         actor_id: str | None = None,
         max_events: int | None = None,
         cities: Sequence[str] | None = None,
+        concurrency: int | None = None,
+        client: Any = None,
         **config,
     ) -> None:
         super().__init__(**config)
         self.api_token = api_token or settings.APIFY_TOKEN
         self.actor_id = actor_id or settings.APIFY_ACTOR_ID
         self.max_events = max_events or settings.APIFY_MAX_EVENTS
+        self.concurrency = max(1, concurrency or settings.APIFY_CONCURRENCY)
         requested = cities or config.get("queries")
         self.cities: list[str] = [
             city.strip() for city in (requested or self.DEFAULT_CITIES) if city.strip()
@@ -39,34 +44,112 @@ class ApifyFacebookClient(BaseEventClient):
             raise ValueError("APIFY_TOKEN is required to use the Apify provider.")
         if not self.actor_id:
             raise ValueError("APIFY_ACTOR_ID is required to use the Apify provider.")
-        self.client = ApifyClient(self.api_token)
+        self.client = client or ApifyClient(self.api_token)
+        self.progress: dict[str, dict[str, Any]] = {}
+        self.failed_cities: set[str] = set()
+        self._resume_state: Mapping[str, Any] = {}
 
     def fetch(self) -> Iterable[Mapping[str, object]]:
-        """Execute the actor per city and yield raw dataset items."""
-        actor = self.client.actor(self.actor_id)
-        for city in self.cities:
-            run_input = {
-                "searchQueries": [city],
-                "startUrls": [],
-                "maxEvents": self.max_events,
+        """Execute the actor per city and yield raw dataset items.
+
+        With ``concurrency`` above one, up to that many actor runs are started
+        together and each run's dataset is consumed as soon as it finishes.
+        A failing city is logged and skipped without affecting the others.
+        After :meth:`resume_from`, finished cities are skipped and started
+        ones continue reading their existing dataset at the saved offset;
+        later fetches start over with new actor runs.
+        """
+        resume_state, self._resume_state = self._resume_state, {}
+        self.failed_cities = set()
+        self.progress = {
+            city: {
+                "dataset_id": None,
+                "offset": 0,
+                "done": False,
+                **resume_state.get(city, {}),
             }
-            try:
-                run = actor.call(run_input=run_input)
-            except Exception as exc:  # pragma: no cover - network failure
-                logger.error("Apify actor call failed for %s: %s", city, exc)
-                continue
-
-            dataset_id = run.get("defaultDatasetId")
-            if not dataset_id:
+            for city in self.cities
+        }
+        pending = [city for city in self.cities if not self.progress[city]["done"]]
+        if self.concurrency == 1 or len(pending) <= 1:
+            for city in pending:
+                yield from self._iter_run_items(city, self._start_run(city))
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.concurrency, len(pending)),
+            thread_name_prefix="apify-run",
+        )
+        try:
+            futures = {executor.submit(self._start_run, city): city for city in pending}
+            for future in as_completed(futures):
+                city = futures[future]
+                yield from self._iter_run_items(city, future.result())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def checkpoint_state(self) -> dict[str, Any]:
+        return {"cities": self.progress}
+
+    def resume_from(self, state: Mapping[str, Any]) -> None:
+        self._resume_state = state.get("cities", {})
+
+    def fetch_complete(self) -> bool:
+        return not self.failed_cities
+
+    def cache_params(self) -> dict[str, Any]:
+        return {
+            **super().cache_params(),
+            "actor_id": self.actor_id,
+            "max_events": self.max_events,
+            "cities": sorted(self.cities),
+        }
+
+    def _start_run(self, city: str) -> Mapping[str, Any] | None:
+        dataset_id = self.progress[city]["dataset_id"]
+        if dataset_id:
+            return {"defaultDatasetId": dataset_id}
+        return self._call_actor(city)
+
+    def _call_actor(self, city: str) -> Mapping[str, Any] | None:
+        run_input = {
+            "searchQueries": [city],
+            "startUrls": [],
+            "maxEvents": self.max_events,
+        }
+        try:
+            return self.client.actor(self.actor_id).call(run_input=run_input)
+        except Exception as exc:  # pragma: no cover - network failure
+            logger.error("Apify actor call failed for %s: %s", city, exc)
+            return None
+
+    def _iter_run_items(
+        self, city: str, run: Mapping[str, Any] | None
+    ) -> Iterable[Mapping[str, object]]:
+        progress = self.progress[city]
+        dataset_id = run.get("defaultDatasetId") if run else None
+        if not dataset_id:
+            if run:
                 logger.warning("Apify run for %s returned no dataset ID", city)
-                continue
+            self.failed_cities.add(city)
+            return
 
-            dataset_client = self.client.dataset(dataset_id)
-            for item in dataset_client.iterate_items():
+        progress["dataset_id"] = dataset_id
+        dataset_client = self.client.dataset(dataset_id)
+        try:
+            for item in dataset_client.iterate_items(offset=progress["offset"]):
+                progress["offset"] += 1
                 yield {
                     "apify_raw_item": item,
                     "fallback_city": city,
                 }
+        except Exception as exc:  # pragma: no cover - network failure
+            logger.error(
+                "Reading Apify dataset %s for %s failed: %s", dataset_id, city, exc
+            )
+            self.failed_cities.add(city)
+        else:
+            progress["done"] = True
 
 
 __all__ = ["ApifyFacebookClient"]
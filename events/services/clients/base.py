@@ -10,6 +10,7 @@ class BaseEventClient(ABC):
     """Defines an interface all event provider clients should implement."""
 
     provider_name = "base"
+    supports_resume = False
 
     def __init__(self, **config: Any) -> None:
         self.config = config
@@ -18,6 +19,27 @@ class BaseEventClient(ABC):
     def fetch(self) -> Iterable[Mapping[str, Any]]:
         """Retrieve raw event payloads from an upstream provider."""
 
+    def cache_params(self) -> dict[str, Any]:
+        """Everything that changes what :meth:`fetch` returns, for cache keys."""
+        return {"provider": self.provider_name, **self.config}
+
+    def checkpoint_state(self) -> dict[str, Any]:
+        """Position just after the last payload :meth:`fetch` has yielded.
+
+        Clients with ``supports_resume`` return a JSON-serializable snapshot
+        that :meth:`resume_from` accepts; the next ``fetch`` then skips every
+        payload yielded before the snapshot was taken.
+        """
+        return {}
+
+    def resume_from(self, state: Mapping[str, Any]) -> None:
+        """Make the next :meth:`fetch`, and only that one, start at ``state``."""
+        raise NotImplementedError(f"{self.provider_name} cannot resume a fetch.")
+
+    def fetch_complete(self) -> bool:
+        """False when the last fetch skipped work (e.g. a failed city)."""
+        return True
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(provider={self.provider_name!r})"
 
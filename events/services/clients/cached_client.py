@@ -0,0 +1,160 @@
+"""On-disk replay cache that wraps any provider client."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping
+
+from .base import BaseEventClient
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+DEFAULT_SEGMENT_SIZE = 1000
+
+
+class CachedEventClient(BaseEventClient):
+    """Replays a client's payloads from gzip JSONL segments on disk.
+
+    Entries are keyed by the wrapped client's :meth:`cache_params`, so a
+    different provider, city list or actor setting never reuses another
+    run's data. A fetch that is interrupted before the upstream iterator is
+    exhausted, or after which the wrapped client's :meth:`fetch_complete` is
+    false, leaves no entry behind; only complete runs are replayed.
+    Expired entries are removed, and the oldest ones are evicted once the
+    directory grows past ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        client: BaseEventClient,
+        cache_dir: Path | str,
+        ttl: float = 3600,
+        max_bytes: int | None = None,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+    ) -> None:
+        super().__init__(client=client)
+        self.client = client
+        self.provider_name = client.provider_name
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.segment_size = max(1, segment_size)
+        self.cache_hit = False
+
+    @property
+    def cache_key(self) -> str:
+        raw = json.dumps(self.client.cache_params(), sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def fetch(self) -> Iterable[Mapping[str, Any]]:
+        entry = self.cache_dir / self.cache_key
+        self.cache_hit = self._is_fresh(entry)
+        if self.cache_hit:
+            logger.info("Replaying %s payloads from %s", self.provider_name, entry)
+            return self._replay(entry)
+        return self._record(entry)
+
+    def fetch_complete(self) -> bool:
+        # Only complete runs are published, so a replay is always complete.
+        return self.cache_hit or self.client.fetch_complete()
+
+    def _is_fresh(self, entry: Path) -> bool:
+        try:
+            manifest = json.loads((entry / MANIFEST_NAME).read_text("utf-8"))
+        except (OSError, ValueError):
+            return False
+        return time.time() - manifest.get("created_at", 0) < self.ttl
+
+    def _replay(self, entry: Path) -> Iterator[Mapping[str, Any]]:
+        for segment in sorted(entry.glob("segment-*.jsonl.gz")):
+            with gzip.open(segment, "rt", encoding="utf-8") as handle:
+                for line in handle:
+                    yield json.loads(line)
+
+    def _record(self, entry: Path) -> Iterator[Mapping[str, Any]]:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.cache_dir))
+        complete = False
+        count = 0
+        handle = None
+        try:
+            for payload in self.client.fetch():
+                if count % self.segment_size == 0:
+                    if handle:
+                        handle.close()
+                    name = f"segment-{count // self.segment_size:05d}.jsonl.gz"
+                    handle = gzip.open(staging / name, "wt", encoding="utf-8")
+                handle.write(json.dumps(payload, separators=(",", ":")) + "\n")
+                count += 1
+                yield payload
+            # E.g. a failed city would otherwise be missing from every replay.
+            complete = self.client.fetch_complete()
+        finally:
+            if handle:
+                handle.close()
+            if complete:
+                self._publish(staging, entry, count)
+            else:
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _publish(self, staging: Path, entry: Path, count: int) -> None:
+        manifest = {
+            "created_at": time.time(),
+            "provider": self.provider_name,
+            "payloads": count,
+        }
+        (staging / MANIFEST_NAME).write_text(json.dumps(manifest), "utf-8")
+        shutil.rmtree(entry, ignore_errors=True)
+        try:
+            os.replace(staging, entry)
+        except OSError as exc:
+            # Another run published the same key first; keep theirs.
+            logger.warning("Could not store cache entry %s: %s", entry, exc)
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict(keep=entry)
+
+    def evict(self, keep: Path | None = None) -> None:
+        """Drop expired entries, then the oldest ones until under ``max_bytes``."""
+        now = time.time()
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if not path.is_dir():
+                continue
+            if path.name.startswith("."):
+                # Staging directories left behind by a killed process.
+                if now - path.stat().st_mtime >= self.ttl:
+                    shutil.rmtree(path, ignore_errors=True)
+                continue
+            manifest = path / MANIFEST_NAME
+            mtime = manifest.stat().st_mtime if manifest.exists() else 0
+            if now - mtime >= self.ttl:
+                shutil.rmtree(path, ignore_errors=True)
+                continue
+            size = sum(item.stat().st_size for item in path.iterdir())
+            entries.append((mtime, size, path))
+
+        if self.max_bytes is None:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.client!r})"
+
+
+__all__ = ["CachedEventClient"]
@@ -2,30 +2,118 @@
 
 from __future__ import annotations
 
-import json
+from itertools import islice
 from pathlib import Path
-from typing import Any, Iterable, Mapping
+from typing import Any, Iterable, Iterator, Mapping
 
+from ..json_stream import iter_json_lines, iter_object_items, open_text
 from .base import BaseEventClient
 
+FIXTURE_PATTERNS = ("*.json", "*.json.gz", "*.jsonl", "*.jsonl.gz")
+ITEM_KEYS = ("results", "items")
+DEFAULT_CHUNK_ITEMS = 200
+
 
 class FixtureEventClient(BaseEventClient):
-    """Loads canned Google-like payloads from the fixtures directory."""
+    """Streams Google-like payloads from fixture files or exports.
+
+    ``fixtures_dir`` may be a directory (every ``.json``/``.jsonl`` file in it, gzip
+    allowed, in name order) or a single file. JSON files are parsed
+    incrementally: the ``results``/``items`` arrays are yielded as payloads
+    of at most ``chunk_items`` items, so memory does not grow with the file.
+    Other JSON documents, and each JSONL line, are passed through as one
+    payload.
+    """
 
     provider_name = "fixtures"
+    supports_resume = True
 
-    def __init__(self, fixtures_dir: Path | None = None, **config: Any) -> None:
+    def __init__(
+        self,
+        fixtures_dir: Path | None = None,
+        chunk_items: int = DEFAULT_CHUNK_ITEMS,
+        **config: Any,
+    ) -> None:
         fixtures_base = fixtures_dir or Path(__file__).resolve().parents[2] / "fixtures"
         if not fixtures_base.exists():
-            raise FileNotFoundError(f"Fixtures directory not found: {fixtures_base}")
+            raise FileNotFoundError(f"Fixtures path not found: {fixtures_base}")
         self.fixtures_dir = fixtures_base
-        super().__init__(fixtures_dir=self.fixtures_dir, **config)
+        self.chunk_items = max(1, chunk_items)
+        self.start_index = 0
+        self.start_offset = 0
+        self.file_index = 0
+        self.payload_offset = 0
+        super().__init__(
+            fixtures_dir=self.fixtures_dir, chunk_items=self.chunk_items, **config
+        )
+
+    def paths(self) -> list[Path]:
+        if self.fixtures_dir.is_file():
+            return [self.fixtures_dir]
+        found = {
+            path
+            for pattern in FIXTURE_PATTERNS
+            for path in self.fixtures_dir.glob(pattern)
+        }
+        return sorted(found)
 
     def fetch(self) -> Iterable[Mapping[str, Any]]:
-        """Yield raw fixture payloads as dictionaries."""
-        for path in sorted(self.fixtures_dir.glob("*.json")):
-            with path.open("r", encoding="utf-8") as handle:
-                yield json.load(handle)
+        """Yield payload chunks from each file, resuming mid-file if asked.
+
+        A position set by :meth:`resume_from` applies to this fetch only.
+        """
+        paths = self.paths()
+        start_index, skip = self.start_index, self.start_offset
+        self.start_index = self.start_offset = 0
+        self.file_index = start_index
+        for path in paths[start_index:]:
+            self.payload_offset = skip
+            with open_text(path) as handle:
+                payloads = islice(self._iter_payloads(path, handle), skip, None)
+                while True:
+                    try:
+                        payload = next(payloads)
+                    except StopIteration:
+                        break
+                    except ValueError as exc:
+                        raise ValueError(f"Could not parse {path}: {exc}") from exc
+                    self.payload_offset += 1
+                    yield payload
+            skip = 0
+            self.file_index += 1
+            self.payload_offset = 0
+
+    def _iter_payloads(self, path: Path, handle) -> Iterator[Mapping[str, Any]]:
+        if path.name.endswith((".jsonl", ".jsonl.gz")):
+            yield from iter_json_lines(handle)
+            return
+        chunk_key = None
+        chunk: list[Any] = []
+        members: dict[str, Any] = {}
+        for key, value in iter_object_items(handle, ITEM_KEYS):
+            if key not in ITEM_KEYS:
+                members[key] = value
+                continue
+            if chunk and key != chunk_key:
+                yield {chunk_key: chunk}
+                chunk = []
+            chunk_key = key
+            chunk.append(value)
+            if len(chunk) >= self.chunk_items:
+                yield {chunk_key: chunk}
+                chunk = []
+        if chunk:
+            yield {chunk_key: chunk}
+        elif chunk_key is None:
+            # Not a list export (e.g. a single Apify item): pass it through.
+            yield members
+
+    def checkpoint_state(self) -> dict[str, Any]:
+        return {"file_index": self.file_index, "payload_offset": self.payload_offset}
+
+    def resume_from(self, state: Mapping[str, Any]) -> None:
+        self.start_index = int(state.get("file_index", 0))
+        self.start_offset = int(state.get("payload_offset", 0))
 
 
 __all__ = ["FixtureEventClient"]
@@ -0,0 +1,110 @@
+"""Fan-in client that pulls several providers concurrently."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, Iterable, Mapping, Sequence
+
+from .base import BaseEventClient
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_KEY = "provider"
+DEFAULT_QUEUE_SIZE = 64
+
+_DONE = object()
+
+
+class MultiSourceClient(BaseEventClient):
+    """Runs each client's ``fetch`` on its own thread and merges the payloads.
+
+    Payloads go through a bounded queue, so a fast provider cannot buffer
+    unboundedly ahead of the single writer, and each one is tagged with the
+    ``provider_name`` of the client that produced it. A provider that fails is
+    logged and recorded in ``failures`` without stopping the others.
+    """
+
+    provider_name = "multi"
+
+    def __init__(
+        self,
+        clients: Sequence[BaseEventClient],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        super().__init__()
+        if not clients:
+            raise ValueError("MultiSourceClient needs at least one client.")
+        self.clients = list(clients)
+        self.queue_size = max(1, queue_size)
+        self.failures: dict[str, str] = {}
+
+    def fetch(self) -> Iterable[Mapping[str, Any]]:
+        self.failures = {}
+        payloads: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        threads = [
+            threading.Thread(
+                target=self._produce,
+                args=(client, payloads, stop),
+                name=f"fetch-{client.provider_name}",
+                daemon=True,
+            )
+            for client in self.clients
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            running = len(threads)
+            while running:
+                item = payloads.get()
+                if item is _DONE:
+                    running -= 1
+                else:
+                    yield item
+        finally:
+            # Unblock producers if the consumer stopped early.
+            stop.set()
+
+    def _produce(
+        self, client: BaseEventClient, payloads: queue.Queue, stop: threading.Event
+    ) -> None:
+        name = client.provider_name
+        try:
+            for payload in client.fetch():
+                if not self._put(payloads, {**payload, PROVIDER_KEY: name}, stop):
+                    return
+        except Exception as exc:
+            logger.exception("Fetching from %s failed", name)
+            self.failures[name] = str(exc)
+        finally:
+            self._put(payloads, _DONE, stop)
+
+    @staticmethod
+    def _put(payloads: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            try:
+                payloads.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch_complete(self) -> bool:
+        return not self.failures and all(
+            client.fetch_complete() for client in self.clients
+        )
+
+    def cache_params(self) -> dict[str, Any]:
+        return {
+            "provider": self.provider_name,
+            "clients": [client.cache_params() for client in self.clients],
+        }
+
+    def __repr__(self) -> str:
+        names = ", ".join(client.provider_name for client in self.clients)
+        return f"{self.__class__.__name__}({names})"
+
+
+__all__ = ["MultiSourceClient", "PROVIDER_KEY"]
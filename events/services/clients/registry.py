@@ -0,0 +1,56 @@
+"""Builds provider clients from their configuration keys."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Sequence
+
+from django.conf import settings
+
+from .base import BaseEventClient
+
+PROVIDERS = ("fixtures", "google", "apify_facebook")
+
+
+def build_client(
+    provider_key: str,
+    cities: Sequence[str] | None = None,
+    concurrency: int | None = None,
+    path: Path | None = None,
+) -> BaseEventClient:
+    """Client for ``provider_key`` configured from settings and the environment.
+
+    Raises ``ValueError`` for unknown providers or missing credentials and
+    ``FileNotFoundError`` when fixture exports cannot be found.
+    """
+    if provider_key == "fixtures":
+        from .fixture_client import FixtureEventClient
+
+        return FixtureEventClient(fixtures_dir=path)
+    if provider_key == "google":
+        from .google_client import GoogleEventClient
+
+        api_key = os.getenv("GOOGLE_API_KEY")
+        cse_id = os.getenv("GOOGLE_CSE_ID")
+        if not api_key or not cse_id:
+            raise ValueError(
+                "GOOGLE_API_KEY and GOOGLE_CSE_ID environment variables are required."
+            )
+        return GoogleEventClient(api_key=api_key, cse_id=cse_id)
+    if provider_key == "apify_facebook":
+        from .apify_facebook_client import ApifyFacebookClient
+
+        if not settings.APIFY_TOKEN:
+            raise ValueError("APIFY_TOKEN must be configured for Apify ingestion.")
+        return ApifyFacebookClient(
+            api_token=settings.APIFY_TOKEN,
+            actor_id=settings.APIFY_ACTOR_ID,
+            max_events=settings.APIFY_MAX_EVENTS,
+            cities=cities,
+            concurrency=concurrency,
+        )
+    raise ValueError(f"Unsupported provider '{provider_key}'")
+
+
+__all__ = ["PROVIDERS", "build_client"]
@@ -0,0 +1,167 @@
+"""Synthetic client that streams generated provider payloads for benchmarks."""
+
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Any, Iterable, Mapping, Sequence
+
+from .base import BaseEventClient
+
+SHAPES = ("places", "cse", "apify", "mixed")
+DEFAULT_CITY_MIX = {"Johannesburg": 1.0, "Pretoria": 1.0}
+CITY_COORDINATES = {
+    "Johannesburg": (-26.2041, 28.0473),
+    "Pretoria": (-25.7479, 28.2293),
+}
+CATEGORIES = ("concert", "market", "fitness", "tour", "festival", "food", "theatre")
+VENUES = ("Market Square", "Civic Theatre", "City Park", "Rooftop Bar", "Town Hall")
+
+
+class SyntheticEventClient(BaseEventClient):
+    """Generates Places, CSE or Apify shaped payloads on the fly.
+
+    ``duplicate_ratio`` is the share of items that repeat an earlier item
+    verbatim, exercising the dedupe path. Places and CSE items are grouped
+    ``page_size`` per payload like real API pages; Apify items are yielded one
+    per payload like dataset items. Output is deterministic for a given
+    ``seed``.
+    """
+
+    provider_name = "synthetic"
+
+    def __init__(
+        self,
+        size: int = 1000,
+        shape: str = "mixed",
+        duplicate_ratio: float = 0.0,
+        city_mix: Mapping[str, float] | None = None,
+        page_size: int = 100,
+        seed: int = 0,
+        **config: Any,
+    ) -> None:
+        if shape not in SHAPES:
+            raise ValueError(f"shape must be one of {', '.join(SHAPES)}")
+        if not 0 <= duplicate_ratio < 1:
+            raise ValueError("duplicate_ratio must be in [0, 1).")
+        super().__init__(
+            size=size,
+            shape=shape,
+            duplicate_ratio=duplicate_ratio,
+            page_size=page_size,
+            seed=seed,
+            **config,
+        )
+        self.size = size
+        self.shape = shape
+        self.duplicate_ratio = duplicate_ratio
+        self.city_mix = dict(city_mix or DEFAULT_CITY_MIX)
+        self.page_size = max(1, page_size)
+        self.seed = seed
+        self.items_generated = 0
+
+    def fetch(self) -> Iterable[Mapping[str, Any]]:
+        """Yield ``size`` items worth of payloads."""
+        rng = random.Random(self.seed)
+        cities = list(self.city_mix)
+        weights = [self.city_mix[city] for city in cities]
+        shapes = ("places", "cse", "apify") if self.shape == "mixed" else (self.shape,)
+        pages: dict[str, list[Mapping[str, Any]]] = {"places": [], "cse": []}
+        self.items_generated = 0
+        for index in range(self.size):
+            if index and rng.random() < self.duplicate_ratio:
+                source_index = rng.randrange(index)
+            else:
+                source_index = index
+            item_rng = random.Random(f"{self.seed}:{source_index}")
+            city = item_rng.choices(cities, weights)[0]
+            shape = shapes[source_index % len(shapes)]
+            item = GENERATORS[shape](source_index, city, item_rng)
+            self.items_generated += 1
+            if shape == "apify":
+                yield {"apify_raw_item": item, "fallback_city": city}
+                continue
+            pages[shape].append(item)
+            if len(pages[shape]) >= self.page_size:
+                yield _page(shape, pages[shape])
+                pages[shape] = []
+        for shape, items in pages.items():
+            if items:
+                yield _page(shape, items)
+
+
+def _page(shape: str, items: Sequence[Mapping[str, Any]]) -> Mapping[str, Any]:
+    return {"results" if shape == "places" else "items": list(items)}
+
+
+def _start_time(rng: random.Random) -> datetime:
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    return base + timedelta(minutes=30 * rng.randrange(365 * 48))
+
+
+def _coordinates(city: str, rng: random.Random) -> tuple[float, float]:
+    lat, lng = CITY_COORDINATES.get(city, (-26.0, 28.0))
+    return round(lat + rng.uniform(-0.1, 0.1), 6), round(
+        lng + rng.uniform(-0.1, 0.1), 6
+    )
+
+
+def generate_places_item(index: int, city: str, rng: random.Random) -> dict[str, Any]:
+    lat, lng = _coordinates(city, rng)
+    return {
+        "place_id": f"synthetic-place-{index}",
+        "name": f"  Synthetic {rng.choice(CATEGORIES)}   night {index} ",
+        "formatted_address": f"{index} Main Rd, {city}, South Africa",
+        "city": city,
+        "start_time": _start_time(rng).isoformat(),
+        "venue": rng.choice(VENUES),
+        "types": [rng.choice(CATEGORIES)],
+        "website": f"events.example.com/places/{index}",
+        "geometry": {"location": {"lat": lat, "lng": lng}},
+        "source": "google_places",
+    }
+
+
+def generate_cse_item(index: int, city: str, rng: random.Random) -> dict[str, Any]:
+    return {
+        "title": f"Synthetic {rng.choice(CATEGORIES)} listing {index}",
+        "link": f"https://listings.example.com/cse/{index}",
+        "snippet": "Generated for benchmarking",
+        "pagemap": {
+            "metatags": [
+                {
+                    "event:start_time": _start_time(rng).isoformat(),
+                    "event:venue_name": rng.choice(VENUES),
+                    "event:location": f"{city} Central",
+                    "event:category": rng.choice(CATEGORIES).title(),
+                }
+            ]
+        },
+        "source": "google_cse",
+    }
+
+
+def generate_apify_item(index: int, city: str, rng: random.Random) -> dict[str, Any]:
+    lat, lng = _coordinates(city, rng)
+    return {
+        "name": f"Synthetic Facebook {rng.choice(CATEGORIES)} {index}",
+        "url": f"https://www.facebook.com/events/{1000000 + index}/",
+        "utcStartDate": _start_time(rng).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        "organizedBy": f"Organizer {index % 97}",
+        "location": {
+            "name": rng.choice(VENUES),
+            "city": city,
+            "latitude": lat,
+            "longitude": lng,
+        },
+    }
+
+
+GENERATORS = {
+    "places": generate_places_item,
+    "cse": generate_cse_item,
+    "apify": generate_apify_item,
+}
+
+
+__all__ = ["SyntheticEventClient", "SHAPES"]
@@ -3,31 +3,159 @@
 from __future__ import annotations
 
 import hashlib
+import json
+import logging
+from contextlib import nullcontext
 from dataclasses import dataclass, field
-from typing import Iterable, Mapping, Sequence
+from time import perf_counter
+from typing import Any, Callable, Iterable, Mapping, Sequence
 
 from django.db import transaction
+from django.db.models import Q
 
-from events.models import Event
+from events.cache import bump_generation
+from events.dedupe import link_duplicates
+from events.facets import FacetTracker, rebuild_facets
+from events.geo import encode_geohash
+from events.models import Event, city_lookup_key
+from events.payloads import store_payloads, stores_compressed
+from events.search import refresh_query_statistics
 
+from .checkpoints import CheckpointTracker, checkpoint_key
 from .clients.base import BaseEventClient
-from .sanitation import (
-    normalize_apify_facebook_item,
-    normalize_cse_item,
-    normalize_places_item,
-    normalize_city,
+from .clients.multi_source_client import PROVIDER_KEY
+from .instrumentation import IngestionProfile
+from .normalization import iter_normalized, iter_normalized_parallel
+from .sanitation import normalize_city
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+SAMPLE_SIZE = 100
+
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+UPSERT_FIELDS = (
+    "title",
+    "start_date",
+    "venue_name",
+    "city",
+    "city_key",
+    "category",
+    "latitude",
+    "longitude",
+    "geohash",
+    "event_url",
+    "raw_payload",
+    "payload_digest",
+    "fingerprint",
+    "content_hash",
+    "source",
+)
+# The hash covers the payload itself, so it does not depend on where the
+# payload is stored.
+HASHED_FIELDS = tuple(
+    name for name in UPSERT_FIELDS if name not in ("content_hash", "payload_digest")
 )
+# Besides the natural key, the columns that decide the facet an event is
+# counted in, so ``FacetTracker`` sees stored values without extra queries.
+EXISTING_FIELDS = (
+    "id",
+    "source",
+    "event_url",
+    "fingerprint",
+    "content_hash",
+    "city_key",
+    "category",
+    "start_date",
+    "canonical_id",
+)
+TALLY_KEYS = (CREATED, UPDATED, UNCHANGED, "skipped", "errors")
 
 
 @dataclass
 class IngestionReport:
-    """Aggregated ingestion stats and affected records."""
+    """Aggregated ingestion stats and affected records.
+
+    Streaming runs leave ``events`` empty and only keep the first
+    ``SAMPLE_SIZE`` affected primary keys in ``sample_ids``. Likewise
+    ``errors`` counts failed rows and ``error_sample`` keeps the first
+    ``SAMPLE_SIZE`` messages. Rows whose content hash matches the stored
+    one are counted as ``unchanged`` and cause no writes. ``profile`` is
+    only populated for profiled runs, and ``resumed`` is set when the run
+    continued from a saved checkpoint.
+    ``providers`` breaks the counters down per provider; rows without a
+    provider tag are counted under ``provider``.
+    ``duplicates`` counts written rows linked to an existing event from
+    another source (see :mod:`events.dedupe`).
+    """
 
     events: list[Event] = field(default_factory=list)
     created: int = 0
     updated: int = 0
+    unchanged: int = 0
     skipped: int = 0
-    errors: list[str] = field(default_factory=list)
+    errors: int = 0
+    error_sample: list[str] = field(default_factory=list)
+    sample_ids: list[int] = field(default_factory=list)
+    chunks: int = 0
+    profile: IngestionProfile | None = None
+    resumed: bool = False
+    provider: str = ""
+    providers: dict[str, dict[str, int]] = field(default_factory=dict)
+    duplicates: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.created + self.updated + self.unchanged + self.skipped + self.errors
+
+    def record(
+        self,
+        event: Event,
+        outcome: str,
+        keep_event: bool = True,
+        provider: str | None = None,
+    ) -> None:
+        if keep_event:
+            self.events.append(event)
+        if len(self.sample_ids) < SAMPLE_SIZE:
+            self.sample_ids.append(event.pk)
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        self._tally(provider, outcome)
+
+    def skip(self, provider: str | None = None) -> None:
+        self.skipped += 1
+        self._tally(provider, "skipped")
+
+    def fail(self, message: str, provider: str | None = None) -> None:
+        self.errors += 1
+        if len(self.error_sample) < SAMPLE_SIZE:
+            self.error_sample.append(message)
+        self._tally(provider, "errors")
+
+    def _tally(self, provider: str | None, outcome: str) -> None:
+        counts = self.providers.setdefault(
+            provider or self.provider, dict.fromkeys(TALLY_KEYS, 0)
+        )
+        counts[outcome] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-serializable summary of the run, without ``events``."""
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "error_sample": self.error_sample,
+            "duplicates": self.duplicates,
+            "chunks": self.chunks,
+            "resumed": self.resumed,
+            "providers": self.providers,
+            "sample_ids": self.sample_ids,
+            "profile": self.profile.as_dict() if self.profile else None,
+        }
 
 
 def ingest(client: BaseEventClient) -> list[Event]:
@@ -36,9 +164,36 @@ def ingest(client: BaseEventClient) -> list[Event]:
 
 
 def ingest_with_report(
-    client: BaseEventClient, allowed_cities: Sequence[str] | None = None
+    client: BaseEventClient,
+    allowed_cities: Sequence[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    stream: bool = False,
+    progress: Callable[[IngestionReport], None] | None = None,
+    workers: int = 1,
+    profile: bool = False,
+    resume: bool = False,
 ) -> IngestionReport:
-    """Run ingestion, optionally restricting to cities, and return stats."""
+    """Run ingestion, optionally restricting to cities, and return stats.
+
+    Normalized rows are buffered and written ``batch_size`` at a time through
+    :func:`bulk_upsert_events`. By default the whole run shares one
+    transaction. With ``stream=True`` every chunk commits on its own and no
+    ``Event`` instances are retained, so memory stays flat and a failure only
+    loses the chunk in flight. ``progress`` is called after each chunk.
+    ``workers`` above one normalizes payloads on a process pool while rows are
+    still written from this thread. ``profile=True`` records per-stage timings
+    and database statement counts in ``report.profile``.
+
+    Streaming runs of clients that ``supports_resume`` save the client's
+    position with every chunk in an ``IngestionCheckpoint``. ``resume=True``
+    (which implies streaming) continues from the last unfinished checkpoint
+    for the same client settings and cities instead of starting over.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer.")
+    if resume and not client.supports_resume:
+        raise ValueError(f"{client.provider_name} does not support resuming.")
+    stream = stream or resume
     allowed = None
     if allowed_cities:
         normalized_allowed = set()
@@ -47,73 +202,303 @@ def ingest_with_report(
             if normalized:
                 normalized_allowed.add(normalized)
         allowed = normalized_allowed
-    report = IngestionReport()
-    with transaction.atomic():
-        for payload in client.fetch():
-            for data in iter_normalized(payload):
-                if allowed and data["city"] not in allowed:
-                    report.skipped += 1
+    report = IngestionReport(
+        profile=IngestionProfile() if profile else None,
+        provider=client.provider_name,
+    )
+    prof = report.profile
+    checkpoint = None
+    if stream and client.supports_resume:
+        key = checkpoint_key(client, allowed)
+        checkpoint = CheckpointTracker(client, key, resume=resume)
+        report.resumed = checkpoint.resumed
+    payloads = client.fetch()
+    if checkpoint:
+        payloads = checkpoint.wrap(payloads)
+    if prof:
+        payloads = prof.timed(payloads, "fetch")
+    batches = iter_normalized_parallel(payloads, workers=workers)
+    if prof:
+        batches = prof.timed(batches, "normalize", count=False, exclude="fetch")
+    with (
+        prof.capture_queries() if prof else nullcontext(),
+        nullcontext() if stream else transaction.atomic(),
+    ):
+        chunk: list[Mapping[str, Any]] = []
+        for rows in batches:
+            if prof:
+                rows = prof.timed(rows, "normalize", label=_row_label)
+            for data in rows:
+                started = perf_counter() if prof else 0.0
+                accepted = _accepts(data, allowed)
+                if prof:
+                    prof.add("filter", perf_counter() - started, int(accepted))
+                if not accepted:
+                    report.skip(data.get(PROVIDER_KEY))
                     continue
-                if not data["title"] or not data["city"]:
-                    report.skipped += 1
-                    continue
-                try:
-                    event, created = upsert_event(data)
-                except Exception as exc:  # pragma: no cover - defensive
-                    report.errors.append(f"{data.get('title') or 'unknown'}: {exc}")
-                else:
-                    report.events.append(event)
-                    if created:
-                        report.created += 1
-                    else:
-                        report.updated += 1
+                if len(chunk) >= batch_size:
+                    _flush(chunk, report, stream, progress, checkpoint)
+                    chunk = []
+                chunk.append(data)
+            if checkpoint:
+                checkpoint.payload_done()
+            # Flushing a full chunk here, after the payload is marked done,
+            # lets the checkpoint cover every row that was just committed.
+            if len(chunk) >= batch_size:
+                _flush(chunk, report, stream, progress, checkpoint)
+                chunk = []
+        if chunk:
+            _flush(chunk, report, stream, progress, checkpoint)
+        if checkpoint:
+            checkpoint.finish()
+    if report.created:
+        refresh_query_statistics()
     return report
 
 
-def iter_normalized(payload: Mapping[str, object]) -> Iterable[Mapping[str, object]]:
-    """Yield normalized dictionaries from a payload chunk."""
-    if "results" in payload:
-        for item in payload["results"]:
-            yield normalize_places_item(item)
-    elif "items" in payload:
-        for item in payload["items"]:
-            yield normalize_cse_item(item)
-    elif "apify_raw_item" in payload:
-        fallback_city = payload.get("fallback_city")
-        normalized = normalize_apify_facebook_item(
-            payload["apify_raw_item"], fallback_city
-        )
-        requested = normalize_city(fallback_city) if fallback_city else ""
-        if requested and normalized["city"] and normalized["city"] != requested:
-            return
-        yield normalized
+def _accepts(data: Mapping[str, Any], allowed: set[str] | None) -> bool:
+    if allowed and data["city"] not in allowed:
+        return False
+    return bool(data["title"] and data["city"])
+
+
+def _row_label(data: Mapping[str, Any]) -> str:
+    return f"{data.get('source')}: {data.get('title') or 'untitled'}"
+
+
+def _flush(
+    chunk: Sequence[Mapping[str, Any]],
+    report: IngestionReport,
+    stream: bool,
+    progress: Callable[[IngestionReport], None] | None,
+    checkpoint: CheckpointTracker | None = None,
+) -> None:
+    if report.profile:
+        label = f"chunk {report.chunks + 1} ({len(chunk)} rows)"
+        with report.profile.stage("upsert", items=len(chunk), label=label):
+            _write_chunk(chunk, report, not stream, checkpoint)
+    else:
+        _write_chunk(chunk, report, not stream, checkpoint)
+    if progress:
+        progress(report)
+
+
+def _write_chunk(
+    chunk: Sequence[Mapping[str, Any]],
+    report: IngestionReport,
+    keep_events: bool = True,
+    checkpoint: CheckpointTracker | None = None,
+) -> None:
+    """Bulk upsert a chunk, retrying row by row if the batch is rejected.
+
+    Duplicate links and facet counts are updated, the API cache generation
+    is bumped, and the checkpoint saved, in the same transaction as the
+    writes.
+    """
+    with transaction.atomic():
+        facets: FacetTracker | None = FacetTracker()
+        try:
+            with transaction.atomic():
+                results = list(
+                    zip(chunk, bulk_upsert_events(chunk, facets), strict=True)
+                )
+        except Exception:
+            logger.exception(
+                "Bulk upsert of %d rows failed; retrying per row", len(chunk)
+            )
+            # Per-row upserts are not tracked; facets are recounted instead.
+            facets = None
+            results = []
+            for data in chunk:
+                try:
+                    with transaction.atomic():
+                        results.append((data, _upsert_row(data)))
+                except Exception as exc:
+                    report.fail(
+                        f"{data.get('title') or 'unknown'}: {exc}",
+                        data.get(PROVIDER_KEY),
+                    )
+        written = [event for _, (event, outcome) in results if outcome != UNCHANGED]
+        if written:
+            report.duplicates += link_duplicates(written, facets)
+            if facets is None:
+                rebuild_facets()
+            else:
+                facets.apply()
+            bump_generation()
+        if checkpoint:
+            checkpoint.save()
+    report.chunks += 1
+    for data, (event, outcome) in results:
+        report.record(event, outcome, keep_events, data.get(PROVIDER_KEY))
 
 
 def upsert_event(data: Mapping[str, object]) -> tuple[Event, bool]:
     """Create or update an event, preserving raw payload."""
-    source = data["source"]
+    defaults = build_event_defaults(data)
+    source = defaults["source"]
+    if stores_compressed():
+        (defaults["payload_digest"],) = store_payloads([defaults["raw_payload"]])
+        defaults["raw_payload"] = None
+    if defaults["event_url"]:
+        event, created = Event.objects.update_or_create(
+            source=source, event_url=defaults["event_url"], defaults=defaults
+        )
+    else:
+        event, created = Event.objects.update_or_create(
+            source=source, fingerprint=defaults["fingerprint"], defaults=defaults
+        )
+    return event, created
+
+
+def _upsert_row(data: Mapping[str, object]) -> tuple[Event, str]:
+    """``upsert_event`` that, like the bulk path, skips unchanged rows."""
+    defaults = build_event_defaults(data)
+    key = _event_key(defaults)
+    stored = _fetch_existing([key]).get(key)
+    if stored is not None and stored.content_hash == defaults["content_hash"]:
+        return stored, UNCHANGED
+    event, created = upsert_event(data)
+    return event, CREATED if created else UPDATED
+
+
+def bulk_upsert_events(
+    rows: Sequence[Mapping[str, object]],
+    facets: FacetTracker | None = None,
+) -> list[tuple[Event, str]]:
+    """Upsert a chunk of normalized rows with one lookup and two bulk writes.
+
+    Returns one ``(event, outcome)`` pair per input row, where ``outcome`` is
+    ``CREATED``, ``UPDATED`` or ``UNCHANGED`` exactly as if the rows had been
+    applied one by one in order: a key repeated within the chunk is created
+    once and then updated (or unchanged), and the last occurrence wins. Rows
+    whose content hash equals the stored one are not written at all.
+    Payloads of written rows go to ``EventPayload`` when storage is
+    compressed (see ``events.payloads``).
+    Every resolved event is passed to ``facets.observe`` before it is
+    modified; applying the tracker is left to the caller.
+    """
+    pending: dict[tuple[str, str, str], dict[str, Any]] = {}
+    first_hashes: dict[tuple[str, str, str], str] = {}
+    outcomes: list[tuple[tuple[str, str, str], str | None]] = []
+    for data in rows:
+        defaults = build_event_defaults(data)
+        key = _event_key(defaults)
+        previous = pending.get(key)
+        if previous is None:
+            first_hashes[key] = defaults["content_hash"]
+            outcomes.append((key, None))
+        elif previous["content_hash"] == defaults["content_hash"]:
+            outcomes.append((key, UNCHANGED))
+        else:
+            outcomes.append((key, UPDATED))
+        pending[key] = defaults
+
+    existing = _fetch_existing(pending)
+    stored_hashes = {key: event.content_hash for key, event in existing.items()}
+    to_create: list[Event] = []
+    to_update: list[Event] = []
+    resolved: dict[tuple[str, str, str], Event] = {}
+    for key, defaults in pending.items():
+        event = existing.get(key)
+        if event is None:
+            event = Event(**defaults)
+            to_create.append(event)
+        elif stored_hashes[key] != defaults["content_hash"]:
+            to_update.append(event)
+        if facets is not None:
+            facets.observe(event)
+        for name, value in defaults.items():
+            setattr(event, name, value)
+        resolved[key] = event
+
+    if stores_compressed():
+        _store_payloads_externally([*to_create, *to_update])
+    if to_create:
+        Event.objects.bulk_create(to_create)
+    if to_update:
+        Event.objects.bulk_update(to_update, UPSERT_FIELDS)
+    return [
+        (resolved[key], outcome or _first_outcome(key, first_hashes, stored_hashes))
+        for key, outcome in outcomes
+    ]
+
+
+def _store_payloads_externally(events: Sequence[Event]) -> None:
+    digests = store_payloads([event.raw_payload for event in events])
+    for event, digest in zip(events, digests, strict=True):
+        event.raw_payload = None
+        event.payload_digest = digest
+
+
+def _first_outcome(
+    key: tuple[str, str, str],
+    first_hashes: Mapping[tuple[str, str, str], str],
+    stored_hashes: Mapping[tuple[str, str, str], str | None],
+) -> str:
+    if key not in stored_hashes:
+        return CREATED
+    if stored_hashes[key] == first_hashes[key]:
+        return UNCHANGED
+    return UPDATED
+
+
+def build_event_defaults(data: Mapping[str, object]) -> dict[str, Any]:
+    """Map a normalized row onto ``Event`` field values."""
     event_url = data.get("event_url")
-    fingerprint = fingerprint_event(data) if not event_url else None
+    latitude, longitude = data.get("latitude"), data.get("longitude")
+    located = latitude is not None and longitude is not None
     defaults = {
         "title": data["title"],
         "start_date": data["start_date"],
         "venue_name": data["venue_name"],
         "city": data["city"],
+        "city_key": city_lookup_key(data["city"]),
         "category": data["category"],
+        "latitude": latitude if located else None,
+        "longitude": longitude if located else None,
+        "geohash": encode_geohash(latitude, longitude) if located else None,
         "event_url": event_url,
         "raw_payload": data["raw_payload"],
-        "fingerprint": fingerprint,
-        "source": source,
+        "payload_digest": None,
+        "fingerprint": fingerprint_event(data) if not event_url else None,
+        "source": data["source"],
     }
-    if event_url:
-        event, created = Event.objects.update_or_create(
-            source=source, event_url=event_url, defaults=defaults
-        )
-    else:
-        event, created = Event.objects.update_or_create(
-            source=source, fingerprint=fingerprint, defaults=defaults
-        )
-    return event, created
+    defaults["content_hash"] = content_hash(defaults)
+    return defaults
+
+
+def _event_key(values: Mapping[str, Any]) -> tuple[str, str, str]:
+    """Return the natural key matching the model's unique constraints."""
+    if values["event_url"]:
+        return ("url", values["source"], values["event_url"])
+    return ("fingerprint", values["source"], values["fingerprint"])
+
+
+def _fetch_existing(
+    keys: Iterable[tuple[str, str, str]],
+) -> dict[tuple[str, str, str], Event]:
+    """Resolve stored events for the given keys in a single query."""
+    grouped: dict[tuple[str, str], list[str]] = {}
+    for kind, source, value in keys:
+        grouped.setdefault((kind, source), []).append(value)
+    if not grouped:
+        return {}
+    lookup = Q()
+    for (kind, source), values in grouped.items():
+        if kind == "url":
+            lookup |= Q(source=source, event_url__in=values)
+        else:
+            lookup |= Q(source=source, event_url__isnull=True, fingerprint__in=values)
+    matches = Event.objects.filter(lookup).only(*EXISTING_FIELDS)
+    return {_event_key(vars(event)): event for event in matches}
+
+
+def content_hash(values: Mapping[str, Any]) -> str:
+    """Hash every stored column so unchanged rows can be detected cheaply."""
+    content = {name: values[name] for name in HASHED_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
 
 
 def fingerprint_event(data: Mapping[str, object]) -> str:
@@ -131,4 +516,17 @@ def fingerprint_event(data: Mapping[str, object]) -> str:
     return hashlib.sha256(joined.encode("utf-8")).hexdigest()
 
 
-__all__ = ["ingest", "ingest_with_report", "IngestionReport"]
+__all__ = [
+    "ingest",
+    "ingest_with_report",
+    "bulk_upsert_events",
+    "iter_normalized",
+    "upsert_event",
+    "content_hash",
+    "IngestionReport",
+    "CREATED",
+    "UPDATED",
+    "UNCHANGED",
+    "DEFAULT_BATCH_SIZE",
+    "SAMPLE_SIZE",
+]
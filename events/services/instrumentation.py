@@ -0,0 +1,148 @@
+"""Per-stage timing and query accounting for ingestion runs."""
+
+from __future__ import annotations
+
+import heapq
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator
+
+from django.db import connection
+
+STAGES = ("fetch", "normalize", "filter", "upsert")
+SLOWEST_LIMIT = 5
+
+
+@dataclass
+class StageStats:
+    seconds: float = 0.0
+    items: int = 0
+
+
+@dataclass
+class IngestionProfile:
+    """Wall time and item counts per stage, DB statement stats, slowest items."""
+
+    stages: dict[str, StageStats] = field(
+        default_factory=lambda: {name: StageStats() for name in STAGES}
+    )
+    queries: int = 0
+    query_seconds: float = 0.0
+    slowest: list[tuple[float, str, str]] = field(default_factory=list)
+
+    def add(self, stage: str, seconds: float, items: int = 0, label: str = "") -> None:
+        stats = self.stages.setdefault(stage, StageStats())
+        stats.seconds += seconds
+        stats.items += items
+        if label:
+            entry = (seconds, stage, label)
+            if len(self.slowest) < SLOWEST_LIMIT:
+                heapq.heappush(self.slowest, entry)
+            elif seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    @contextmanager
+    def stage(self, name: str, items: int = 0, label: str = "") -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - started, items, label)
+
+    def timed(
+        self,
+        iterable: Iterable[Any],
+        stage: str,
+        count: bool = True,
+        exclude: str | None = None,
+        label: Callable[[Any], str] | None = None,
+    ) -> Iterator[Any]:
+        """Attribute the time spent producing each element to ``stage``.
+
+        Time recorded under ``exclude`` while an element is being produced
+        (a nested, separately timed iterator) is subtracted.
+        """
+        iterator = iter(iterable)
+        excluded = self.stages.setdefault(exclude, StageStats()) if exclude else None
+        while True:
+            before = excluded.seconds if excluded else 0.0
+            started = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(stage, perf_counter() - started)
+                return
+            elapsed = perf_counter() - started
+            if excluded:
+                elapsed -= excluded.seconds - before
+            self.add(stage, elapsed, int(count), label(item) if label else "")
+            yield item
+
+    def record_query(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook."""
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_seconds += perf_counter() - started
+
+    @contextmanager
+    def capture_queries(self) -> Iterator[None]:
+        with connection.execute_wrapper(self.record_query):
+            yield
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "stages": {
+                name: {"seconds": round(stats.seconds, 6), "items": stats.items}
+                for name, stats in self.stages.items()
+            },
+            "queries": self.queries,
+            "query_seconds": round(self.query_seconds, 6),
+            "slowest": [
+                {"seconds": round(seconds, 6), "stage": stage, "item": label}
+                for seconds, stage, label in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.as_dict(), sort_keys=True)
+
+    def to_prometheus(self, prefix: str = "events_ingestion") -> str:
+        """Render the profile in the Prometheus text exposition format."""
+        lines = [
+            f"# TYPE {prefix}_stage_seconds gauge",
+            *(
+                f'{prefix}_stage_seconds{{stage="{name}"}} {stats.seconds:.6f}'
+                for name, stats in self.stages.items()
+            ),
+            f"# TYPE {prefix}_stage_items gauge",
+            *(
+                f'{prefix}_stage_items{{stage="{name}"}} {stats.items}'
+                for name, stats in self.stages.items()
+            ),
+            f"# TYPE {prefix}_db_queries gauge",
+            f"{prefix}_db_queries {self.queries}",
+            f"# TYPE {prefix}_db_query_seconds gauge",
+            f"{prefix}_db_query_seconds {self.query_seconds:.6f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def to_text(self) -> str:
+        lines = [f"{'stage':<10} {'seconds':>10} {'items':>10}"]
+        for name, stats in self.stages.items():
+            lines.append(f"{name:<10} {stats.seconds:>10.3f} {stats.items:>10}")
+        lines.append(
+            f"DB queries: {self.queries} ({self.query_seconds:.3f}s in the database)"
+        )
+        if self.slowest:
+            lines.append("Slowest items:")
+            for seconds, stage, label in sorted(self.slowest, reverse=True):
+                lines.append(f"  {seconds * 1000:8.2f} ms  {stage:<9} {label}")
+        return "\n".join(lines)
+
+
+__all__ = ["IngestionProfile", "StageStats", "STAGES"]
@@ -0,0 +1,136 @@
+"""Incremental readers for large JSON and JSONL provider exports.
+
+Only the standard library is used: values are decoded one at a time with
+``JSONDecoder.raw_decode`` over a sliding text buffer, so memory is bounded
+by the largest single item rather than the file size.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+DEFAULT_READ_SIZE = 1 << 16
+GZIP_MAGIC = b"\x1f\x8b"
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789+-.eE"
+
+_decoder = json.JSONDecoder()
+
+
+def open_text(path: Path | str) -> IO[str]:
+    """Open a UTF-8 file for reading, transparently un-gzipping it."""
+    with open(path, "rb") as probe:
+        compressed = probe.read(2) == GZIP_MAGIC
+    if compressed:
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+class _Reader:
+    """A text buffer that refills from ``handle`` on demand."""
+
+    def __init__(self, handle: IO[str], read_size: int) -> None:
+        self.handle = handle
+        self.read_size = read_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.handle.read(self.read_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r}, found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number is only complete once a non-number character follows
+            # it; "12" at the buffer edge may really be "12.5e3".
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                tail = end
+                while tail < len(self.buffer) and self.buffer[tail] in NUMBER_CHARS:
+                    tail += 1
+                if tail == len(self.buffer) and self.fill():
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_object_items(
+    handle: IO[str],
+    stream_keys: tuple[str, ...],
+    read_size: int = DEFAULT_READ_SIZE,
+) -> Iterator[tuple[str, Any]]:
+    """Yield ``(key, value)`` pairs of a top-level JSON object.
+
+    Arrays under ``stream_keys`` are not materialized: each element is yielded
+    as its own ``(key, element)`` pair. Other members are yielded whole.
+    """
+    reader = _Reader(handle, read_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key in stream_keys and reader.peek() == "[":
+            reader.pos += 1
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield key, reader.value()
+                    if reader.peek() == ",":
+                        reader.pos += 1
+                        continue
+                    reader.expect("]")
+                    break
+        else:
+            yield key, reader.value()
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("}")
+        return
+
+
+def iter_json_lines(handle: IO[str]) -> Iterator[Any]:
+    """Yield one decoded value per non-blank line."""
+    for line in handle:
+        if line.strip():
+            yield json.loads(line)
+
+
+__all__ = ["iter_json_lines", "iter_object_items", "open_text"]
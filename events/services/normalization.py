@@ -0,0 +1,150 @@
+"""Payload normalization stage, optionally fanned out to worker processes.
+
+This module deliberately avoids Django imports so worker processes can load it
+without configuring settings or opening database connections.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, Mapping
+
+from .clients.multi_source_client import PROVIDER_KEY
+from .sanitation import (
+    normalize_apify_facebook_item,
+    normalize_city,
+    normalize_cse_item,
+    normalize_places_item,
+)
+
+DEFAULT_NORMALIZE_BATCH = 256
+LIST_KEYS = ("results", "items")
+
+
+def iter_normalized(payload: Mapping[str, object]) -> Iterable[Mapping[str, object]]:
+    """Yield normalized dictionaries from a payload chunk.
+
+    A ``provider`` tag added by ``MultiSourceClient`` is copied onto each row.
+    """
+    rows = _iter_rows(payload)
+    provider = payload.get(PROVIDER_KEY)
+    if provider is None:
+        return rows
+    return ({**row, PROVIDER_KEY: provider} for row in rows)
+
+
+def _iter_rows(payload: Mapping[str, object]) -> Iterable[Mapping[str, object]]:
+    if "results" in payload:
+        for item in payload["results"]:
+            yield normalize_places_item(item)
+    elif "items" in payload:
+        for item in payload["items"]:
+            yield normalize_cse_item(item)
+    elif "apify_raw_item" in payload:
+        fallback_city = payload.get("fallback_city")
+        normalized = normalize_apify_facebook_item(
+            payload["apify_raw_item"], fallback_city
+        )
+        requested = normalize_city(fallback_city) if fallback_city else ""
+        if requested and normalized["city"] and normalized["city"] != requested:
+            return
+        yield normalized
+
+
+def normalize_payloads(
+    payloads: list[Mapping[str, Any]],
+) -> list[list[Mapping[str, object]]]:
+    """Normalize a batch of payloads; runs inside pool workers."""
+    return [list(iter_normalized(payload)) for payload in payloads]
+
+
+def iter_normalized_parallel(
+    payloads: Iterable[Mapping[str, Any]],
+    workers: int = 1,
+    batch_size: int = DEFAULT_NORMALIZE_BATCH,
+) -> Iterator[Iterable[Mapping[str, object]]]:
+    """Yield the normalized rows of each payload, in input order.
+
+    With ``workers`` above one, payloads are grouped into batches of roughly
+    ``batch_size`` items and normalized on a process pool. Payloads carrying
+    large ``results``/``items`` lists are split so a single fixture file still
+    spreads across workers; the pieces are stitched back together before being
+    yielded. At most ``2 * workers`` batches are in flight at any time.
+    """
+    if workers <= 1:
+        for payload in payloads:
+            yield iter_normalized(payload)
+        return
+
+    piece_counts: deque[int] = deque()
+
+    def batches() -> Iterator[list[Mapping[str, Any]]]:
+        batch: list[Mapping[str, Any]] = []
+        size = 0
+        for payload in payloads:
+            pieces = _split_payload(payload, batch_size)
+            piece_counts.append(len(pieces))
+            for piece in pieces:
+                batch.append(piece)
+                size += _payload_size(piece)
+                if size >= batch_size:
+                    yield batch
+                    batch, size = [], 0
+        if batch:
+            yield batch
+
+    current: list[Mapping[str, object]] = []
+    remaining = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for piece_rows in _iter_results(executor, batches(), workers * 2):
+            if not remaining:
+                remaining = piece_counts.popleft()
+            current.extend(piece_rows)
+            remaining -= 1
+            if not remaining:
+                yield current
+                current = []
+
+
+def _iter_results(
+    executor: ProcessPoolExecutor,
+    batches: Iterator[list[Mapping[str, Any]]],
+    max_pending: int,
+) -> Iterator[list[Mapping[str, object]]]:
+    pending: deque[Future] = deque()
+    for batch in batches:
+        pending.append(executor.submit(normalize_payloads, batch))
+        if len(pending) >= max_pending:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def _split_payload(payload: Mapping[str, Any], size: int) -> list[Mapping[str, Any]]:
+    for key in LIST_KEYS:
+        items = payload.get(key)
+        if isinstance(items, list) and len(items) > size:
+            return [
+                {**payload, key: items[start : start + size]}
+                for start in range(0, len(items), size)
+            ]
+        if key in payload:
+            break
+    return [payload]
+
+
+def _payload_size(payload: Mapping[str, Any]) -> int:
+    for key in LIST_KEYS:
+        if key in payload:
+            items = payload[key]
+            return len(items) if isinstance(items, list) else 1
+    return 1
+
+
+__all__ = [
+    "iter_normalized",
+    "iter_normalized_parallel",
+    "normalize_payloads",
+    "DEFAULT_NORMALIZE_BATCH",
+]
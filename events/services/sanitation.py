@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import json
+import os
 import re
 from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Mapping, MutableMapping
 from urllib.parse import urlparse, urlunparse
 
@@ -20,6 +24,86 @@ CITY_KEYWORDS = {
     "pta": "Pretoria",
     "tshwane": "Pretoria",
 }
+CITY_ALIASES_ENV = "CITY_ALIASES_PATH"
+CITY_CACHE_SIZE = 8192
+COORDINATE_DECIMALS = 6
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9 ]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class CityMatcher:
+    """Resolve free text to a canonical city via a keyword trie.
+
+    Keywords match as substrings of the lowercased text, and when several
+    match, the one registered first wins (as the old linear scan did). Each
+    lookup walks the trie from every offset, so its cost depends on the text
+    and the longest alias, not on how many aliases are registered.
+    """
+
+    _TERMINAL = ""
+
+    def __init__(self, aliases: Mapping[str, str]) -> None:
+        self.aliases = dict(aliases)
+        self._root: dict[str, Any] = {}
+        for priority, (keyword, canonical) in enumerate(self.aliases.items()):
+            node = self._root
+            for char in _clean_city_text(keyword):
+                node = node.setdefault(char, {})
+            node.setdefault(self._TERMINAL, (priority, canonical))
+
+    def match(self, text: str) -> str | None:
+        best: tuple[int, str] | None = None
+        root = self._root
+        for start in range(len(text)):
+            node = root
+            for char in text[start:]:
+                node = node.get(char)
+                if node is None:
+                    break
+                found = node.get(self._TERMINAL)
+                if found and (best is None or found[0] < best[0]):
+                    best = found
+                    if not best[0]:
+                        return best[1]
+        return best[1] if best else None
+
+
+def load_city_aliases(path: str | Path) -> dict[str, str]:
+    """Read ``{"Canonical City": ["alias", ...]}`` from a JSON file."""
+    with Path(path).open("r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    aliases: dict[str, str] = {}
+    for canonical, keywords in data.items():
+        for keyword in [canonical, *keywords]:
+            aliases.setdefault(keyword.lower(), canonical)
+    return aliases
+
+
+def configure_city_aliases(
+    extra: Mapping[str, str] | None = None, path: str | Path | None = None
+) -> CityMatcher:
+    """Rebuild the city matcher from the defaults plus configured aliases.
+
+    Aliases are read from ``path`` or the ``CITY_ALIASES_PATH`` environment
+    variable, then ``extra``. The built-in keywords keep priority on overlap.
+    """
+    global _city_matcher
+    aliases = dict(CITY_KEYWORDS)
+    path = path or os.getenv(CITY_ALIASES_ENV)
+    for source in (load_city_aliases(path) if path else {}, extra or {}):
+        for keyword, canonical in source.items():
+            aliases.setdefault(keyword.lower(), canonical)
+    _city_matcher = CityMatcher(aliases)
+    _resolve_city.cache_clear()
+    return _city_matcher
+
+
+def get_city_matcher() -> CityMatcher:
+    return _city_matcher or configure_city_aliases()
+
+
+_city_matcher: CityMatcher | None = None
 
 
 def normalize_places_item(raw: Mapping[str, Any]) -> dict[str, Any]:
@@ -34,6 +118,8 @@ def normalize_places_item(raw: Mapping[str, Any]) -> dict[str, Any]:
         "source": raw.get("source", "google_places"),
         "raw_payload": dict(raw),
     }
+    location = (raw.get("geometry") or {}).get("location") or {}
+    metadata.update(parse_coordinates(location.get("lat"), location.get("lng")))
     return metadata
 
 
@@ -50,6 +136,12 @@ def normalize_cse_item(raw: Mapping[str, Any]) -> dict[str, Any]:
         "source": raw.get("source", "google_cse"),
         "raw_payload": dict(raw),
     }
+    metadata.update(
+        parse_coordinates(
+            metatag.get("place:location:latitude"),
+            metatag.get("place:location:longitude"),
+        )
+    )
     return metadata
 
 
@@ -64,13 +156,21 @@ def extract_metatag(raw: Mapping[str, Any]) -> MutableMapping[str, Any]:
 def normalize_city(value: Any) -> str:
     if not value or not isinstance(value, str):
         return ""
-    cleaned = re.sub(r"[^a-z0-9 ]+", " ", value.lower())
-    for keyword, canonical in CITY_KEYWORDS.items():
-        if keyword in cleaned:
-            return canonical
+    return _resolve_city(value)
+
+
+@lru_cache(maxsize=CITY_CACHE_SIZE)
+def _resolve_city(value: str) -> str:
+    canonical = get_city_matcher().match(_clean_city_text(value))
+    if canonical:
+        return canonical
     return " ".join(part.capitalize() for part in value.strip().split())
 
 
+def _clean_city_text(value: str) -> str:
+    return _NON_ALNUM_RE.sub(" ", value.lower())
+
+
 def parse_datetime(value: Any) -> datetime | None:
     if not value or not isinstance(value, str):
         return None
@@ -83,10 +183,30 @@ def parse_datetime(value: Any) -> datetime | None:
     return dt.astimezone(timezone.utc)
 
 
+def parse_coordinates(latitude: Any, longitude: Any) -> dict[str, float | None]:
+    """Return ``latitude``/``longitude`` keys, both ``None`` unless valid.
+
+    Numeric strings are accepted. Values are rounded to six decimals
+    (~0.1 m), and ``(0, 0)``, a common placeholder for a missing location,
+    is treated as missing.
+    """
+    missing = {"latitude": None, "longitude": None}
+    if isinstance(latitude, bool) or isinstance(longitude, bool):
+        return missing
+    try:
+        lat = round(float(latitude), COORDINATE_DECIMALS)
+        lng = round(float(longitude), COORDINATE_DECIMALS)
+    except (TypeError, ValueError):
+        return missing
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0) or lat == lng == 0.0:
+        return missing
+    return {"latitude": lat, "longitude": lng}
+
+
 def clean_title(value: Any) -> str:
     if not value or not isinstance(value, str):
         return ""
-    compact = re.sub(r"\s+", " ", value).strip()
+    compact = _WHITESPACE_RE.sub(" ", value).strip()
     return compact
 
 
@@ -136,6 +256,9 @@ def normalize_apify_facebook_item(
         "source": "apify_facebook_events",
         "raw_payload": dict(raw),
     }
+    metadata.update(
+        parse_coordinates(location.get("latitude"), location.get("longitude"))
+    )
     return metadata
 
 
@@ -153,7 +276,11 @@ __all__ = [
     "normalize_cse_item",
     "normalize_apify_facebook_item",
     "normalize_city",
+    "configure_city_aliases",
+    "load_city_aliases",
+    "CityMatcher",
     "infer_city",
     "clean_title",
     "normalize_url",
+    "parse_coordinates",
 ]
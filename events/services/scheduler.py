@@ -0,0 +1,285 @@
+"""Interval scheduling of ``IngestionJob`` rows for the ingestion worker.
+
+The worker polls for due jobs, claims each one by setting a lease with a
+conditional ``UPDATE`` (so two workers never run the same job) and runs it
+on a bounded thread pool. A heartbeat thread renews the lease while the
+job runs, and every committed chunk checks it: a run whose lease was taken
+over stops at its next chunk. The lease of a worker that died expires and
+the job becomes due again.
+After a run the job is rescheduled: its interval on success, an
+exponential backoff capped at ``MAX_BACKOFF`` on failure, both with
+``JITTER`` so jobs started together drift apart.
+
+Provider clients are built once per (provider, city) and reused between
+runs, and pool threads keep their database connections open.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import socket
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import timedelta
+from typing import Callable, Collection
+
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from django.utils import timezone
+
+from events.models import IngestionJob
+
+from .clients.base import BaseEventClient
+from .clients.registry import build_client
+from .ingestion import DEFAULT_BATCH_SIZE, IngestionReport, ingest_with_report
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 2
+POLL_INTERVAL = 5.0
+LEASE_DURATION = timedelta(minutes=15)
+JITTER = 0.1
+BACKOFF_BASE = timedelta(seconds=30)
+MAX_BACKOFF = timedelta(hours=1)
+
+FinishCallback = Callable[[IngestionJob, "IngestionReport | None"], None]
+
+
+def next_delay(job: IngestionJob, succeeded: bool, rng: random.Random) -> timedelta:
+    """Time until the next run of ``job``, whose ``failures`` is up to date."""
+    if succeeded:
+        delay = timedelta(seconds=job.interval)
+    else:
+        # The exponent is capped well past MAX_BACKOFF to avoid overflows.
+        delay = min(MAX_BACKOFF, BACKOFF_BASE * 2 ** min(job.failures - 1, 16))
+    return delay * (1 + rng.uniform(-JITTER, JITTER))
+
+
+class LeaseLost(Exception):
+    """Another worker took over the lease of a running job."""
+
+
+class LeaseHeartbeat(threading.Thread):
+    """Renews a job's lease three times per lease duration while it runs."""
+
+    def __init__(self, worker: IngestionWorker, job: IngestionJob) -> None:
+        super().__init__(name=f"ingestion-lease-{job.pk}", daemon=True)
+        self.worker = worker
+        self.job = job
+        self.stopped = threading.Event()
+        self.lost = threading.Event()
+
+    def run(self) -> None:
+        interval = self.worker.lease.total_seconds() / 3
+        try:
+            while not self.stopped.wait(interval):
+                if not self.beat():
+                    return
+        finally:
+            connection.close()
+
+    def beat(self) -> bool:
+        """Renew the lease once; False once it belongs to another worker."""
+        try:
+            renewed = self.worker.renew_lease(self.job)
+        except DatabaseError:
+            # E.g. SQLite busy with the job's own writes; retried next beat.
+            logger.warning("Could not renew the lease of %s", self.job, exc_info=True)
+            return True
+        if not renewed:
+            self.lost.set()
+        return renewed
+
+    def check(self, report: IngestionReport | None = None) -> None:
+        """``progress`` callback: renew, and stop the run if the lease is gone."""
+        if self.lost.is_set() or not self.beat():
+            raise LeaseLost(f"The lease of {self.job} was taken over.")
+
+
+class IngestionWorker:
+    """Runs due ``IngestionJob`` rows, at most ``concurrency`` at a time."""
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        poll_interval: float = POLL_INTERVAL,
+        lease: timedelta = LEASE_DURATION,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        client_factory: Callable[..., BaseEventClient] = build_client,
+        on_finish: FinishCallback | None = None,
+        owner: str | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be a positive integer.")
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.batch_size = batch_size
+        self.client_factory = client_factory
+        self.on_finish = on_finish
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.rng = rng or random.Random()
+        self.clients: dict[tuple[str, str], BaseEventClient] = {}
+        self._clients_lock = threading.Lock()
+        self._running: dict[int, Future] = {}
+
+    def run(self, stop: threading.Event, once: bool = False) -> None:
+        """Schedule jobs until ``stop`` is set; running jobs are finished.
+
+        With ``once`` every job due now runs a single time, then this returns.
+        """
+        executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="ingestion-job"
+        )
+        done: set[int] = set()
+        try:
+            while not stop.is_set():
+                self._reap()
+                free = self.concurrency - len(self._running)
+                if free:
+                    for job in self.claim_due_jobs(free, exclude=done):
+                        self._running[job.pk] = executor.submit(self.run_job, job)
+                        if once:
+                            done.add(job.pk)
+                if not once:
+                    stop.wait(self.poll_interval)
+                elif self._running:
+                    wait(self._running.values(), return_when=FIRST_COMPLETED)
+                else:
+                    return
+        finally:
+            executor.shutdown(wait=True)
+            self._reap()
+
+    def claim_due_jobs(
+        self, limit: int, exclude: Collection[int] = ()
+    ) -> list[IngestionJob]:
+        """Lease up to ``limit`` due jobs to this worker and return them."""
+        now = timezone.now()
+        free = Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now)
+        candidates = (
+            IngestionJob.objects.filter(free, enabled=True, next_run_at__lte=now)
+            .exclude(pk__in=[*self._running, *exclude])
+            .order_by("next_run_at")
+            .values_list("pk", flat=True)[:limit]
+        )
+        claimed = [
+            pk
+            for pk in candidates
+            # Another worker may have claimed the job since it was read.
+            if IngestionJob.objects.filter(free, pk=pk).update(
+                lease_owner=self.owner,
+                lease_expires_at=now + self.lease,
+                last_started_at=now,
+            )
+        ]
+        return list(IngestionJob.objects.filter(pk__in=claimed).order_by("next_run_at"))
+
+    def run_job(self, job: IngestionJob) -> IngestionReport | None:
+        """Ingest ``job`` once and reschedule it; returns the run's report."""
+        _drop_broken_connection()
+        report, error = None, ""
+        heartbeat = LeaseHeartbeat(self, job)
+        heartbeat.start()
+        try:
+            client = self._client(job)
+            report = ingest_with_report(
+                client,
+                allowed_cities=[job.city] if job.city else None,
+                batch_size=self.batch_size,
+                stream=True,
+                progress=heartbeat.check,
+                # Only runs that were interrupted leave a checkpoint to resume.
+                resume=client.supports_resume,
+            )
+            heartbeat.check()
+            if not client.fetch_complete():
+                error = f"{client.provider_name} did not fetch everything."
+        except LeaseLost as exc:
+            logger.warning("Ingestion job %s stopped: %s", job, exc)
+            error = str(exc)
+        except Exception as exc:
+            logger.exception("Ingestion job %s failed", job)
+            error = f"{type(exc).__name__}: {exc}"
+            with self._clients_lock:
+                self.clients.pop((job.provider, job.city), None)
+        finally:
+            heartbeat.stopped.set()
+            heartbeat.join()
+        self._finish(job, report, error)
+        if self.on_finish is not None:
+            self.on_finish(job, report)
+        return report
+
+    def _client(self, job: IngestionJob) -> BaseEventClient:
+        key = (job.provider, job.city)
+        with self._clients_lock:
+            client = self.clients.get(key)
+            if client is None:
+                client = self.client_factory(
+                    job.provider, [job.city] if job.city else None
+                )
+                self.clients[key] = client
+            return client
+
+    def renew_lease(self, job: IngestionJob) -> bool:
+        """Extend this worker's lease on ``job``; False if it holds none."""
+        renewed = IngestionJob.objects.filter(pk=job.pk, lease_owner=self.owner).update(
+            lease_expires_at=timezone.now() + self.lease
+        )
+        return bool(renewed)
+
+    def _finish(
+        self, job: IngestionJob, report: IngestionReport | None, error: str
+    ) -> None:
+        now = timezone.now()
+        job.failures = job.failures + 1 if error else 0
+        job.last_status = IngestionJob.FAILED if error else IngestionJob.SUCCEEDED
+        job.last_error = error
+        job.last_report = report.as_dict() if report else None
+        job.last_finished_at = now
+        job.next_run_at = now + next_delay(job, not error, self.rng)
+        job.lease_owner, job.lease_expires_at = "", None
+        fields = (
+            "failures",
+            "last_status",
+            "last_error",
+            "last_report",
+            "last_finished_at",
+            "next_run_at",
+            "lease_owner",
+            "lease_expires_at",
+        )
+        # A lease that expired and was taken over belongs to the new run.
+        finished = IngestionJob.objects.filter(
+            pk=job.pk, lease_owner=self.owner
+        ).update(**{name: getattr(job, name) for name in fields})
+        if not finished:
+            logger.warning(
+                "Ingestion job %s lost its lease; this run's result was not saved.",
+                job,
+            )
+
+    def _reap(self) -> None:
+        for pk, future in list(self._running.items()):
+            if future.done():
+                del self._running[pk]
+                exc = future.exception()
+                if exc is not None:
+                    logger.error("Ingestion job %s crashed", pk, exc_info=exc)
+
+
+def _drop_broken_connection() -> None:
+    """Close this thread's connection only if it stopped working.
+
+    Unlike ``close_old_connections`` this ignores ``CONN_MAX_AGE``, so the
+    connection stays warm between runs.
+    """
+    if connection.connection is not None and not connection.is_usable():
+        connection.close()
+
+
+__all__ = ["IngestionWorker", "LeaseHeartbeat", "LeaseLost", "next_delay"]
@@ -1,3 +1,1415 @@
-from django.test import TestCase
+import base64
+import gzip
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.http import QueryDict
+from django.test import (
+    AsyncRequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from . import async_views
+from .cache import bump_generation
+from .dedupe import link_duplicates, relink_all
+from .facets import FacetTracker, rebuild_facets
+from .geo import KM_PER_DEGREE, covering_cells, encode_geohash
+from .models import (
+    Event,
+    EventFacet,
+    EventPayload,
+    IngestionCheckpoint,
+    IngestionJob,
+)
+from .pagination import KeysetPosition, keyset_segments
+from .payloads import compress_existing, inline_existing
+from .renderers import render_json
+from .serializers import (
+    DEFAULT_LIST_FIELDS,
+    EVENT_FIELDS,
+    EventSerializer,
+    parse_field_selection,
+)
+from .services.checkpoints import CheckpointTracker, checkpoint_key
+from .services.clients.apify_facebook_client import ApifyFacebookClient
+from .services.clients.base import BaseEventClient
+from .services.clients.cached_client import CachedEventClient
+from .services.clients.fixture_client import FixtureEventClient
+from .services.clients.multi_source_client import PROVIDER_KEY, MultiSourceClient
+from .services.ingestion import (
+    CREATED,
+    SAMPLE_SIZE,
+    UNCHANGED,
+    UPDATED,
+    IngestionReport,
+    _write_chunk,
+    bulk_upsert_events,
+    ingest_with_report,
+    upsert_event,
+)
+from .services.instrumentation import SLOWEST_LIMIT, STAGES
+from .services.json_stream import _Reader, iter_object_items, open_text
+from .services.normalization import iter_normalized, iter_normalized_parallel
+from .services.sanitation import (
+    CITY_ALIASES_ENV,
+    CITY_KEYWORDS,
+    CityMatcher,
+    _resolve_city,
+    configure_city_aliases,
+    normalize_city,
+)
+from .services.scheduler import IngestionWorker
+from .views import filter_events
+
+PLAN_QUERIES = [
+    "",
+    "city=Johannesburg",
+    "city=Johannesburg&upcoming=true",
+    "city=Pretoria&start_after=2025-01-01&start_before=2025-02-01",
+    "start_after=2025-01-01T18:00:00Z",
+    "upcoming=true&start_before=2030-01-01",
+]
+PLAN_POSITIONS = [
+    None,
+    KeysetPosition(datetime(2025, 1, 15, tzinfo=UTC), "M", 5),
+    KeysetPosition(None, "M", 5),
+]
+
+
+DUMMY_CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+@override_settings(CACHES=DUMMY_CACHES)
+class UncachedTestCase(TestCase):
+    """Requests see every write at once instead of a cached page."""
+
+
+def make_event(title, start_date, city="Johannesburg", latitude=None, longitude=None):
+    return Event.objects.create(
+        title=title,
+        start_date=start_date,
+        city=city,
+        latitude=latitude,
+        longitude=longitude,
+        source="fixtures",
+        event_url=f"https://example.com/{title}",
+        raw_payload={},
+    )
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "events-api-tests",
+        }
+    }
+)
+class EventListCacheTests(TestCase):
+    url = "/api/events?city=johannesburg"
+
+    def setUp(self):
+        cache.clear()
+        self.event = make_event("Jazz Night", timezone.now())
+
+    def titles(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [row["title"] for row in response.json()["results"]]
+
+    def test_pages_are_cached_until_the_generation_moves(self):
+        first = self.client.get(self.url)
+        Event.objects.update(title="Book Fair")
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(self.url)
+        self.assertEqual(cached.content, first.content)
+        self.assertEqual(cached["ETag"], first["ETag"])
+        for query in queries:
+            self.assertNotIn('"events_event"', query["sql"])
+
+        bump_generation()
+        fresh = self.client.get(self.url)
+        self.assertEqual(self.titles(fresh), ["Book Fair"])
+        self.assertNotEqual(fresh["ETag"], first["ETag"])
+
+    def test_ingestion_commits_invalidate_pages(self):
+        self.assertEqual(self.titles(self.client.get(self.url)), ["Jazz Night"])
+        ingest_with_report(FixtureEventClient(), stream=True)
+        self.assertGreater(len(self.titles(self.client.get(self.url))), 1)
+
+    def test_matching_validators_get_not_modified(self):
+        bump_generation()
+        response = self.client.get(self.url)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        for headers in (
+            {"HTTP_IF_NONE_MATCH": response["ETag"]},
+            {"HTTP_IF_MODIFIED_SINCE": response["Last-Modified"]},
+        ):
+            with self.subTest(headers=headers):
+                not_modified = self.client.get(self.url, **headers)
+                self.assertEqual(not_modified.status_code, 304)
+                self.assertEqual(not_modified.content, b"")
+        stale = self.client.get(self.url, HTTP_IF_NONE_MATCH='"0-stale"')
+        self.assertEqual(stale.status_code, 200)
+
+    async def test_async_view_shares_validators(self):
+        response = await sync_to_async(self.client.get)(self.url)
+        request = AsyncRequestFactory().get(
+            self.url, headers={"If-None-Match": response["ETag"]}
+        )
+        not_modified = await async_views.event_list(request)
+        self.assertEqual(not_modified.status_code, 304)
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class EventListQueryPlanTests(TestCase):
+    """Every list page must be an index range walk, never a scan or a sort."""
+
+    def assert_indexed(self, queryset):
+        plan = queryset.explain()
+        for line in plan.splitlines():
+            detail = line.split(" ", 3)[-1]
+            self.assertNotEqual(detail, "SCAN events_event", plan)
+            self.assertNotIn("TEMP B-TREE", detail, plan)
+        self.assertIn("USING", plan)
+
+    def test_list_pages_use_indexes(self):
+        for query in PLAN_QUERIES:
+            queryset = filter_events(QueryDict(query))
+            for values in ((), ("id", "title", "start_date")):
+                for position in PLAN_POSITIONS:
+                    for segment in keyset_segments(queryset.values(*values), position):
+                        with self.subTest(query=query, position=position):
+                            self.assert_indexed(segment[:11])
+
+    def test_page_number_pages_use_indexes(self):
+        for query in PLAN_QUERIES:
+            with self.subTest(query=query):
+                self.assert_indexed(filter_events(QueryDict(query))[10:20])
+
+    def test_date_bounds_skip_undated_segment(self):
+        queryset = filter_events(QueryDict("city=Johannesburg&upcoming=true"))
+        self.assertEqual(len(keyset_segments(queryset, None)), 1)
+        self.assertEqual(len(keyset_segments(filter_events(QueryDict()), None)), 2)
+
+
+@override_settings(TIME_ZONE="Africa/Johannesburg")
+class EventRenderingTests(UncachedTestCase):
+    def setUp(self):
+        start = datetime(2030, 5, 1, 18, 30, 15, 250000, tzinfo=UTC)
+        make_event("Café Noir — Soirée 夜", start)
+        make_event("Line\u2028and\u2029paragraph", start + timedelta(days=1))
+        Event.objects.create(
+            title="Undated",
+            start_date=None,
+            city="Johannesburg",
+            event_url=None,
+            source="fixtures",
+            raw_payload={"price": 12.5, "tags": ["ünïcode", None]},
+        )
+
+    def drf_rows(self, fields):
+        events = Event.objects.order_by("id")
+        data = EventSerializer(events, many=True, fields=fields).data
+        return json.loads(JSONRenderer().render(data))
+
+    def api_rows(self, query):
+        response = self.client.get(f"/api/events?page=1&{query}")
+        self.assertEqual(response.status_code, 200)
+        return sorted(response.json()["results"], key=lambda row: row["id"])
+
+    def test_fast_path_matches_event_serializer(self):
+        self.assertEqual(
+            self.api_rows(""),
+            self.drf_rows(parse_field_selection(QueryDict())),
+        )
+        self.assertEqual(
+            self.api_rows("expand=latitude,longitude,raw_payload"),
+            self.drf_rows(EVENT_FIELDS),
+        )
+        rows = self.api_rows("fields=id,start_date,event_url")
+        self.assertEqual(rows, self.drf_rows(("id", "start_date", "event_url")))
+        self.assertEqual(rows[0]["start_date"], "2030-05-01T20:30:15.250000+02:00")
+        self.assertIsNone(rows[2]["start_date"])
+        self.assertIsNone(rows[2]["event_url"])
+
+    def test_line_separators_are_escaped(self):
+        response = self.client.get("/api/events?page=1&fields=title")
+        self.assertIn(b"Line\\u2028and\\u2029paragraph", response.content)
+        self.assertNotIn("\u2028".encode(), response.content)
+        self.assertNotIn("\u2029".encode(), response.content)
+        self.assertIn("Café Noir — Soirée 夜".encode(), response.content)
+
+        data = {"text": "a\u2028b\u2029c", "none": None}
+        self.assertEqual(render_json(data, fast=True), JSONRenderer().render(data))
+
+
+class EventFieldSelectionTests(UncachedTestCase):
+    def setUp(self):
+        start = timezone.now() + timedelta(days=1)
+        for index, title in enumerate(("Alpha", "Bravo", "Charlie")):
+            make_event(
+                title, start + timedelta(hours=index), latitude=-26.2, longitude=28.0
+            )
+
+    def keys(self, query):
+        response = self.client.get(f"/api/events?{query}")
+        self.assertEqual(response.status_code, 200)
+        return [list(row) for row in response.json()["results"]]
+
+    def test_default_columns_leave_out_expandable_fields(self):
+        self.assertEqual(self.keys(""), [list(DEFAULT_LIST_FIELDS)] * 3)
+        self.assertNotIn("raw_payload", DEFAULT_LIST_FIELDS)
+
+    def test_fields_and_expand_select_columns_in_model_order(self):
+        self.assertEqual(self.keys("fields=title,id"), [["id", "title"]] * 3)
+        self.assertEqual(
+            self.keys("expand=longitude,latitude"),
+            [[name for name in EVENT_FIELDS if name != "raw_payload"]] * 3,
+        )
+        response = self.client.get("/api/events?fields=id&expand=raw_payload")
+        self.assertEqual(
+            response.json()["results"][0],
+            {"id": Event.objects.get(title="Charlie").pk, "raw_payload": {}},
+        )
+
+    def test_cursor_pages_work_without_the_sort_columns(self):
+        titles, url = [], "/api/events?fields=id&page_size=2"
+        while url:
+            body = self.client.get(url).json()
+            self.assertEqual(
+                [list(row) for row in body["results"]], [["id"]] * len(body["results"])
+            )
+            titles += [Event.objects.get(pk=row["id"]).title for row in body["results"]]
+            url = body["next"]
+        self.assertEqual(titles, ["Charlie", "Bravo", "Alpha"])
+
+    def test_unknown_fields_are_rejected(self):
+        for query, unknown in (
+            ("fields=id,secret", "secret"),
+            ("expand=title", "title"),
+            ("fields=nope&expand=city", "city, nope"),
+        ):
+            with self.subTest(query=query):
+                response = self.client.get(f"/api/events?{query}")
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(
+                    response.json(), {"fields": f"Unknown field(s): {unknown}"}
+                )
+
+    async def test_async_view_selects_the_same_fields(self):
+        for query in ("", "fields=title,id", "expand=raw_payload", "fields=secret"):
+            url = f"/api/events?{query}"
+            request = AsyncRequestFactory().get(url, SERVER_NAME="testserver")
+            response = await async_views.event_list(request)
+            expected = await sync_to_async(self.client.get)(url)
+            with self.subTest(query=query):
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(json.loads(response.content), expected.json())
+
+
+class EventDateFilterTests(UncachedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.past = make_event("Past", now - timedelta(days=2))
+        cls.soon = make_event("Soon", now + timedelta(days=2))
+        cls.later = make_event("Later", now + timedelta(days=20))
+        cls.undated = make_event("Undated", None)
+        cls.elsewhere = make_event("Elsewhere", now + timedelta(days=2), "Pretoria")
+
+    def titles(self, query):
+        response = self.client.get(f"/api/events?{query}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["title"] for row in response.json()["results"]]
+
+    def test_upcoming_excludes_past_and_undated(self):
+        self.assertEqual(
+            self.titles("city=johannesburg&upcoming=true"), ["Later", "Soon"]
+        )
+
+    def test_start_range(self):
+        after = (self.soon.start_date - timedelta(hours=1)).isoformat()
+        before = (self.soon.start_date + timedelta(days=1)).date().isoformat()
+        query = QueryDict(mutable=True)
+        query.update({"start_after": after, "start_before": before})
+        self.assertEqual(self.titles(query.urlencode()), ["Elsewhere", "Soon"])
+
+    def test_cursor_walk_keeps_undated_last(self):
+        titles, url = [], "/api/events?page_size=2"
+        while url:
+            body = self.client.get(url).json()
+            titles += [row["title"] for row in body["results"]]
+            url = body["next"]
+        self.assertEqual(titles, ["Later", "Elsewhere", "Soon", "Past", "Undated"])
+
+    async def test_async_cursor_walk_matches_sync(self):
+        titles, url = [], "/api/events?page_size=2"
+        while url:
+            request = AsyncRequestFactory().get(url, SERVER_NAME="testserver")
+            body = json.loads((await async_views.event_list(request)).content)
+            titles += [row["title"] for row in body["results"]]
+            url = body["next"]
+        self.assertEqual(titles, ["Later", "Elsewhere", "Soon", "Past", "Undated"])
+
+    async def test_malformed_cursors_are_not_found(self):
+        for raw in ("", "[1,", '[1,"a",1]', '[[1],"a",1]', '["soon","a",1]', "[]"):
+            token = base64.urlsafe_b64encode(raw.encode()).decode()
+            url = f"/api/events?cursor={token or '%25'}"
+            request = AsyncRequestFactory().get(url)
+            for response in (
+                await self.async_client.get(url),
+                await async_views.event_list(request),
+            ):
+                with self.subTest(cursor=raw, view=response.__class__.__name__):
+                    self.assertEqual(response.status_code, 404)
+                    body = json.loads(response.content)
+                    self.assertEqual(body, {"detail": "Invalid cursor"})
+
+    def test_invalid_bounds_are_rejected(self):
+        for query in ("start_after=soon", "start_before=2025-13-01", "upcoming=maybe"):
+            with self.subTest(query=query):
+                response = self.client.get(f"/api/events?{query}")
+                self.assertEqual(response.status_code, 400)
+
+
+class EventNearFilterTests(UncachedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        start = timezone.now()
+        # Sandton is ~10 km north of Johannesburg's centre, Pretoria ~55 km.
+        make_event("Centre", start, latitude=-26.2041, longitude=28.0473)
+        make_event("Sandton", start, latitude=-26.1076, longitude=28.0567)
+        make_event("Pretoria", start, "Pretoria", -25.7479, 28.2293)
+        make_event("Unlocated", start)
+
+    def titles(self, query):
+        response = self.client.get(f"/api/events?{query}&expand=latitude")
+        self.assertEqual(response.status_code, 200, response.content)
+        return sorted(row["title"] for row in response.json()["results"])
+
+    def test_radius(self):
+        self.assertEqual(self.titles("near=-26.2041,28.0473&radius_km=5"), ["Centre"])
+        self.assertEqual(
+            self.titles("near=-26.2041,28.0473&radius_km=12"), ["Centre", "Sandton"]
+        )
+        self.assertEqual(
+            self.titles("near=-26.2041,28.0473&radius_km=60"),
+            ["Centre", "Pretoria", "Sandton"],
+        )
+
+    def test_cells_cover_the_circle(self):
+        radius_km = 3
+        for latitude, longitude in ((-26.2, 28.04), (51.4779, 0.0), (0.0, 179.99)):
+            cells = covering_cells(latitude, longitude, radius_km)
+            for bearing in range(0, 360, 15):
+                north = math.cos(math.radians(bearing)) * radius_km / KM_PER_DEGREE
+                east = math.sin(math.radians(bearing)) * radius_km / KM_PER_DEGREE
+                point_lat = latitude + north
+                point_lng = longitude + east / math.cos(math.radians(point_lat))
+                point_lng = (point_lng + 180.0) % 360.0 - 180.0
+                geohash = encode_geohash(point_lat, point_lng)
+                with self.subTest(latitude=latitude, bearing=bearing):
+                    self.assertTrue(any(geohash.startswith(cell) for cell in cells))
+
+    def test_invalid_near_is_rejected(self):
+        for query in (
+            "near=91,0",
+            "near=1",
+            "near=1,2&radius_km=0",
+            "near=1,2&radius_km=500",
+        ):
+            with self.subTest(query=query):
+                response = self.client.get(f"/api/events?{query}")
+                self.assertEqual(response.status_code, 400)
+
+
+class EventDuplicateTests(UncachedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        start = timezone.now() + timedelta(days=3)
+        cls.original = make_event("The Jazz Night at Newtown", start)
+        cls.copy = make_event("Newtown Jazz Night", start + timedelta(hours=1))
+        cls.copy.source = "google_cse"
+        cls.copy.save()
+        cls.other = make_event("Newtown Comedy Night", start)
+        cls.other.source = "google_places"
+        cls.other.save()
+
+    def test_link_duplicates(self):
+        self.assertEqual(link_duplicates([self.copy, self.other]), 1)
+        self.copy.refresh_from_db()
+        self.assertEqual(self.copy.canonical, self.original)
+        response = self.client.get("/api/events")
+        titles = sorted(row["title"] for row in response.json()["results"])
+        self.assertEqual(titles, ["Newtown Comedy Night", "The Jazz Night at Newtown"])
+
+    def test_relink_all_matches_incremental_links(self):
+        link_duplicates([self.copy, self.other])
+        self.assertEqual(relink_all(), (1, 0))
+        Event.objects.update(canonical=None)
+        self.assertEqual(relink_all(), (1, 1))
+        self.assertEqual(
+            list(Event.objects.filter(canonical__isnull=False)), [self.copy]
+        )
+
+    def test_duplicates_of_a_retitled_event_are_relinked(self):
+        link_duplicates([self.copy])
+        self.original.title = "Soweto Food Market"
+        self.original.save()
+        self.assertEqual(link_duplicates([self.original]), 0)
+        self.copy.refresh_from_db()
+        self.assertIsNone(self.copy.canonical_id)
+
+    def test_duplicates_follow_their_canonical_event(self):
+        link_duplicates([self.copy])
+        older = make_event("Jazz Night Newtown", self.original.start_date)
+        # Older than the original, as if it had been stored first.
+        Event.objects.filter(pk=older.pk).update(id=0, source="google_places")
+        self.assertEqual(link_duplicates([self.original]), 1)
+        self.copy.refresh_from_db()
+        self.assertEqual(self.copy.canonical_id, 0)
+
+    def test_undated_rows_lose_their_link(self):
+        link_duplicates([self.copy])
+        self.copy.start_date = None
+        self.copy.save()
+        self.assertEqual(link_duplicates([self.copy]), 0)
+        self.assertIsNone(self.copy.canonical_id)
+        self.assertFalse(Event.objects.filter(canonical__isnull=False).exists())
+
+
+def normalized_row(title, category, source, start_date):
+    return {
+        "title": title,
+        "start_date": start_date,
+        "venue_name": "",
+        "city": "Johannesburg",
+        "category": category,
+        "event_url": f"https://{source}.example.com/{title}",
+        "source": source,
+        "raw_payload": {},
+    }
+
+
+class EventFacetTests(UncachedTestCase):
+    start = datetime(2025, 3, 14, 18, tzinfo=UTC)
+
+    def write(self, *rows):
+        facets = FacetTracker()
+        events = [event for event, _ in bulk_upsert_events(rows, facets)]
+        link_duplicates(events, facets)
+        facets.apply()
+
+    def facet_rows(self):
+        rows = EventFacet.objects.values_list("category", "source", "month", "count")
+        return sorted(rows)
+
+    def assert_counts(self, expected):
+        self.assertEqual(self.facet_rows(), expected)
+        rebuild_facets()
+        self.assertEqual(self.facet_rows(), expected)
+
+    def test_writes_move_counts(self):
+        self.write(normalized_row("Jazz Night", "Music", "google_places", self.start))
+        self.write(normalized_row("Jazz Night", "Music", "google_cse", self.start))
+        self.assert_counts([("Music", "google_places", "2025-03", 1)])
+        self.write(
+            normalized_row("Jazz Night", "Food", "google_places", self.start),
+            normalized_row("Book Fair", "", "google_cse", None),
+        )
+        self.assert_counts(
+            [("", "google_cse", "", 1), ("Food", "google_places", "2025-03", 1)]
+        )
+        self.write(normalized_row("Jazz Night", "Music", "google_cse", None))
+        self.assert_counts(
+            [
+                ("", "google_cse", "", 1),
+                ("Food", "google_places", "2025-03", 1),
+                ("Music", "google_cse", "", 1),
+            ]
+        )
+
+    def test_retitled_canonical_event_releases_its_duplicates(self):
+        original = normalized_row("Jazz Night", "Music", "google_places", self.start)
+        self.write(original)
+        self.write(normalized_row("Jazz Night", "Music", "google_cse", self.start))
+        self.assert_counts([("Music", "google_places", "2025-03", 1)])
+        self.write({**original, "title": "Book Fair"})
+        self.assert_counts(
+            [
+                ("Music", "google_cse", "2025-03", 1),
+                ("Music", "google_places", "2025-03", 1),
+            ]
+        )
+
+    def test_endpoint_reads_only_facets(self):
+        self.write(
+            normalized_row("Jazz Night", "Music", "google_places", self.start),
+            normalized_row("Book Fair", "Books", "google_places", self.start),
+            normalized_row("Food Market", "Food", "google_cse", None),
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/events/facets?source=google_places")
+        self.assertEqual(response.status_code, 200)
+        for query in queries:
+            self.assertNotIn('"events_event"', query["sql"])
+        body = response.json()
+        self.assertEqual(body["total"], 2)
+        self.assertEqual(
+            body["facets"]["category"],
+            [{"value": "Books", "count": 1}, {"value": "Music", "count": 1}],
+        )
+        self.assertEqual(body["facets"]["month"], [{"value": "2025-03", "count": 2}])
+
+
+class EventSearchTests(UncachedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        start = timezone.now()
+        # The "Jazz Night" titles rank equally, so only their ids order them.
+        for index, title in enumerate(
+            [
+                "Jazz Night Alpha",
+                "Jazz Jazz Jazz",
+                "Jazz Night Bravo",
+                "Comedy Night",
+                "Soweto Jazz Festival",
+                "Jazz Night Delta",
+                "Jazz Brunch",
+            ]
+        ):
+            make_event(title, start + timedelta(days=index) if index % 3 else None)
+
+    def walk(self, url):
+        titles, ids = [], []
+        while url:
+            body = self.client.get(url).json()
+            titles += [row["title"] for row in body["results"]]
+            ids += [row["id"] for row in body["results"]]
+            url = body["next"]
+        return titles, ids
+
+    def test_cursor_walk_follows_relevance_without_counting(self):
+        everything = self.client.get("/api/events?q=jazz&pagination=page&page_size=50")
+        expected = [row["id"] for row in everything.json()["results"]]
+        self.assertEqual(len(expected), 6)
+        with CaptureQueriesContext(connection) as queries:
+            _, ids = self.walk("/api/events?q=jazz&page_size=2")
+        self.assertEqual(ids, expected)
+        for query in queries.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"])
+            self.assertNotIn("OFFSET", query["sql"])
+
+    async def test_async_search_walk_matches_sync(self):
+        url = "/api/events?q=jazz&page_size=2"
+        expected = await sync_to_async(self.walk)(url)
+        titles = []
+        while url:
+            request = AsyncRequestFactory().get(url, SERVER_NAME="testserver")
+            body = json.loads((await async_views.event_list(request)).content)
+            titles += [row["title"] for row in body["results"]]
+            url = body["next"]
+        self.assertEqual(titles, expected[0])
+
+    def test_listing_cursors_do_not_page_searches(self):
+        body = self.client.get("/api/events?page_size=2").json()
+        token = body["next"].split("cursor=")[1]
+        response = self.client.get(f"/api/events?q=jazz&cursor={token}")
+        self.assertEqual(response.status_code, 404)
+
+
+class CityMatcherTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(configure_city_aliases)
+
+    def test_matches_like_a_linear_keyword_scan(self):
+        matcher = CityMatcher(CITY_KEYWORDS)
+        texts = [
+            "melville koppies",
+            "central pta",
+            "captain s table",  # "pta" inside a word still counts
+            "johannes",  # a keyword prefix alone is not a match
+            "pret",
+            "joburgh",
+            "soweto   jhb",
+            "cape town",
+            "",
+        ]
+        for text in texts:
+            expected = next(
+                (city for key, city in CITY_KEYWORDS.items() if key in text), None
+            )
+            with self.subTest(text=text):
+                self.assertEqual(matcher.match(text), expected)
+
+    def test_registration_order_beats_length(self):
+        aliases = {"port": "Port", "port elizabeth": "Gqeberha"}
+        self.assertEqual(CityMatcher(aliases).match("port elizabeth"), "Port")
+        reordered = dict(reversed(aliases.items()))
+        matcher = CityMatcher(reordered)
+        self.assertEqual(matcher.match("in port elizabeth"), "Gqeberha")
+        self.assertEqual(matcher.match("port nolloth"), "Port")
+
+    def test_aliases_load_from_the_configured_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "aliases.json"
+            path.write_text(
+                json.dumps({"Cape Town": ["cpt", "Kaapstad"], "Pretoria": ["jhb"]}),
+                encoding="utf-8",
+            )
+            with mock.patch.dict(os.environ, {CITY_ALIASES_ENV: str(path)}):
+                configure_city_aliases()
+        self.assertEqual(normalize_city("Kaapstad CBD"), "Cape Town")
+        self.assertEqual(normalize_city("CPT"), "Cape Town")
+        self.assertEqual(normalize_city("Cape Town"), "Cape Town")
+        # Built-in keywords keep priority over configured aliases.
+        self.assertEqual(normalize_city("JHB"), "Johannesburg")
+
+    def test_reconfiguring_clears_resolved_cities(self):
+        configure_city_aliases()
+        self.assertEqual(normalize_city("Kaapstad"), "Kaapstad")
+        self.assertEqual(_resolve_city.cache_info().currsize, 1)
+        configure_city_aliases(extra={"kaapstad": "Cape Town"})
+        self.assertEqual(_resolve_city.cache_info().currsize, 0)
+        self.assertEqual(normalize_city("Kaapstad"), "Cape Town")
+
+
+class IngestionReportTests(SimpleTestCase):
+    def test_errors_keep_a_bounded_sample(self):
+        report = IngestionReport(provider="fixtures")
+        for index in range(SAMPLE_SIZE + 5):
+            report.fail(f"row {index}: bad date")
+        self.assertEqual(report.errors, SAMPLE_SIZE + 5)
+        self.assertEqual(report.processed, SAMPLE_SIZE + 5)
+        self.assertEqual(len(report.error_sample), SAMPLE_SIZE)
+        self.assertEqual(report.error_sample[-1], f"row {SAMPLE_SIZE - 1}: bad date")
+        summary = report.as_dict()
+        self.assertEqual(summary["errors"], SAMPLE_SIZE + 5)
+        self.assertEqual(len(summary["error_sample"]), SAMPLE_SIZE)
+        self.assertEqual(report.providers["fixtures"]["errors"], SAMPLE_SIZE + 5)
+
+
+class IngestionProfileTests(TestCase):
+    def test_profiled_run_records_every_stage(self):
+        payloads = list(FixtureEventClient().fetch())
+        rows = sum(len(list(iter_normalized(payload))) for payload in payloads)
+        with CaptureQueriesContext(connection) as queries:
+            report = ingest_with_report(
+                FixtureEventClient(), batch_size=4, profile=True
+            )
+        profile = report.profile
+
+        self.assertEqual(list(profile.stages), list(STAGES))
+        items = {name: stats.items for name, stats in profile.stages.items()}
+        written = report.created + report.updated + report.unchanged
+        self.assertEqual(
+            items,
+            {
+                "fetch": len(payloads),
+                "normalize": rows,
+                "filter": written,
+                "upsert": written,
+            },
+        )
+        self.assertTrue(all(stats.seconds >= 0 for stats in profile.stages.values()))
+        self.assertGreater(profile.queries, 0)
+        self.assertLessEqual(profile.queries, len(queries))
+        self.assertEqual(len(profile.slowest), SLOWEST_LIMIT)
+
+        summary = report.as_dict()["profile"]
+        self.assertEqual(list(summary["stages"]), list(STAGES))
+        self.assertEqual(summary["queries"], profile.queries)
+        self.assertIn(
+            f"events_ingestion_db_queries {profile.queries}\n", profile.to_prometheus()
+        )
+
+    def test_unprofiled_runs_have_no_profile(self):
+        report = ingest_with_report(FixtureEventClient())
+        self.assertIsNone(report.profile)
+        self.assertIsNone(report.as_dict()["profile"])
+
+
+class ParallelNormalizationTests(TestCase):
+    def test_workers_yield_the_same_rows_in_order(self):
+        payloads = list(FixtureEventClient().fetch())
+        # Batches of three split every fixture list across several workers.
+        self.assertTrue(
+            any(
+                len(payload.get("items") or payload.get("results")) > 3
+                for payload in payloads
+            )
+        )
+        sequential = [list(iter_normalized(payload)) for payload in payloads]
+        parallel = [
+            list(rows)
+            for rows in iter_normalized_parallel(payloads, workers=2, batch_size=3)
+        ]
+        self.assertEqual(parallel, sequential)
+
+    def test_parallel_ingestion_reports_the_same_counts(self):
+        def run(workers):
+            with transaction.atomic():
+                report = ingest_with_report(
+                    FixtureEventClient(),
+                    allowed_cities=["Johannesburg"],
+                    workers=workers,
+                )
+                transaction.set_rollback(True)
+            summary = report.as_dict()
+            del summary["sample_ids"], summary["profile"]
+            return summary, [event.fingerprint for event in report.events]
+
+        with mock.patch(
+            "events.services.ingestion.iter_normalized_parallel",
+            partial(iter_normalized_parallel, batch_size=3),
+        ):
+            sequential, parallel = run(1), run(2)
+        self.assertEqual(parallel, sequential)
+        self.assertGreater(sequential[0]["skipped"], 0)
+
+
+class BulkUpsertTests(TestCase):
+    def setUp(self):
+        for title, category in (("Stored", "Music"), ("Edited", "Music")):
+            upsert_event(normalized_row(title, category, "google_cse", None))
+        self.rows = [
+            normalized_row("New", "Music", "google_cse", None),
+            normalized_row("Stored", "Music", "google_cse", None),
+            normalized_row("Edited", "Comedy", "google_cse", None),
+            normalized_row("New", "Music", "google_cse", None),
+            normalized_row("Stored", "Theatre", "google_cse", None),
+            normalized_row("New", "Theatre", "google_cse", None),
+            normalized_row("Edited", "Music", "google_cse", None),
+        ]
+
+    def stored(self):
+        return dict(Event.objects.values_list("event_url", "content_hash"))
+
+    def apply_one_by_one(self):
+        outcomes = []
+        for row in self.rows:
+            before = self.stored().get(row["event_url"])
+            event, created = upsert_event(row)
+            if created:
+                outcomes.append(CREATED)
+            else:
+                outcomes.append(UNCHANGED if before == event.content_hash else UPDATED)
+        return outcomes
+
+    def test_matches_sequential_upserts_for_repeated_keys(self):
+        for storage in ("inline", "compressed"):
+            with (
+                self.subTest(storage=storage),
+                self.settings(EVENT_PAYLOAD_STORAGE=storage),
+            ):
+                with transaction.atomic():
+                    expected = self.apply_one_by_one()
+                    expected_rows = self.stored()
+                    transaction.set_rollback(True)
+                with transaction.atomic():
+                    outcomes = [outcome for _, outcome in bulk_upsert_events(self.rows)]
+                    self.assertEqual(self.stored(), expected_rows)
+                    transaction.set_rollback(True)
+                self.assertEqual(outcomes, expected)
+                self.assertEqual(
+                    outcomes,
+                    [CREATED, UNCHANGED, UPDATED, UNCHANGED, UPDATED, UPDATED, UPDATED],
+                )
+
+    def test_per_row_fallback_skips_unchanged_rows(self):
+        ingest_with_report(FixtureEventClient())
+        with transaction.atomic():
+            expected = ingest_with_report(FixtureEventClient()).as_dict()
+            transaction.set_rollback(True)
+
+        rejected = mock.patch(
+            "events.services.ingestion.bulk_upsert_events",
+            side_effect=RuntimeError("batch rejected"),
+        )
+        with (
+            rejected,
+            self.assertLogs("events.services.ingestion", "ERROR"),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            report = ingest_with_report(FixtureEventClient())
+        for name in ("created", "updated", "unchanged", "errors"):
+            self.assertEqual(getattr(report, name), expected[name], name)
+        self.assertGreater(report.unchanged, 0)
+        rewrites = [
+            query
+            for query in queries
+            if query["sql"].startswith('UPDATE "events_event" SET "title"')
+        ]
+        self.assertEqual(len(rewrites), report.updated)
+
+    def test_per_row_fallback_counts_failed_rows(self):
+        rows = [
+            normalized_row("Fine", "Music", "google_cse", None),
+            {
+                **normalized_row("Broken", "Music", "google_cse", None),
+                "start_date": "soon",
+            },
+        ]
+        report = IngestionReport(provider="google_cse")
+        with (
+            mock.patch(
+                "events.services.ingestion.bulk_upsert_events",
+                side_effect=RuntimeError("batch rejected"),
+            ),
+            self.assertLogs("events.services.ingestion", "ERROR"),
+        ):
+            _write_chunk(rows, report)
+        self.assertEqual((report.created, report.errors), (1, 1))
+        self.assertTrue(report.error_sample[0].startswith("Broken: "))
+
+
+@override_settings(EVENT_PAYLOAD_STORAGE="compressed")
+class EventPayloadTests(UncachedTestCase):
+    payload = {"name": "Jazz Night", "tags": ["music", "live"], "price": None}
+
+    def test_identical_payloads_are_stored_once(self):
+        first = normalized_row("Jazz Night", "Music", "google_places", None)
+        second = normalized_row("Jazz Night", "Music", "google_cse", None)
+        first["raw_payload"] = second["raw_payload"] = self.payload
+        events = [event for event, _ in bulk_upsert_events([first, second])]
+        self.assertEqual(EventPayload.objects.count(), 1)
+        for event in Event.objects.filter(pk__in=[event.pk for event in events]):
+            self.assertIsNone(event.raw_payload)
+            self.assertEqual(event.payload, self.payload)
+        detail = self.client.get(f"/api/events/{events[0].pk}").json()
+        self.assertEqual(detail["raw_payload"], self.payload)
+        body = self.client.get("/api/events?expand=raw_payload").json()
+        for row in body["results"]:
+            self.assertEqual(row["raw_payload"], self.payload)
+
+    def test_moving_existing_payloads_keeps_responses(self):
+        event = make_event("Book Fair", None)
+        Event.objects.filter(pk=event.pk).update(raw_payload=self.payload)
+        url = "/api/events?expand=raw_payload&pagination=page"
+        inline = self.client.get(url).content
+        self.assertEqual(compress_existing(), 1)
+        self.assertEqual(self.client.get(url).content, inline)
+        self.assertEqual(inline_existing(), 1)
+        self.assertEqual(Event.objects.get().raw_payload, self.payload)
+        self.assertEqual(self.client.get(url).content, inline)
+
+    def test_move_payloads_prunes_unreferenced_payloads(self):
+        row = normalized_row("Jazz Night", "Music", "google_places", None)
+        for price in (None, 100):
+            row["raw_payload"] = {**self.payload, "price": price}
+            bulk_upsert_events([row])
+        self.assertEqual(EventPayload.objects.count(), 2)
+        out, err = StringIO(), StringIO()
+        call_command("move_payloads", stdout=out, stderr=err)
+        self.assertIn("Moved: 0, Pruned: 1", out.getvalue())
+        self.assertEqual(Event.objects.get().payload["price"], 100)
+        call_command("move_payloads", "--to", "inline", stdout=out, stderr=err)
+        self.assertIn("Moved: 1, Pruned: 1", out.getvalue())
+        self.assertIn("EVENT_PAYLOAD_STORAGE is 'compressed'", err.getvalue())
+        self.assertFalse(EventPayload.objects.exists())
+        self.assertEqual(Event.objects.get().raw_payload["price"], 100)
+
+
+class IngestionWorkerTests(UncachedTestCase):
+    def setUp(self):
+        self.built = []
+        self.worker = IngestionWorker(client_factory=self.build_client, owner="test")
+
+    def build_client(self, provider, cities):
+        self.built.append((provider, cities))
+        if provider == "broken":
+            raise ValueError("no credentials")
+        return FixtureEventClient()
+
+    def test_claims_only_due_unleased_jobs(self):
+        now = timezone.now()
+        due = IngestionJob.objects.create(provider="fixtures")
+        IngestionJob.objects.create(
+            provider="fixtures", city="Pretoria", next_run_at=now + timedelta(hours=1)
+        )
+        IngestionJob.objects.create(
+            provider="google",
+            lease_owner="other",
+            lease_expires_at=now + timedelta(minutes=5),
+        )
+        self.assertEqual(self.worker.claim_due_jobs(5), [due])
+        self.assertEqual(self.worker.claim_due_jobs(5), [])
+        due.refresh_from_db()
+        self.assertEqual(due.lease_owner, "test")
+
+    def test_run_reports_and_reschedules(self):
+        IngestionJob.objects.create(provider="fixtures", interval=600)
+        for _ in range(2):
+            IngestionJob.objects.update(next_run_at=timezone.now())
+            (job,) = self.worker.claim_due_jobs(1)
+            started = timezone.now()
+            self.worker.run_job(job)
+        self.assertEqual(self.built, [("fixtures", None)])
+        job.refresh_from_db()
+        self.assertEqual(job.last_status, IngestionJob.SUCCEEDED)
+        self.assertIsNone(job.lease_expires_at)
+        delay = (job.next_run_at - started).total_seconds()
+        self.assertTrue(540 <= delay <= 661, delay)
+        (status,) = self.client.get("/api/ingestion/status").json()["jobs"]
+        self.assertFalse(status["running"])
+        self.assertEqual(status["last_report"]["unchanged"], 13)
+
+    def test_warm_client_starts_over_after_a_resumed_run(self):
+        IngestionJob.objects.create(provider="fixtures")
+        client = FixtureEventClient()
+        IngestionCheckpoint.objects.create(
+            key=checkpoint_key(client),
+            provider=client.provider_name,
+            state={"file_index": len(client.paths()) - 1, "payload_offset": 0},
+        )
+        reports = []
+        for _ in range(2):
+            IngestionJob.objects.update(next_run_at=timezone.now())
+            (job,) = self.worker.claim_due_jobs(1)
+            reports.append(self.worker.run_job(job))
+        self.assertEqual(len(self.built), 1)
+        self.assertTrue(reports[0].resumed)
+        self.assertFalse(reports[1].resumed)
+        self.assertLess(reports[0].processed, reports[1].processed)
+        self.assertEqual(reports[1].processed, 15)
+
+    def test_run_stops_when_its_lease_is_taken_over(self):
+        IngestionJob.objects.create(provider="fixtures")
+        (job,) = self.worker.claim_due_jobs(1)
+        self.worker.batch_size = 1
+        fetch = FixtureEventClient.fetch
+
+        def fetch_then_lose_lease(client):
+            for index, payload in enumerate(fetch(client)):
+                if index == 1:
+                    IngestionJob.objects.update(lease_owner="other")
+                yield payload
+
+        with mock.patch.object(FixtureEventClient, "fetch", fetch_then_lose_lease):
+            with self.assertLogs("events.services.scheduler", "WARNING"):
+                self.assertIsNone(self.worker.run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.lease_owner, "other")
+        self.assertIsNone(job.last_finished_at)
+        self.assertLess(Event.objects.count(), 14)
+
+    def test_failures_back_off(self):
+        job = IngestionJob.objects.create(provider="broken")
+        delays = []
+        for _ in range(3):
+            IngestionJob.objects.update(next_run_at=timezone.now())
+            (job,) = self.worker.claim_due_jobs(1)
+            with self.assertLogs("events.services.scheduler", "ERROR"):
+                self.worker.run_job(job)
+            job.refresh_from_db()
+            delays.append((job.next_run_at - job.last_finished_at).total_seconds())
+        self.assertEqual(job.failures, 3)
+        self.assertEqual(job.last_error, "ValueError: no credentials")
+        for delay, expected in zip(delays, (30, 60, 120), strict=True):
+            self.assertAlmostEqual(delay, expected, delta=expected * 0.1)
+
+
+class FakeProvider(BaseEventClient):
+    """Yields canned payloads, optionally meeting the other providers first."""
+
+    def __init__(self, name, payloads=(), error=None, barrier=None):
+        super().__init__()
+        self.provider_name = name
+        self.payloads = list(payloads)
+        self.error = error
+        self.barrier = barrier
+        self.yielded = 0
+
+    def fetch(self):
+        if self.barrier is not None:
+            self.barrier.wait()
+        for payload in self.payloads:
+            self.yielded += 1
+            yield payload
+        if self.error is not None:
+            raise self.error
+
+
+def fixture_payloads(name):
+    fixtures_dir = Path(__file__).resolve().parent / "fixtures"
+    return list(FixtureEventClient(fixtures_dir / name).fetch())
+
+
+class MultiSourceClientTests(TestCase):
+    def test_providers_are_fetched_concurrently(self):
+        # Sequential fetches would leave each provider waiting on the barrier.
+        barrier = threading.Barrier(2, timeout=5)
+        client = MultiSourceClient(
+            [
+                FakeProvider("alpha", [{"items": [1]}], barrier=barrier),
+                FakeProvider("beta", [{"items": [2]}], barrier=barrier),
+            ]
+        )
+        payloads = list(client.fetch())
+        self.assertCountEqual(
+            payloads,
+            [
+                {"items": [1], PROVIDER_KEY: "alpha"},
+                {"items": [2], PROVIDER_KEY: "beta"},
+            ],
+        )
+        self.assertEqual(client.failures, {})
+        self.assertTrue(client.fetch_complete())
+
+    def test_queue_is_bounded_and_producers_stop_with_the_consumer(self):
+        provider = FakeProvider("endless", [{"items": []}] * 1000)
+        client = MultiSourceClient([provider], queue_size=2)
+        payloads = client.fetch()
+        next(payloads)
+        deadline = time.monotonic() + 5
+        while provider.yielded < client.queue_size + 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        # One taken, a full queue and one waiting to be put.
+        self.assertLessEqual(provider.yielded, client.queue_size + 2)
+
+        payloads.close()
+        (thread,) = [t for t in threading.enumerate() if t.name == "fetch-endless"]
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertLessEqual(provider.yielded, client.queue_size + 2)
+
+    def test_failing_provider_does_not_stop_the_others(self):
+        client = MultiSourceClient(
+            [
+                FakeProvider("broken", [{"items": [1]}], error=RuntimeError("boom")),
+                FakeProvider("healthy", [{"items": [2]}, {"items": [3]}]),
+            ]
+        )
+        with self.assertLogs("events.services.clients.multi_source_client", "ERROR"):
+            payloads = list(client.fetch())
+        self.assertEqual(len(payloads), 3)
+        self.assertEqual(client.failures, {"broken": "boom"})
+        self.assertFalse(client.fetch_complete())
+
+    def test_report_tallies_each_provider(self):
+        sources = {
+            "cse": fixture_payloads("cse_johannesburg.json"),
+            "places": fixture_payloads("places_pretoria.json"),
+        }
+        client = MultiSourceClient(
+            [FakeProvider(name, payloads) for name, payloads in sources.items()]
+        )
+        report = ingest_with_report(client, stream=True)
+
+        self.assertEqual(set(report.providers), set(sources))
+        for name, payloads in sources.items():
+            rows = sum(len(list(iter_normalized(payload))) for payload in payloads)
+            counts = report.providers[name]
+            self.assertGreater(counts[CREATED], 0)
+            self.assertEqual(sum(counts.values()), rows)
+        self.assertEqual(
+            sum(counts[CREATED] for counts in report.providers.values()),
+            report.created,
+        )
+
+
+class FakeApify:
+    """Stands in for ``ApifyClient``; each city's run gets a dataset of items."""
+
+    def __init__(self, items, failing=(), before_run=None):
+        self.items = items
+        self.failing = set(failing)
+        self.before_run = before_run or {}
+        self.calls = []
+
+    def actor(self, actor_id):
+        return self
+
+    def call(self, run_input):
+        (city,) = run_input["searchQueries"]
+        self.calls.append(city)
+        if city in self.before_run:
+            self.before_run[city]()
+        if city in self.failing:
+            raise ConnectionError(f"{city} timed out")
+        return {"defaultDatasetId": city}
+
+    def dataset(self, dataset_id):
+        items = self.items[dataset_id]
+        return mock.Mock(iterate_items=lambda offset=0: iter(items[offset:]))
+
+
+class CachedEventClientTests(TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.apify = FakeApify(
+            {"Johannesburg": [{"name": "Jazz"}], "Pretoria": [{"name": "Fair"}]},
+            failing={"Pretoria"},
+        )
+        client = ApifyFacebookClient(
+            api_token="token",
+            actor_id="actor",
+            cities=["Johannesburg", "Pretoria"],
+            concurrency=1,
+            client=self.apify,
+        )
+        self.cached = CachedEventClient(client, cache_dir.name)
+
+    def test_incomplete_runs_are_not_replayed(self):
+        for _ in range(2):
+            with self.assertLogs("events.services.clients", "ERROR"):
+                self.assertEqual(len(list(self.cached.fetch())), 1)
+            self.assertFalse(self.cached.cache_hit)
+            self.assertFalse(self.cached.fetch_complete())
+        self.assertEqual(self.apify.calls, ["Johannesburg", "Pretoria"] * 2)
+
+        self.apify.failing.clear()
+        for _ in range(2):
+            self.assertEqual(len(list(self.cached.fetch())), 2)
+            self.assertTrue(self.cached.fetch_complete())
+        self.assertTrue(self.cached.cache_hit)
+        self.assertEqual(len(self.apify.calls), 6)
+
+
+class ApifyFacebookClientTests(SimpleTestCase):
+    cities = ["Johannesburg", "Pretoria", "Durban"]
+
+    def make_client(self, apify, concurrency=3):
+        return ApifyFacebookClient(
+            api_token="token",
+            actor_id="actor",
+            cities=self.cities,
+            concurrency=concurrency,
+            client=apify,
+        )
+
+    def items(self, count=2):
+        return {
+            city: [{"name": f"{city} {index}"} for index in range(count)]
+            for city in self.cities
+        }
+
+    def test_runs_start_together(self):
+        # Each run only finishes once all three are in flight.
+        started = threading.Barrier(len(self.cities), timeout=5)
+        before_run = dict.fromkeys(self.cities, started.wait)
+        client = self.make_client(FakeApify(self.items(), before_run=before_run))
+        payloads = list(client.fetch())
+        self.assertEqual(len(payloads), 6)
+        self.assertTrue(client.fetch_complete())
+
+    def test_results_stream_as_each_run_finishes(self):
+        release = threading.Event()
+        apify = FakeApify(
+            self.items(),
+            before_run={"Johannesburg": lambda: release.wait(5)},
+        )
+        payloads = iter(self.make_client(apify).fetch())
+        first = [next(payloads)["fallback_city"] for _ in range(4)]
+        self.assertNotIn("Johannesburg", first)
+        self.assertFalse(release.is_set())
+        release.set()
+        rest = [payload["fallback_city"] for payload in payloads]
+        self.assertEqual(rest, ["Johannesburg"] * 2)
+
+    def test_failing_city_does_not_stop_the_others(self):
+        for concurrency in (1, 3):
+            apify = FakeApify(self.items(), failing={"Pretoria"})
+            client = self.make_client(apify, concurrency)
+            with self.subTest(concurrency=concurrency):
+                with self.assertLogs("events.services.clients", "ERROR"):
+                    payloads = list(client.fetch())
+                cities = {payload["fallback_city"] for payload in payloads}
+                self.assertEqual(cities, {"Johannesburg", "Durban"})
+                self.assertEqual(len(payloads), 4)
+                self.assertEqual(client.failed_cities, {"Pretoria"})
+                self.assertFalse(client.fetch_complete())
+                self.assertFalse(client.progress["Pretoria"]["done"])
+
+    def test_resume_applies_to_one_fetch(self):
+        apify = FakeApify(self.items())
+        client = self.make_client(apify, concurrency=1)
+        client.resume_from(
+            {
+                "cities": {
+                    "Johannesburg": {"dataset_id": "Johannesburg", "done": True},
+                    "Pretoria": {"dataset_id": "Pretoria", "offset": 1},
+                }
+            }
+        )
+        resumed = [payload["apify_raw_item"]["name"] for payload in client.fetch()]
+        self.assertEqual(resumed, ["Pretoria 1", "Durban 0", "Durban 1"])
+        self.assertEqual(apify.calls, ["Durban"])
+        self.assertEqual(len(list(client.fetch())), 6)
+        self.assertEqual(apify.calls, ["Durban", *self.cities])
+
+
+class JsonStreamTests(SimpleTestCase):
+    document = {
+        "results": [
+            12.5e3,
+            "a string longer than any read",
+            {"nested": {"values": [1, -2, 3.25e-2]}, "flag": True},
+            -7,
+        ],
+        "next": None,
+    }
+
+    def test_values_span_small_reads(self):
+        text = json.dumps(self.document)
+        for read_size in range(1, 9):
+            with self.subTest(read_size=read_size):
+                items = list(iter_object_items(StringIO(text), ("results",), read_size))
+                self.assertEqual(
+                    items,
+                    [("results", item) for item in self.document["results"]]
+                    + [("next", None)],
+                )
+
+    def test_numbers_split_across_fills(self):
+        for text, expected in (("12.5e3 ", 12500.0), ("-0.25", -0.25), ("123", 123)):
+            for read_size in (1, 2, 3):
+                with self.subTest(text=text, read_size=read_size):
+                    reader = _Reader(StringIO(text), read_size)
+                    self.assertEqual(reader.value(), expected)
+
+    def test_truncated_input_raises(self):
+        for text in ('{"results": [1, {"a": ', '{"results": [1, 2', '{"next": "ab'):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                list(iter_object_items(StringIO(text), ("results",), 4))
+
+    def test_gzip_is_detected(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        text = json.dumps(self.document)
+        plain, packed = Path(directory.name, "a.json"), Path(directory.name, "b.gz")
+        plain.write_text(text, "utf-8")
+        packed.write_bytes(gzip.compress(text.encode("utf-8")))
+        for path in (plain, packed):
+            with self.subTest(path=path.name), open_text(path) as handle:
+                self.assertEqual(handle.read(), text)
+
+    def test_resume_continues_mid_file(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name, "export.json.gz")
+        path.write_bytes(gzip.compress(json.dumps(self.document).encode("utf-8")))
+        client = FixtureEventClient(fixtures_dir=path, chunk_items=1)
+        client.resume_from({"file_index": 0, "payload_offset": 2})
+        payloads = iter(client.fetch())
+        self.assertEqual(next(payloads), {"results": [self.document["results"][2]]})
+        self.assertEqual(
+            client.checkpoint_state(), {"file_index": 0, "payload_offset": 3}
+        )
+        self.assertEqual(list(payloads), [{"results": [-7]}])
+        self.assertEqual(len(list(client.fetch())), 4)
+
+
+class Interrupted(Exception):
+    pass
+
+
+class IngestionCheckpointTests(TestCase):
+    # With the bundled fixtures (payloads of 3, 3, 6 and 3 rows) the first
+    # chunk of four rows ends inside the second payload.
+    batch_size = 4
+
+    def checkpoint(self, client):
+        return IngestionCheckpoint.objects.get(key=checkpoint_key(client))
+
+    def test_interrupted_run_resumes_after_the_last_committed_chunk(self):
+        def interrupt(report):
+            raise Interrupted
+
+        client = FixtureEventClient()
+        with self.assertRaises(Interrupted):
+            ingest_with_report(
+                client, batch_size=self.batch_size, stream=True, progress=interrupt
+            )
+        self.assertEqual(Event.objects.count(), 4)
+        checkpoint = self.checkpoint(client)
+        self.assertEqual(checkpoint.state, {"file_index": 0, "payload_offset": 1})
+        self.assertIsNone(checkpoint.completed_at)
+
+        report = ingest_with_report(
+            FixtureEventClient(), batch_size=self.batch_size, resume=True
+        )
+        self.assertTrue(report.resumed)
+        # The split payload is replayed; its committed row is unchanged.
+        self.assertEqual(report.processed, 12)
+        self.assertEqual(report.unchanged, 1)
+        self.assertEqual(Event.objects.count(), 14)
+        self.assertIsNotNone(self.checkpoint(client).completed_at)
+
+    def test_checkpoint_rolls_back_with_its_chunk(self):
+        save = CheckpointTracker.save
+        saves = []
+
+        def save_then_fail(tracker):
+            save(tracker)
+            saves.append(tracker.key)
+            if len(saves) == 2:
+                raise Interrupted
+
+        client = FixtureEventClient()
+        with mock.patch.object(CheckpointTracker, "save", save_then_fail):
+            with self.assertRaises(Interrupted):
+                ingest_with_report(client, batch_size=self.batch_size, stream=True)
+        self.assertEqual(Event.objects.count(), 4)
+        checkpoint = self.checkpoint(client)
+        self.assertEqual(checkpoint.state, {"file_index": 0, "payload_offset": 1})
+
+    def test_failed_cities_keep_the_checkpoint_open(self):
+        apify = FakeApify(
+            {
+                city: [
+                    {
+                        "name": f"{city} Jazz {index}",
+                        "url": f"https://e.com/{city}{index}",
+                    }
+                    for index in range(3)
+                ]
+                for city in ("Johannesburg", "Pretoria")
+            },
+            failing={"Pretoria"},
+        )
+
+        def make_client():
+            return ApifyFacebookClient(
+                api_token="token",
+                actor_id="actor",
+                cities=["Johannesburg", "Pretoria"],
+                concurrency=1,
+                client=apify,
+            )
+
+        client = make_client()
+        with self.assertLogs("events.services.clients", "ERROR"):
+            report = ingest_with_report(client, batch_size=2, stream=True)
+        self.assertEqual(report.created, 3)
+        checkpoint = self.checkpoint(client)
+        self.assertIsNone(checkpoint.completed_at)
+        self.assertEqual(checkpoint.state["cities"]["Johannesburg"]["offset"], 3)
+        self.assertIsNone(checkpoint.state["cities"]["Pretoria"]["dataset_id"])
+
+        apify.failing.clear()
+        report = ingest_with_report(make_client(), batch_size=2, resume=True)
+        self.assertTrue(report.resumed)
+        self.assertEqual(report.created, 3)
+        self.assertEqual(apify.calls, ["Johannesburg", "Pretoria", "Pretoria"])
+        self.assertIsNotNone(self.checkpoint(client).completed_at)
@@ -1,10 +1,34 @@
+from django.conf import settings
 from django.urls import path
 
-from .views import EventListView, HealthcheckView
+from . import async_views
+from .views import (
+    EventDetailView,
+    EventFacetsView,
+    EventListView,
+    HealthcheckView,
+    IngestionStatusView,
+)
 
 app_name = "events"
 
+if settings.SERVER_INTERFACE == "asgi":
+    health_view = async_views.health
+    list_view = async_views.event_list
+    detail_view = async_views.event_detail
+    facets_view = async_views.event_facets
+    ingestion_status_view = async_views.ingestion_status_view
+else:
+    health_view = HealthcheckView.as_view()
+    list_view = EventListView.as_view()
+    detail_view = EventDetailView.as_view()
+    facets_view = EventFacetsView.as_view()
+    ingestion_status_view = IngestionStatusView.as_view()
+
 urlpatterns = [
-    path("health", HealthcheckView.as_view(), name="health"),
-    path("events", EventListView.as_view(), name="events-list"),
+    path("health", health_view, name="health"),
+    path("events", list_view, name="events-list"),
+    path("events/facets", facets_view, name="events-facets"),
+    path("events/<int:pk>", detail_view, name="events-detail"),
+    path("ingestion/status", ingestion_status_view, name="ingestion-status"),
 ]
@@ -1,29 +1,264 @@
-from rest_framework import generics, pagination
+import math
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Event
-from .serializers import EventSerializer
+from .cache import CachedListMixin, cache_validators, current_generation
+from .facets import facet_payload, facet_queries
+from .geo import near_filter
+from .models import Event, IngestionJob, city_lookup_key
+from .pagination import (
+    EVENT_ORDERING,
+    EventCursorPagination,
+    StandardResultsSetPagination,
+    wants_page_numbers,
+)
+from .renderers import FastJSONRenderer
+from .search import RANK_ALIAS, is_ranked, search_events
+from .serializers import (
+    EventSerializer,
+    EventValuesSerializer,
+    fast_json_safe,
+    parse_field_selection,
+)
 
+# Columns the list always loads: the primary key plus the keyset sort keys.
+ORDERING_FIELDS = ("id", "start_date", "title")
+DEFAULT_RADIUS_KM = 10.0
+MAX_RADIUS_KM = 100.0
+TRUE_VALUES = {"1", "true", "yes"}
+FALSE_VALUES = {"", "0", "false", "no"}
 
-class StandardResultsSetPagination(pagination.PageNumberPagination):
-    page_size = 10
-    page_size_query_param = "page_size"
-    max_page_size = 50
 
+def parse_start_bound(params, name: str) -> datetime | None:
+    """Read a date or ISO 8601 datetime query param as an aware datetime.
 
-class EventListView(generics.ListAPIView):
-    """Provides a paginated list of ingested events."""
+    A bare date means midnight at its start in the current time zone.
+    """
+    value = params.get(name, "").strip()
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            parsed = datetime.combine(day, time.min) if day else None
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: ["Enter a date or an ISO 8601 datetime."]})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def upcoming_cutoff(params) -> datetime | None:
+    """The start of the current minute when ``?upcoming=true``, else ``None``."""
+    value = params.get("upcoming", "").strip().lower()
+    if value in FALSE_VALUES:
+        return None
+    if value not in TRUE_VALUES:
+        raise ValidationError({"upcoming": ["Must be true or false."]})
+    # Minute granularity keeps the responses cacheable (see request_fingerprint).
+    return timezone.now().replace(second=0, microsecond=0)
+
+
+def parse_near(params) -> tuple[float, float, float] | None:
+    """Read ``?near=lat,lng`` and ``?radius_km=`` into a validated triple."""
+    value = params.get("near", "").strip()
+    if not value:
+        return None
+    try:
+        latitude, longitude = (float(part) for part in value.split(","))
+    except ValueError:
+        latitude = longitude = math.nan
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        raise ValidationError({"near": ["Expected latitude,longitude in degrees."]})
+    try:
+        radius_km = float(params.get("radius_km") or DEFAULT_RADIUS_KM)
+    except ValueError:
+        radius_km = math.nan
+    if not 0 < radius_km <= MAX_RADIUS_KM:
+        raise ValidationError(
+            {"radius_km": [f"Must be above 0 and at most {MAX_RADIUS_KM:g}."]}
+        )
+    return latitude, longitude, radius_km
+
+
+def filter_events(params):
+    """Apply the list endpoint's query-string filters to an ordered queryset.
+
+    ``start_after`` (inclusive), ``start_before`` (exclusive) and
+    ``upcoming`` bound ``start_date`` and exclude undated events; with a
+    city they are served by the ``(city_key, -start_date, title)`` index.
+    ``near=lat,lng`` keeps events within ``radius_km`` (default 10) of the
+    point, reading only the geohash cells around it.
+    With ``?q=`` the results are ranked by search relevance, then ``id``. Events
+    linked to a canonical event from another source are left out.
+    """
+    qs = Event.objects.filter(canonical__isnull=True)
+    city = params.get("city")
+    if city:
+        qs = qs.filter(city_key=city_lookup_key(city))
+    lower_bounds = [
+        bound
+        for bound in (parse_start_bound(params, "start_after"), upcoming_cutoff(params))
+        if bound is not None
+    ]
+    if lower_bounds:
+        qs = qs.filter(start_date__gte=max(lower_bounds))
+    start_before = parse_start_bound(params, "start_before")
+    if start_before is not None:
+        qs = qs.filter(start_date__lt=start_before)
+    near = parse_near(params)
+    if near is not None:
+        qs = qs.filter(near_filter(*near))
+    query = params.get("q", "").strip()
+    if query:
+        return search_events(qs, query, EVENT_ORDERING)
+    return qs.order_by(*EVENT_ORDERING)
+
+
+def list_columns(fields: tuple[str, ...], ranked: bool = False) -> tuple[str, ...]:
+    extra = [name for name in ORDERING_FIELDS if name not in fields]
+    if ranked:
+        # Search pages seek on the rank of their last row.
+        extra.append(RANK_ALIAS)
+    if "raw_payload" in fields:
+        extra.append("payload_digest")
+    return (*fields, *extra)
 
-    serializer_class = EventSerializer
-    pagination_class = StandardResultsSetPagination
+
+class EventListView(CachedListMixin, generics.ListAPIView):
+    """Provides a cursor-paginated list of ingested events.
+
+    Page-number pagination remains available via ``?page=`` or
+    ``?pagination=page``. ``?q=`` searches are ordered by relevance and
+    paged by cursor too. Responses are cached until the next ingestion
+    commit. ``raw_payload`` is left out (and not read from the database)
+    unless requested through ``?expand=raw_payload`` or ``?fields=``.
+
+    Rows are read with ``.values()`` and rendered by ``EventValuesSerializer``
+    rather than the model serializer; the output schema is unchanged.
+    """
+
+    serializer_class = EventValuesSerializer
+    renderer_classes = [FastJSONRenderer]
+
+    @property
+    def selected_fields(self) -> tuple[str, ...]:
+        if not hasattr(self, "_selected_fields"):
+            self._selected_fields = parse_field_selection(self.request.query_params)
+        return self._selected_fields
+
+    @property
+    def json_fast_path(self) -> bool:
+        # Coordinates and upstream payloads may hold floats, whose formatting
+        # differs by encoder.
+        try:
+            return fast_json_safe(self.selected_fields)
+        except ValidationError:
+            return False
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.selected_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if wants_page_numbers(self.request.query_params):
+                self._paginator = StandardResultsSetPagination()
+            else:
+                self._paginator = EventCursorPagination()
+        return self._paginator
+
+    def get_base_queryset(self):
+        return filter_events(self.request.query_params)
 
     def get_queryset(self):
-        qs = Event.objects.order_by("-start_date", "title")
-        city = self.request.query_params.get("city")
-        if city:
-            qs = qs.filter(city__iexact=city.strip())
-        return qs
+        queryset = self.get_base_queryset()
+        columns = list_columns(self.selected_fields, is_ranked(queryset))
+        return queryset.values(*columns)
+
+
+class EventDetailView(generics.RetrieveAPIView):
+    """Returns a single event, including its full upstream payload."""
+
+    queryset = Event.objects.all()
+    serializer_class = EventSerializer
+
+
+class EventFacetsView(APIView):
+    """Event counts per city, category, source and start month.
+
+    Aggregates the small ``EventFacet`` table rather than ``Event``, and is
+    cached like the list until the next ingestion commit.
+    """
+
+    renderer_classes = [FastJSONRenderer]
+    json_fast_path = True
+    cache_prefix = "events:facets"
+
+    def get(self, request):
+        validators = cache_validators(request, current_generation(), self.cache_prefix)
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+
+        data = cache.get(validators.key)
+        if data is None:
+            queries = facet_queries(request.query_params)
+            data = facet_payload({name: list(rows) for name, rows in queries.items()})
+            cache.set(validators.key, data, settings.EVENTS_CACHE_TIMEOUT)
+        return validators.apply(Response(data))
+
+
+INGESTION_STATUS_FIELDS = (
+    "id",
+    "provider",
+    "city",
+    "enabled",
+    "interval",
+    "next_run_at",
+    "failures",
+    "last_started_at",
+    "last_finished_at",
+    "last_status",
+    "last_error",
+    "last_report",
+)
+
+
+def ingestion_jobs():
+    return IngestionJob.objects.order_by("provider", "city").values(
+        *INGESTION_STATUS_FIELDS, "lease_expires_at"
+    )
+
+
+def ingestion_status(rows) -> dict:
+    """Shape ``ingestion_jobs`` rows; ``running`` means the job is leased."""
+    now = timezone.now()
+    jobs = []
+    for row in rows:
+        lease_expires_at = row.pop("lease_expires_at")
+        row["running"] = lease_expires_at is not None and lease_expires_at > now
+        jobs.append(row)
+    return {"jobs": jobs}
+
+
+class IngestionStatusView(APIView):
+    """Schedule, state and last ``IngestionReport`` of every ingestion job."""
+
+    def get(self, request):
+        return Response(ingestion_status(ingestion_jobs()))
 
 
 class HealthcheckView(APIView):